@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+URI_SAFE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-$"
+_BITS_PER_CHAR = 6
+_CHAR_MASK = (1 << _BITS_PER_CHAR) - 1
+# Output characters are filled most-significant bit first while the stream is
+# accumulated least-significant bit first, so each 6-bit group is looked up reversed.
+_REVERSED_ALPHABET = tuple(
+    URI_SAFE_ALPHABET[int(f"{value:06b}"[::-1], 2)] for value in range(1 << _BITS_PER_CHAR)
+)
+
+
+def compress_to_encoded_uri_component(text: str) -> str:
+    """LZ-string ``compressToEncodedURIComponent`` with the same output as the JS library."""
+    alphabet = _REVERSED_ALPHABET
+    dictionary: dict[str, int] = {}
+    pending_literals: set[str] = set()
+    dict_size = 3
+    num_bits = 2
+    enlarge_in = 2
+    output: list[str] = []
+    buffer = 0
+    filled = 0
+    phrase = ""
+
+    for char in text:
+        extended = phrase + char
+        if extended in dictionary:
+            phrase = extended
+            continue
+        if char not in dictionary:
+            dictionary[char] = dict_size
+            dict_size += 1
+            pending_literals.add(char)
+        if not phrase:
+            phrase = char
+            continue
+
+        if phrase in pending_literals:
+            pending_literals.discard(phrase)
+            buffer, filled = _write_literal(buffer, filled, num_bits, ord(phrase))
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+        else:
+            buffer |= dictionary[phrase] << filled
+            filled += num_bits
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+        while filled >= _BITS_PER_CHAR:
+            output.append(alphabet[buffer & _CHAR_MASK])
+            buffer >>= _BITS_PER_CHAR
+            filled -= _BITS_PER_CHAR
+
+        dictionary[extended] = dict_size
+        dict_size += 1
+        phrase = char
+
+    if phrase:
+        if phrase in pending_literals:
+            buffer, filled = _write_literal(buffer, filled, num_bits, ord(phrase))
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+        else:
+            buffer |= dictionary[phrase] << filled
+            filled += num_bits
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            num_bits += 1
+
+    buffer |= 2 << filled
+    filled += num_bits
+    while filled >= _BITS_PER_CHAR:
+        output.append(alphabet[buffer & _CHAR_MASK])
+        buffer >>= _BITS_PER_CHAR
+        filled -= _BITS_PER_CHAR
+    output.append(alphabet[buffer & _CHAR_MASK])
+    return "".join(output)
+
+
+def _write_literal(buffer: int, filled: int, num_bits: int, literal: int) -> tuple[int, int]:
+    if literal < 256:
+        return buffer | literal << (filled + num_bits), filled + num_bits + 8
+    return buffer | (1 | (literal & 0xFFFF) << num_bits) << filled, filled + num_bits + 16
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from collections.abc import Iterable
 from pathlib import Path
 
+from adapters.filesystem.json_utils import load_json, write_scene_atomic
 from domain.models import ExcalidrawDocument
 from domain.ports.repositories import ExcalidrawRepository
 
@@ -15,7 +15,7 @@ class FileSystemExcalidrawRepository(ExcalidrawRepository):
     def load_all_with_paths(self, directory: Path) -> list[tuple[Path, ExcalidrawDocument]]:
         documents: list[tuple[Path, ExcalidrawDocument]] = []
         for path in sorted(self._iter_paths(directory)):
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = load_json(path)
             documents.append(
                 (
                     path,
@@ -29,8 +29,7 @@ class FileSystemExcalidrawRepository(ExcalidrawRepository):
         return documents
 
     def save(self, document: ExcalidrawDocument, path: Path) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(document.to_dict(), indent=2), encoding="utf-8")
+        write_scene_atomic(path, document.to_dict())
 
     def _iter_paths(self, directory: Path) -> Iterable[Path]:
         for pattern in ("*.excalidraw", "*.json"):
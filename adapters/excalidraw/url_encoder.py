@@ -1,18 +1,76 @@
 from __future__ import annotations
 
 import json
-from typing import Any, cast
+import math
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
 
-from lzstring import LZString  # type: ignore[import-untyped]
+from adapters.excalidraw.lz_string import compress_to_encoded_uri_component
+from domain.models import scene_content_hash
 
+_URL_FRAGMENT = "#json="
+_ESTIMATE_ZLIB_LEVEL = 6
+# Heuristic, not a proven bound: LZ-string output was 2-3x deflate on scenes and stayed
+# above 0.9x on adversarial text. Scenes whose estimate lands near the budget are still
+# encoded exactly; only estimates well past it skip the encoder.
+_ESTIMATE_MARGIN = 0.75
+_ESTIMATE_SKIP_FACTOR = 1.5
 
-def encode_scene_payload(scene: dict[str, Any]) -> str:
-    payload = json.dumps(scene, ensure_ascii=True, separators=(",", ":"))
-    encoded = LZString().compressToEncodedURIComponent(payload)
-    return cast(str, encoded)
 
+def serialize_scene_payload(scene: Mapping[str, Any]) -> str:
+    return json.dumps(scene, ensure_ascii=True, separators=(",", ":"))
 
-def build_excalidraw_url(base_url: str, scene: dict[str, Any]) -> str:
+
+def encode_scene_payload(scene: Mapping[str, Any]) -> str:
+    return compress_to_encoded_uri_component(serialize_scene_payload(scene))
+
+
+def estimate_min_encoded_length(payload: str) -> int:
+    """Heuristic lower estimate of the LZ-string output length, see ``_ESTIMATE_MARGIN``."""
+    compressor = zlib.compressobj(_ESTIMATE_ZLIB_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated_size = len(compressor.compress(payload.encode("ascii"))) + len(compressor.flush())
+    return math.floor(deflated_size * 8 / 6 * _ESTIMATE_MARGIN)
+
+
+def build_excalidraw_url(base_url: str, scene: Mapping[str, Any]) -> str:
     clean_base = base_url.split("#", 1)[0]
     encoded = encode_scene_payload(scene)
-    return f"{clean_base}#json={encoded}"
+    return f"{clean_base}{_URL_FRAGMENT}{encoded}"
+
+
+class ExcalidrawUrlBuilder:
+    def __init__(self, max_url_length: int = 8000, max_entries: int = 256) -> None:
+        self._max_url_length = max_url_length
+        self._max_entries = max(0, max_entries)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], str | None] = OrderedDict()
+
+    def build(self, base_url: str, scene: Mapping[str, Any]) -> str | None:
+        """Return the ``#json=`` share URL, or ``None`` when it exceeds the length limit."""
+        clean_base = base_url.split("#", 1)[0]
+        key = (clean_base, scene_content_hash(scene))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        url = self._encode(clean_base, serialize_scene_payload(scene))
+        if self._max_entries <= 0:
+            return url
+        with self._lock:
+            self._entries[key] = url
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return url
+
+    def _encode(self, clean_base: str, payload: str) -> str | None:
+        budget = self._max_url_length - len(clean_base) - len(_URL_FRAGMENT)
+        if estimate_min_encoded_length(payload) > budget * _ESTIMATE_SKIP_FACTOR:
+            return None
+        encoded = compress_to_encoded_uri_component(payload)
+        if len(encoded) > budget:
+            return None
+        return f"{clean_base}{_URL_FRAGMENT}{encoded}"
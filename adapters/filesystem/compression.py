@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import gzip
+import importlib
+from collections.abc import Iterable
+from types import ModuleType
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+MIN_COMPRESSED_SIZE = 1024
+ENCODING_SUFFIXES: dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+
+def _load_brotli() -> ModuleType | None:
+    try:
+        return importlib.import_module("brotli")
+    except ImportError:
+        return None
+
+
+_brotli = _load_brotli()
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if _brotli is not None else ("gzip",)
+
+
+def compress_bytes(content: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br" and _brotli is not None:
+        return bytes(_brotli.compress(content, quality=BROTLI_QUALITY))
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def build_compressed_variants(
+    content: bytes,
+    encodings: Iterable[str] | None = None,
+) -> dict[str, bytes]:
+    if len(content) < MIN_COMPRESSED_SIZE:
+        return {}
+    selected = available_encodings() if encodings is None else encodings
+    return {encoding: compress_bytes(content, encoding) for encoding in selected}
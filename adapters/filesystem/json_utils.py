@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 import orjson
 
@@ -19,8 +20,48 @@ def dump_json_bytes(payload: Any) -> bytes:
         return json.dumps(payload, ensure_ascii=True, indent=2).encode("utf-8")
 
 
+def dump_compact_json_bytes(payload: Any) -> bytes:
+    try:
+        return orjson.dumps(payload)
+    except TypeError:
+        return json.dumps(payload, ensure_ascii=True, separators=(",", ":")).encode("utf-8")
+
+
+def write_json_stream(
+    sink: BinaryIO, payload: Mapping[str, Any], stream_key: str = "elements"
+) -> None:
+    sink.write(b"{")
+    for position, (key, value) in enumerate(payload.items()):
+        if position:
+            sink.write(b",")
+        sink.write(orjson.dumps(str(key)))
+        sink.write(b":")
+        if key != stream_key or not isinstance(value, list | tuple):
+            sink.write(dump_compact_json_bytes(value))
+            continue
+        sink.write(b"[")
+        for index, item in enumerate(value):
+            if index:
+                sink.write(b",")
+            sink.write(dump_compact_json_bytes(item))
+        sink.write(b"]")
+    sink.write(b"}")
+
+
+def write_bytes_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f"{path.suffix}.tmp")
+    tmp_path.write_bytes(content)
+    tmp_path.replace(path)
+
+
 def write_json_atomic(path: Path, payload: Any) -> None:
+    write_bytes_atomic(path, dump_json_bytes(payload))
+
+
+def write_scene_atomic(path: Path, payload: Mapping[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(f"{path.suffix}.tmp")
-    tmp_path.write_bytes(dump_json_bytes(payload))
+    with tmp_path.open("wb") as sink:
+        write_json_stream(sink, payload)
     tmp_path.replace(path)
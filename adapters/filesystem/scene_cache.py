@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from adapters.filesystem.compression import ENCODING_SUFFIXES
+from adapters.filesystem.json_utils import write_bytes_atomic, write_scene_atomic
+from adapters.layout.cache import canonical_markup_payload
+from domain.models import MarkupDocument
+
+logger = logging.getLogger(__name__)
+
+SCENE_CACHE_VERSION = 2
+SOURCE_KEY_MAX_ENTRIES = 4096
+
+
+def build_scene_cache_key(
+    generator_fingerprint: str,
+    diagram_format: str,
+    document: MarkupDocument,
+) -> str:
+    payload = {
+        "version": SCENE_CACHE_VERSION,
+        "generator": generator_fingerprint,
+        "format": diagram_format,
+        "document": canonical_markup_payload(document),
+    }
+    canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def build_scene_file_cache_key(
+    generator_fingerprint: str,
+    diagram_format: str,
+    scene_path: Path,
+    scene_stat: os.stat_result,
+) -> str:
+    payload = {
+        "version": SCENE_CACHE_VERSION,
+        "generator": generator_fingerprint,
+        "format": diagram_format,
+        "path": str(scene_path.resolve()),
+        "mtime_ns": scene_stat.st_mtime_ns,
+        "size": scene_stat.st_size,
+    }
+    canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+@dataclass
+class _CacheEntry:
+    paths: list[Path] = field(default_factory=list)
+    size: int = 0
+    mtime: float = 0.0
+
+
+class SceneCache:
+    def __init__(self, cache_dir: Path, max_bytes: int) -> None:
+        self.cache_dir = cache_dir
+        self._max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+        self._source_keys: OrderedDict[tuple[str, ...], str] = OrderedDict()
+
+    def source_key(self, revision: tuple[str, ...]) -> str | None:
+        with self._lock:
+            key = self._source_keys.get(revision)
+            if key is not None:
+                self._source_keys.move_to_end(revision)
+            return key
+
+    def remember_source_key(self, revision: tuple[str, ...], key: str) -> None:
+        with self._lock:
+            self._source_keys[revision] = key
+            self._source_keys.move_to_end(revision)
+            while len(self._source_keys) > SOURCE_KEY_MAX_ENTRIES:
+                self._source_keys.popitem(last=False)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        content = self.get_bytes(key)
+        if content is None:
+            return None
+        try:
+            payload = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            logger.warning("Ignoring unreadable scene cache entry %s", self._path(key))
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def get_bytes(self, key: str, encoding: str | None = None) -> bytes | None:
+        path = self._path(key, encoding)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning("Ignoring unreadable scene cache entry %s", path, exc_info=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return content
+
+    def put(self, key: str, payload: Mapping[str, Any]) -> None:
+        self._store(key, [(self._path(key), lambda path: write_scene_atomic(path, payload))])
+
+    def put_bytes(
+        self,
+        key: str,
+        content: bytes,
+        variants: Mapping[str, bytes] | None = None,
+    ) -> None:
+        writes: list[tuple[Path, Callable[[Path], None]]] = [
+            (self._path(key, encoding), partial(write_bytes_atomic, content=encoded))
+            for encoding, encoded in (variants or {}).items()
+        ]
+        writes.append((self._path(key), partial(write_bytes_atomic, content=content)))
+        self._store(key, writes)
+
+    def _store(self, key: str, writes: list[tuple[Path, Callable[[Path], None]]]) -> None:
+        delta = 0
+        for path, write in writes:
+            try:
+                previous_size = path.stat().st_size if path.exists() else 0
+                write(path)
+                delta += path.stat().st_size - previous_size
+            except OSError:
+                logger.warning("Failed to write scene cache entry %s", path, exc_info=True)
+                return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += delta
+            self._evict()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(entry.size for entry in self._entries())
+            return self._total_bytes
+
+    def _path(self, key: str, encoding: str | None = None) -> Path:
+        suffix = ENCODING_SUFFIXES[encoding] if encoding is not None else ""
+        return self.cache_dir / key[:2] / f"{key}.json{suffix}"
+
+    def _entries(self) -> list[_CacheEntry]:
+        entries: dict[str, _CacheEntry] = {}
+        for path in self.cache_dir.glob("*/*.json*"):
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            key = path.name.partition(".")[0]
+            entry = entries.setdefault(key, _CacheEntry())
+            entry.paths.append(path)
+            entry.size += stat.st_size
+            entry.mtime = max(entry.mtime, stat.st_mtime)
+        return list(entries.values())
+
+    def _evict(self) -> None:
+        if self._total_bytes is not None and self._total_bytes <= self._max_bytes:
+            return
+        entries = sorted(self._entries(), key=lambda entry: entry.mtime)
+        total = sum(entry.size for entry in entries)
+        for entry in entries:
+            if total <= self._max_bytes:
+                break
+            for path in entry.paths:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    logger.warning("Failed to evict scene cache entry %s", path, exc_info=True)
+            total -= entry.size
+        self._total_bytes = total
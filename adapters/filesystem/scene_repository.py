@@ -6,7 +6,7 @@ from typing import Any
 
 from filelock import FileLock
 
-from adapters.filesystem.json_utils import load_json, write_json_atomic
+from adapters.filesystem.json_utils import load_json, write_scene_atomic
 from domain.ports.catalog import SceneRepository
 
 
@@ -17,7 +17,7 @@ class FileSystemSceneRepository(SceneRepository):
     def save(self, payload: Mapping[str, Any], path: Path) -> None:
         lock_path = path.with_suffix(f"{path.suffix}.lock")
         with FileLock(str(lock_path)):
-            write_json_atomic(path, dict(payload))
+            write_scene_atomic(path, payload)
 
     def clear_cache(self, directory: Path) -> int:
         if not directory.exists():
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+import domain
+from adapters.layout.grid import GridLayoutEngine, LayoutConfig
+from domain.models import LayoutPlan, MarkupDocument
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_CACHE_VERSION = 1
+
+
+def layout_engine_fingerprint(engine: GridLayoutEngine) -> str:
+    digest = hashlib.sha256(f"{LAYOUT_CACHE_VERSION}:{type(engine).__qualname__}".encode())
+    source_roots = (Path(__file__).parent, Path(domain.__file__).parent)
+    for root in source_roots:
+        for source_path in sorted(root.rglob("*.py")):
+            digest.update(source_path.relative_to(root).as_posix().encode("utf-8"))
+            digest.update(source_path.read_bytes())
+    return digest.hexdigest()
+
+
+def canonical_markup_payload(document: MarkupDocument) -> dict[str, Any]:
+    payload = document.model_dump(mode="json")
+    payload["block_graph_initials"] = sorted(document.block_graph_initials)
+    return payload
+
+
+def build_layout_cache_key(
+    engine_fingerprint: str,
+    config: LayoutConfig,
+    document: MarkupDocument,
+) -> str:
+    payload = {
+        "engine": engine_fingerprint,
+        "config": asdict(config),
+        "document": canonical_markup_payload(document),
+        "return_block_ids": [procedure.return_block_ids for procedure in document.procedures],
+    }
+    canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+class LayoutPlanCache:
+    def __init__(self, max_entries: int = 256, cache_dir: Path | None = None) -> None:
+        self._max_entries = max(0, max_entries)
+        self._cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, LayoutPlan] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str) -> LayoutPlan | None:
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is not None:
+                self._entries.move_to_end(key)
+                return plan
+        plan = self._load(key)
+        if plan is not None:
+            self._remember(key, plan)
+        return plan
+
+    def put(self, key: str, plan: LayoutPlan) -> None:
+        self._remember(key, plan)
+        self._store(key, plan)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, plan: LayoutPlan) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = plan
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / key[:2] / f"{key}.pickle"
+
+    def _load(self, key: str) -> LayoutPlan | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            plan = pickle.loads(path.read_bytes())
+        except Exception:
+            logger.warning("Ignoring unreadable layout cache entry %s", path, exc_info=True)
+            return None
+        return plan if isinstance(plan, LayoutPlan) else None
+
+    def _store(self, key: str, plan: LayoutPlan) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(pickle.dumps(plan, protocol=pickle.HIGHEST_PROTOCOL))
+            tmp_path.replace(path)
+        except OSError:
+            logger.warning("Failed to write layout cache entry %s", path, exc_info=True)
+
+
+class CachedLayoutEngine:
+    def __init__(
+        self,
+        engine: GridLayoutEngine,
+        cache: LayoutPlanCache,
+        refine_executor: Executor | None = None,
+    ) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.refine_executor = refine_executor
+        self._fingerprint = layout_engine_fingerprint(engine)
+        self._refining: set[str] = set()
+        self._refining_lock = threading.Lock()
+
+    @property
+    def config(self) -> LayoutConfig:
+        return self.engine.config
+
+    def build_plan(self, document: MarkupDocument) -> LayoutPlan:
+        key = build_layout_cache_key(self._fingerprint, self.config, document)
+        plan = self.cache.get(key)
+        if plan is None:
+            plan = self.engine.build_plan(document)
+            if plan.refinement.budget_exhausted:
+                self._schedule_refinement(key, document)
+            else:
+                self.cache.put(key, plan)
+        return plan
+
+    def _schedule_refinement(self, key: str, document: MarkupDocument) -> None:
+        if self.refine_executor is None:
+            return
+        with self._refining_lock:
+            if key in self._refining:
+                return
+            self._refining.add(key)
+        try:
+            self.refine_executor.submit(self._refine, key, document)
+        except RuntimeError:
+            with self._refining_lock:
+                self._refining.discard(key)
+
+    def _refine(self, key: str, document: MarkupDocument) -> None:
+        try:
+            engine = type(self.engine)(replace(self.config, time_budget_seconds=None))
+            self.cache.put(key, engine.build_plan(document))
+        except Exception:
+            logger.warning("Background layout refinement failed", exc_info=True)
+        finally:
+            with self._refining_lock:
+                self._refining.discard(key)
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-import heapq
-from collections.abc import Mapping, Sequence
+import math
+import time
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass, field
+from typing import Literal
 
+from adapters.layout.overlap import IntervalIndex, stack_below
 from domain.models import (
     END_TYPE_DEFAULT,
     END_TYPE_TURN_OUT,
     BlockPlacement,
     FramePlacement,
     LayoutPlan,
+    LayoutRefinement,
     MarkerPlacement,
     MarkupDocument,
     Point,
@@ -25,9 +29,19 @@ from domain.services.block_graph_resolution import (
     ResolvedBlockGraphEdge,
     build_block_owner_index,
     resolve_block_graph_edges,
+    resolve_owned_blocks,
 )
+from domain.services.graph_kernel import IndexedGraph
 from domain.services.graph_metrics import build_directed_graph, compute_graph_metrics
 
+LayoutQuality = Literal["full", "fast"]
+LAYOUT_QUALITY_FULL: LayoutQuality = "full"
+LAYOUT_QUALITY_FAST: LayoutQuality = "fast"
+PASS_BARYCENTRIC_SWEEPS = "barycentric_sweeps"
+PASS_ROW_SMOOTHING = "row_smoothing"
+PASS_RETURN_SUBPROCEDURES = "return_subprocedures"
+PASS_EDGE_AVOIDANCE = "edge_avoidance"
+
 
 @dataclass(frozen=True)
 class LayoutConfig:
@@ -60,6 +74,40 @@ class LayoutConfig:
     service_zone_padding_y: float = 30.0
     service_zone_label_font_size: float = 20.0
     service_zone_label_gap: float = 12.0
+    quality: LayoutQuality = LAYOUT_QUALITY_FULL
+    time_budget_seconds: float | None = None
+
+
+class _RefinementBudget:
+    def __init__(self, quality: LayoutQuality, time_budget_seconds: float | None) -> None:
+        self.quality = quality
+        self._deadline = (
+            None
+            if time_budget_seconds is None
+            else time.perf_counter() + max(0.0, time_budget_seconds)
+        )
+        self._applied: dict[str, None] = {}
+        self._skipped: dict[str, None] = {}
+        self._exhausted = False
+
+    def allows(self, pass_name: str) -> bool:
+        if self.quality == LAYOUT_QUALITY_FAST:
+            self._skipped[pass_name] = None
+            return False
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            self._exhausted = True
+            self._skipped[pass_name] = None
+            return False
+        self._applied[pass_name] = None
+        return True
+
+    def result(self) -> LayoutRefinement:
+        return LayoutRefinement(
+            quality=self.quality,
+            applied=list(self._applied),
+            skipped=list(self._skipped),
+            budget_exhausted=self._exhausted,
+        )
 
 
 @dataclass(frozen=True)
@@ -77,6 +125,78 @@ class ReturnSubprocedureSpec:
     return_target_block_ids: tuple[str, ...]
 
 
+class _SegmentIndex:
+    MAX_CELLS_PER_SEGMENT = 64
+
+    def __init__(self, cell_size: float) -> None:
+        self._cell_size = cell_size
+        self._segments: list[tuple[Point, Point]] = []
+        self._segment_cells: list[list[tuple[int, int]]] = []
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._wide_segments: set[int] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self._segments)
+
+    def add(self, start: Point, end: Point) -> int:
+        idx = len(self._segments)
+        self._segments.append((start, end))
+        self._segment_cells.append([])
+        self._insert(idx)
+        return idx
+
+    def move(self, idx: int, start: Point, end: Point) -> None:
+        for cell in self._segment_cells[idx]:
+            self._cells[cell].discard(idx)
+        self._segment_cells[idx] = []
+        self._wide_segments.discard(idx)
+        self._segments[idx] = (start, end)
+        self._insert(idx)
+
+    def segment(self, idx: int) -> tuple[Point, Point]:
+        return self._segments[idx]
+
+    def candidates(self, rect: tuple[float, float, float, float]) -> set[int]:
+        found = set(self._wide_segments)
+        for cell in self._cells_for_bounds(*rect):
+            found.update(self._cells.get(cell, ()))
+        return found
+
+    def _insert(self, idx: int) -> None:
+        start, end = self._segments[idx]
+        bounds = (
+            min(start.x, end.x),
+            min(start.y, end.y),
+            max(start.x, end.x),
+            max(start.y, end.y),
+        )
+        col_min, row_min, col_max, row_max = self._cell_range(*bounds)
+        if (col_max - col_min + 1) * (row_max - row_min + 1) > self.MAX_CELLS_PER_SEGMENT:
+            self._wide_segments.add(idx)
+            return
+        cells = list(self._cells_for_bounds(*bounds))
+        self._segment_cells[idx] = cells
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(idx)
+
+    def _cell_range(self, x1: float, y1: float, x2: float, y2: float) -> tuple[int, int, int, int]:
+        size = self._cell_size
+        return (
+            math.floor(x1 / size),
+            math.floor(y1 / size),
+            math.floor(x2 / size),
+            math.floor(y2 / size),
+        )
+
+    def _cells_for_bounds(
+        self, x1: float, y1: float, x2: float, y2: float
+    ) -> Iterable[tuple[int, int]]:
+        col_min, row_min, col_max, row_max = self._cell_range(x1, y1, x2, y2)
+        for col in range(col_min, col_max + 1):
+            for row in range(row_min, row_max + 1):
+                yield (col, row)
+
+
 class GridLayoutEngine(LayoutEngine):
     def __init__(self, config: LayoutConfig | None = None) -> None:
         self.config = config or LayoutConfig()
@@ -86,6 +206,7 @@ class GridLayoutEngine(LayoutEngine):
         blocks: list[BlockPlacement] = []
         markers: list[MarkerPlacement] = []
         scenarios: list[ScenarioPlacement] = []
+        budget = _RefinementBudget(self.config.quality, self.config.time_budget_seconds)
 
         block_graph_nodes = self._block_graph_nodes(document) if document.block_graph else set()
         owned_blocks_by_proc = self._resolve_owned_blocks(document, block_graph_nodes)
@@ -120,6 +241,17 @@ class GridLayoutEngine(LayoutEngine):
                         adjacency[parent].append(child)
         sizing: dict[str, Size] = {}
         block_level_cache: dict[str, dict[str, int]] = {}
+        block_layout_cache: dict[
+            str,
+            tuple[
+                dict[str, int],
+                int,
+                dict[int, float],
+                list[str],
+                dict[str, float],
+                dict[str, NodeInfo],
+            ],
+        ] = {}
         layout_edges_by_proc = self._layout_edges_by_proc(
             document, procedures, owned_blocks_by_proc
         )
@@ -152,7 +284,7 @@ class GridLayoutEngine(LayoutEngine):
 
         # Pre-compute frame sizes using left-to-right levels inside each procedure.
         for procedure in procedures:
-            node_levels, max_level, row_counts, _, _, _ = self._compute_block_levels(
+            block_layout = self._compute_block_levels(
                 procedure,
                 owned_blocks_by_proc.get(procedure.procedure_id),
                 layout_edges_by_proc.get(procedure.procedure_id),
@@ -160,7 +292,10 @@ class GridLayoutEngine(LayoutEngine):
                 end_block_row_offsets.get(procedure.procedure_id),
                 return_target_level_constraints.get(procedure.procedure_id),
                 intermediate_call_blocks.get(procedure.procedure_id),
+                budget=budget,
             )
+            block_layout_cache[procedure.procedure_id] = block_layout
+            node_levels, max_level, row_counts, _, _, _ = block_layout
             block_level_cache[procedure.procedure_id] = node_levels
             cols = max_level + 1
             rows = max(row_counts.values() or [1])
@@ -261,15 +396,16 @@ class GridLayoutEngine(LayoutEngine):
             else:
                 origin_y += component_height + proc_gap_y
 
-        frames = self._reposition_return_subprocedures(
-            frames=frames,
-            document=document,
-            procedures=procedures,
-            owned_blocks_by_proc=owned_blocks_by_proc,
-            block_level_cache=block_level_cache,
-            order_index=order_index,
-            return_specs=return_specs,
-        )
+        if return_specs and budget.allows(PASS_RETURN_SUBPROCEDURES):
+            frames = self._reposition_return_subprocedures(
+                frames=frames,
+                document=document,
+                procedures=procedures,
+                owned_blocks_by_proc=owned_blocks_by_proc,
+                block_level_cache=block_level_cache,
+                order_index=order_index,
+                return_specs=return_specs,
+            )
 
         procedure_map = {proc.procedure_id: proc for proc in procedures}
         for frame in frames:
@@ -277,15 +413,9 @@ class GridLayoutEngine(LayoutEngine):
             if frame_proc is None:
                 continue
             placement_by_block: dict[str, BlockPlacement] = {}
-            node_levels, max_level, _, order, row_positions, node_info = self._compute_block_levels(
-                frame_proc,
-                owned_blocks_by_proc.get(frame_proc.procedure_id),
-                layout_edges_by_proc.get(frame_proc.procedure_id),
-                set(frame_proc.branches.keys()),
-                end_block_row_offsets.get(frame_proc.procedure_id),
-                return_target_level_constraints.get(frame_proc.procedure_id),
-                intermediate_call_blocks.get(frame_proc.procedure_id),
-            )
+            node_levels, max_level, _, order, row_positions, node_info = block_layout_cache[
+                frame_proc.procedure_id
+            ]
             start_extra = self.config.marker_size.width + self.config.gap_x * 0.8
             level_rows: dict[int, float] = {lvl: 0.0 for lvl in range(max_level + 1)}
             for node_id in order:
@@ -346,11 +476,10 @@ class GridLayoutEngine(LayoutEngine):
                     )
                 )
 
-        if blocks:
+        if blocks and budget.allows(PASS_EDGE_AVOIDANCE):
             self._adjust_blocks_for_edges(document, blocks, markers)
-
-        if blocks and markers:
-            self._adjust_start_markers_for_edges(document, blocks, markers)
+            if markers:
+                self._adjust_start_markers_for_edges(document, blocks, markers)
 
         if frames:
             return_block_lookup = {
@@ -379,6 +508,7 @@ class GridLayoutEngine(LayoutEngine):
             markers=markers,
             separators=separators,
             scenarios=scenarios,
+            refinement=budget.result(),
         )
 
     def _reposition_return_subprocedures(
@@ -599,28 +729,23 @@ class GridLayoutEngine(LayoutEngine):
             frames, key=lambda frame: (frame.origin.y, frame.origin.x, frame.procedure_id)
         )
         placed: list[FramePlacement] = []
+        placed_index = IntervalIndex(max((frame.size.width for frame in frames), default=1.0))
         remapped: dict[str, FramePlacement] = {}
         for frame in ordered:
-            y = frame.origin.y
-            while True:
-                conflicts = [
-                    other
-                    for other in placed
-                    if self._frames_overlap_horizontally(frame, other)
-                    and not (
-                        y + frame.size.height + min_gap <= other.origin.y
-                        or other.origin.y + other.size.height + min_gap <= y
-                    )
-                ]
-                if not conflicts:
-                    break
-                y = max(other.origin.y + other.size.height + min_gap for other in conflicts)
+            candidates = placed_index.overlapping(frame.origin.x, frame.origin.x + frame.size.width)
+            blockers = [
+                (placed[idx].origin.y, placed[idx].origin.y + placed[idx].size.height)
+                for idx in candidates
+                if self._frames_overlap_horizontally(frame, placed[idx])
+            ]
+            y = stack_below(frame.origin.y, frame.size.height, min_gap, blockers)
             shifted = FramePlacement(
                 procedure_id=frame.procedure_id,
                 origin=Point(frame.origin.x, y),
                 size=frame.size,
             )
             placed.append(shifted)
+            placed_index.add(shifted.origin.x, shifted.origin.x + shifted.size.width)
             remapped[frame.procedure_id] = shifted
         return [remapped.get(frame.procedure_id, frame) for frame in frames]
 
@@ -918,13 +1043,10 @@ class GridLayoutEngine(LayoutEngine):
             metrics = compute_graph_metrics(block_graph)
             vertex_label = "вершин (блоков)"
         else:
-            adjacency: dict[str, list[str]] = {node: [] for node in component}
-            for parent, children in procedure_graph.items():
-                if parent not in component:
-                    continue
-                for child in children:
-                    if child in component:
-                        adjacency[parent].append(child)
+            adjacency = {
+                node: [child for child in procedure_graph.get(node, []) if child in component]
+                for node in component
+            }
             metrics = compute_graph_metrics(adjacency)
             vertex_label = "вершин"
 
@@ -991,27 +1113,8 @@ class GridLayoutEngine(LayoutEngine):
             if not starts:
                 starts = list(nodes)
 
-        terminals = {node for node in nodes if not adjacency.get(node)}
-        memo: dict[str, int] = {}
-        visiting: set[str] = set()
-
-        def dfs(node: str) -> int:
-            if node in memo:
-                return memo[node]
-            if node in visiting:
-                return 0
-            if node in terminals:
-                memo[node] = 1
-                return 1
-            visiting.add(node)
-            total = 0
-            for child in adjacency.get(node, []):
-                total += dfs(child)
-            visiting.remove(node)
-            memo[node] = total
-            return total
-
-        return sum(dfs(node) for node in starts)
+        graph = IndexedGraph.from_adjacency(adjacency, nodes=nodes, unique_targets=False)
+        return graph.count_paths(graph.index[node] for node in starts)
 
     def _procedure_order_hint(
         self, procedures: Sequence[Procedure], procedure_graph: dict[str, list[str]]
@@ -1334,7 +1437,7 @@ class GridLayoutEngine(LayoutEngine):
         blocks: Sequence[BlockPlacement],
         markers: list[MarkerPlacement],
     ) -> None:
-        edge_segments = self._block_edge_segments(document, blocks)
+        edge_segments = self._segment_index(self._block_edge_segments(document, blocks))
         if not edge_segments:
             return
         start_markers = [m for m in markers if m.role == "start_marker"]
@@ -1383,6 +1486,19 @@ class GridLayoutEngine(LayoutEngine):
         block_index = {
             (block.procedure_id, block.block_id): idx for idx, block in enumerate(blocks)
         }
+        marker_index: dict[tuple[str, str], list[int]] = {}
+        for marker_idx, marker in enumerate(markers):
+            marker_index.setdefault((marker.procedure_id, marker.block_id), []).append(marker_idx)
+        segment_index = self._segment_index((start, end) for _, _, start, end in edge_segments)
+        segment_endpoints: list[tuple[tuple[str, str], tuple[str, str]]] = []
+        segments_by_block: dict[tuple[str, str], list[int]] = {}
+        for segment_idx, (source_block, target_block, _start, _end) in enumerate(edge_segments):
+            source_key = (source_block.procedure_id, source_block.block_id)
+            target_key = (target_block.procedure_id, target_block.block_id)
+            segment_endpoints.append((source_key, target_key))
+            segments_by_block.setdefault(source_key, []).append(segment_idx)
+            if target_key != source_key:
+                segments_by_block.setdefault(target_key, []).append(segment_idx)
         row_shift = self.config.block_size.height + self.config.gap_y
 
         def shift_block(proc_id: str, block_id: str, dy: float) -> None:
@@ -1396,53 +1512,67 @@ class GridLayoutEngine(LayoutEngine):
                 position=Point(block.position.x, block.position.y + dy),
                 size=block.size,
             )
-            for marker_idx, marker in enumerate(markers):
-                if marker.procedure_id == proc_id and marker.block_id == block_id:
-                    markers[marker_idx] = MarkerPlacement(
-                        procedure_id=marker.procedure_id,
-                        block_id=marker.block_id,
-                        role=marker.role,
-                        position=Point(marker.position.x, marker.position.y + dy),
-                        size=marker.size,
-                        end_type=marker.end_type,
-                    )
+            for marker_idx in marker_index.get((proc_id, block_id), ()):
+                marker = markers[marker_idx]
+                markers[marker_idx] = MarkerPlacement(
+                    procedure_id=marker.procedure_id,
+                    block_id=marker.block_id,
+                    role=marker.role,
+                    position=Point(marker.position.x, marker.position.y + dy),
+                    size=marker.size,
+                    end_type=marker.end_type,
+                )
+            for segment_idx in segments_by_block.get((proc_id, block_id), ()):
+                source_key, target_key = segment_endpoints[segment_idx]
+                start, end = self._block_edge_segment(
+                    blocks[block_index[source_key]],
+                    blocks[block_index[target_key]],
+                )
+                segment_index.move(segment_idx, start, end)
 
         for proc_id, block_id in start_blocks:
             idx = block_index.get((proc_id, block_id))
             if idx is None:
                 continue
+            block_key = (proc_id, block_id)
             for _ in range(3):
                 block = blocks[idx]
                 rect = self._rect_bounds(block.position, block.size)
                 intersects = False
-                for source_block, target_block, start, end in edge_segments:
-                    if (
-                        source_block.block_id == block.block_id
-                        and source_block.procedure_id == block.procedure_id
-                    ) or (
-                        target_block.block_id == block.block_id
-                        and target_block.procedure_id == block.procedure_id
-                    ):
+                for segment_idx in segment_index.candidates(rect):
+                    if block_key in segment_endpoints[segment_idx]:
                         continue
+                    start, end = segment_index.segment(segment_idx)
                     if self._segment_intersects_rect(start, end, rect):
                         intersects = True
                         break
                 if not intersects:
                     break
                 shift_block(proc_id, block_id, row_shift)
-                edge_segments = self._block_edge_segments_with_blocks(document, blocks)
 
     def _segment_intersects_rect_any(
         self,
-        edge_segments: Sequence[tuple[Point, Point]],
+        edge_segments: _SegmentIndex,
         marker: MarkerPlacement,
     ) -> bool:
         rect = self._rect_bounds(marker.position, marker.size)
-        for start, end in edge_segments:
+        for segment_idx in edge_segments.candidates(rect):
+            start, end = edge_segments.segment(segment_idx)
             if self._segment_intersects_rect(start, end, rect):
                 return True
         return False
 
+    def _segment_index(self, segments: Iterable[tuple[Point, Point]]) -> _SegmentIndex:
+        index = _SegmentIndex(
+            max(
+                self.config.block_size.width + self.config.gap_x,
+                self.config.block_size.height + self.config.gap_y,
+            )
+        )
+        for start, end in segments:
+            index.add(start, end)
+        return index
+
     def _block_edge_segments(
         self,
         document: MarkupDocument,
@@ -1609,34 +1739,7 @@ class GridLayoutEngine(LayoutEngine):
         document: MarkupDocument,
         block_graph_nodes: set[str] | None = None,
     ) -> dict[str, set[str]]:
-        explicit_owners: dict[str, set[str]] = {}
-        for procedure in document.procedures:
-            proc_id = procedure.procedure_id
-            explicit_blocks = (
-                set(procedure.start_block_ids)
-                | set(procedure.end_block_ids)
-                | set(procedure.branches.keys())
-            )
-            if block_graph_nodes:
-                explicit_blocks.update(
-                    set(procedure.block_id_to_block_name.keys()) & block_graph_nodes
-                )
-            for block_id in explicit_blocks:
-                explicit_owners.setdefault(block_id, set()).add(proc_id)
-
-        owned_by_proc: dict[str, set[str]] = {}
-        for procedure in document.procedures:
-            proc_id = procedure.procedure_id
-            owned: set[str] = set()
-            for block_id, owners in explicit_owners.items():
-                if proc_id in owners:
-                    owned.add(block_id)
-            for targets in procedure.branches.values():
-                for target in targets:
-                    if target not in explicit_owners:
-                        owned.add(target)
-            owned_by_proc[proc_id] = owned
-        return owned_by_proc
+        return resolve_owned_blocks(document, block_graph_nodes)
 
     def _infer_procedure_graph_from_block_graph(
         self,
@@ -1684,85 +1787,37 @@ class GridLayoutEngine(LayoutEngine):
     def _procedure_components(
         self, proc_ids: list[str], adjacency: dict[str, list[str]]
     ) -> list[set[str]]:
-        undirected: dict[str, set[str]] = {proc_id: set() for proc_id in proc_ids}
-        for parent, children in adjacency.items():
-            for child in children:
-                if child not in undirected:
-                    continue
-                undirected[parent].add(child)
-                undirected[child].add(parent)
-        visited: set[str] = set()
-        components: list[set[str]] = []
-        for node in proc_ids:
-            if node in visited:
-                continue
-            stack = [node]
-            component: set[str] = set()
-            while stack:
-                current = stack.pop()
-                if current in visited:
-                    continue
-                visited.add(current)
-                component.add(current)
-                stack.extend(undirected.get(current, set()) - visited)
-            components.append(component)
-        return components
+        graph = IndexedGraph.from_adjacency(adjacency, nodes=proc_ids, restrict_to_nodes=True)
+        return [set(graph.ids(component)) for component in graph.weak_components()]
 
     def _procedure_levels(
         self,
-        component: set[str],
+        component: Iterable[str],
         adjacency: dict[str, list[str]],
         order_index: dict[str, int],
     ) -> dict[str, int]:
-        indegree: dict[str, int] = {proc_id: 0 for proc_id in component}
-        for _parent, children in adjacency.items():
-            for child in children:
-                if child in indegree:
-                    indegree[child] += 1
-        queue = [
-            (order_index.get(proc_id, 0), proc_id) for proc_id, deg in indegree.items() if deg == 0
-        ]
-        heapq.heapify(queue)
-        levels: dict[str, int] = {proc_id: 0 for proc_id in component}
-        while queue:
-            _, node = heapq.heappop(queue)
-            for child in adjacency.get(node, []):
-                if child not in levels:
-                    continue
-                levels[child] = max(levels.get(child, 0), levels.get(node, 0) + 1)
-                indegree[child] -= 1
-                if indegree[child] == 0:
-                    heapq.heappush(queue, (order_index.get(child, 0), child))
-        return levels
+        graph = IndexedGraph.from_adjacency(
+            adjacency, nodes=component, restrict_to_nodes=True, unique_targets=False
+        )
+        levels = graph.topological_levels(
+            [(order_index.get(proc_id, 0), proc_id) for proc_id in graph.node_ids]
+        )
+        return dict(zip(graph.node_ids, levels, strict=True))
 
     def _find_cycle_edges(
         self, adjacency: dict[str, list[str]], order_index: dict[str, int] | None = None
     ) -> set[tuple[str, str]]:
-        nodes = set(adjacency.keys())
-        for children in adjacency.values():
-            nodes.update(children)
-        visited: dict[str, int] = {}
-        cycle_edges: set[tuple[str, str]] = set()
-
         def sort_key(node_id: str) -> tuple[int, str]:
             if order_index is None:
                 return (0, node_id)
             return (order_index.get(node_id, 0), node_id)
 
-        def dfs(node: str) -> None:
-            visited[node] = 1
-            for child in sorted(adjacency.get(node, []), key=sort_key):
-                state = visited.get(child, 0)
-                if state == 0:
-                    dfs(child)
-                elif state == 1:
-                    cycle_edges.add((node, child))
-            visited[node] = 2
-
-        for node in sorted(nodes, key=sort_key):
-            if visited.get(node, 0) == 0:
-                dfs(node)
-        return cycle_edges
+        graph = IndexedGraph.from_adjacency(adjacency, unique_targets=False, sort_key=sort_key)
+        roots = sorted(range(len(graph)), key=lambda node: sort_key(graph.node_ids[node]))
+        return {
+            (graph.node_ids[source], graph.node_ids[target])
+            for source, target in graph.back_edges(roots)
+        }
 
     def _compute_block_levels(
         self,
@@ -1773,6 +1828,8 @@ class GridLayoutEngine(LayoutEngine):
         end_block_row_offsets: Mapping[str, float] | None = None,
         min_block_levels: Mapping[str, int] | None = None,
         bottom_bias_blocks: set[str] | None = None,
+        *,
+        budget: _RefinementBudget | None = None,
     ) -> tuple[
         dict[str, int],
         int,
@@ -2111,69 +2168,70 @@ class GridLayoutEngine(LayoutEngine):
         positions = update_positions()
 
         # Barycentric sweeps keep connected nodes closer across columns.
-        for _ in range(3):
-            for lvl in range(1, max_level + 1):
-                nodes = level_order.get(lvl, [])
-                if not nodes:
-                    continue
-                index = {node_id: idx for idx, node_id in enumerate(nodes)}
-
-                def anchor_parent(
-                    node_id: str,
-                    _lvl: int = lvl,
-                    _positions: dict[str, float] = positions,
-                    _index: dict[str, int] = index,
-                ) -> float:
-                    parents = [
-                        parent
-                        for parent in incoming.get(node_id, [])
-                        if levels.get(parent, 0) == _lvl - 1
-                        and node_info.get(parent)
-                        and node_info[parent].kind == "block"
-                    ]
-                    if parents:
-                        return sum(_positions.get(p, 0.0) for p in parents) / len(parents)
-                    return _positions.get(node_id, float(_index[node_id]))
-
-                nodes.sort(key=lambda n: (anchor_parent(n), index[n], n))
-                level_order[lvl] = nodes
-            positions = update_positions()
+        if budget is None or budget.allows(PASS_BARYCENTRIC_SWEEPS):
+            for _ in range(3):
+                for lvl in range(1, max_level + 1):
+                    nodes = level_order.get(lvl, [])
+                    if not nodes:
+                        continue
+                    index = {node_id: idx for idx, node_id in enumerate(nodes)}
+
+                    def anchor_parent(
+                        node_id: str,
+                        _lvl: int = lvl,
+                        _positions: dict[str, float] = positions,
+                        _index: dict[str, int] = index,
+                    ) -> float:
+                        parents = [
+                            parent
+                            for parent in incoming.get(node_id, [])
+                            if levels.get(parent, 0) == _lvl - 1
+                            and node_info.get(parent)
+                            and node_info[parent].kind == "block"
+                        ]
+                        if parents:
+                            return sum(_positions.get(p, 0.0) for p in parents) / len(parents)
+                        return _positions.get(node_id, float(_index[node_id]))
 
-            for lvl in range(max_level - 1, -1, -1):
-                nodes = level_order.get(lvl, [])
-                if not nodes:
-                    continue
-                index = {node_id: idx for idx, node_id in enumerate(nodes)}
+                    nodes.sort(key=lambda n: (anchor_parent(n), index[n], n))
+                    level_order[lvl] = nodes
+                positions = update_positions()
 
-                def anchor_child(
-                    node_id: str,
-                    _lvl: int = lvl,
-                    _positions: dict[str, float] = positions,
-                    _index: dict[str, int] = index,
-                ) -> float:
-                    parents = [
-                        parent
-                        for parent in incoming.get(node_id, [])
-                        if levels.get(parent, 0) == _lvl - 1
-                        and node_info.get(parent)
-                        and node_info[parent].kind == "block"
-                    ]
-                    if not parents:
+                for lvl in range(max_level - 1, -1, -1):
+                    nodes = level_order.get(lvl, [])
+                    if not nodes:
+                        continue
+                    index = {node_id: idx for idx, node_id in enumerate(nodes)}
+
+                    def anchor_child(
+                        node_id: str,
+                        _lvl: int = lvl,
+                        _positions: dict[str, float] = positions,
+                        _index: dict[str, int] = index,
+                    ) -> float:
+                        parents = [
+                            parent
+                            for parent in incoming.get(node_id, [])
+                            if levels.get(parent, 0) == _lvl - 1
+                            and node_info.get(parent)
+                            and node_info[parent].kind == "block"
+                        ]
+                        if not parents:
+                            return _positions.get(node_id, float(_index[node_id]))
+                        children = [
+                            child
+                            for child in adj.get(node_id, [])
+                            if levels.get(child, 0) == _lvl + 1
+                            and node_info.get(child)
+                            and node_info[child].kind == "block"
+                        ]
+                        if children:
+                            return sum(_positions.get(c, 0.0) for c in children) / len(children)
                         return _positions.get(node_id, float(_index[node_id]))
-                    children = [
-                        child
-                        for child in adj.get(node_id, [])
-                        if levels.get(child, 0) == _lvl + 1
-                        and node_info.get(child)
-                        and node_info[child].kind == "block"
-                    ]
-                    if children:
-                        return sum(_positions.get(c, 0.0) for c in children) / len(children)
-                    return _positions.get(node_id, float(_index[node_id]))
-
-                nodes.sort(key=lambda n: (anchor_child(n), index[n], n))
-                level_order[lvl] = nodes
-            positions = update_positions()
+
+                    nodes.sort(key=lambda n: (anchor_child(n), index[n], n))
+                    level_order[lvl] = nodes
+                positions = update_positions()
 
         def row_span(node_id: str) -> float:
             info = node_info.get(node_id)
@@ -2252,9 +2310,10 @@ class GridLayoutEngine(LayoutEngine):
                     prev_pos = pos
                     prev_span = row_span(node_id)
 
-        for _ in range(3):
+        if budget is None or budget.allows(PASS_ROW_SMOOTHING):
+            for _ in range(3):
+                apply_row_smoothing()
             apply_row_smoothing()
-        apply_row_smoothing()
 
         if end_block_row_offsets:
             for node_id, info in node_info.items():
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator, Sequence
+
+Interval = tuple[float, float]
+
+
+class IntervalIndex:
+    MAX_BUCKETS_PER_INTERVAL = 64
+
+    def __init__(self, bucket_size: float) -> None:
+        self._bucket_size = bucket_size if bucket_size > 0 else 1.0
+        self._intervals: list[Interval] = []
+        self._buckets: dict[int, list[int]] = {}
+        self._wide: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, start: float, end: float) -> int:
+        idx = len(self._intervals)
+        self._intervals.append((start, end))
+        first, last = self._bucket_range(start, end)
+        if last - first + 1 > self.MAX_BUCKETS_PER_INTERVAL:
+            self._wide.append(idx)
+            return idx
+        for bucket in range(first, last + 1):
+            self._buckets.setdefault(bucket, []).append(idx)
+        return idx
+
+    def overlapping(self, start: float, end: float) -> list[int]:
+        first, last = self._bucket_range(start, end)
+        found: set[int] = set(self._wide)
+        for bucket in range(first, last + 1):
+            found.update(self._buckets.get(bucket, ()))
+        return [
+            idx
+            for idx in sorted(found)
+            if self._intervals[idx][0] <= end and self._intervals[idx][1] >= start
+        ]
+
+    def _bucket_range(self, start: float, end: float) -> tuple[int, int]:
+        return math.floor(start / self._bucket_size), math.floor(end / self._bucket_size)
+
+
+def overlapping_pairs(
+    intervals: Sequence[Interval],
+    *,
+    tolerance: float = 0.0,
+) -> Iterator[tuple[int, int]]:
+    order = sorted(range(len(intervals)), key=lambda idx: intervals[idx][0])
+    active: list[int] = []
+    for idx in order:
+        start = intervals[idx][0]
+        active = [other for other in active if intervals[other][1] + tolerance >= start]
+        for other in active:
+            yield (other, idx) if other < idx else (idx, other)
+        active.append(idx)
+
+
+def stack_below(
+    y: float,
+    height: float,
+    gap: float,
+    blockers: Sequence[Interval],
+) -> float:
+    ordered = sorted(blockers)
+    cursor = 0
+    reach: float | None = None
+    while True:
+        limit = y + height + gap
+        while cursor < len(ordered) and ordered[cursor][0] < limit:
+            candidate = ordered[cursor][1] + gap
+            if reach is None or candidate > reach:
+                reach = candidate
+            cursor += 1
+        if reach is None or reach <= y:
+            return y
+        y = reach
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from itertools import pairwise
 
 from adapters.layout.grid import GridLayoutEngine, LayoutConfig
+from adapters.layout.overlap import IntervalIndex, overlapping_pairs
 from domain.markup_type_labels import humanize_markup_type_for_brackets
 from domain.models import (
     FramePlacement,
@@ -28,6 +29,7 @@ _MARKUP_TYPE_COLUMN_ORDER = (
     "system_task_processor",
     "system_default",
 )
+_OVERLAP_TOLERANCE = 1e-3
 _MARKUP_TYPE_COLUMN_ORDER_INDEX = {
     markup_type: idx for idx, markup_type in enumerate(_MARKUP_TYPE_COLUMN_ORDER)
 }
@@ -160,9 +162,12 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
 
         for idx, component in enumerate(components):
             component_top = origin_y
+            ordered_component = sorted(
+                component, key=lambda proc_id: (order_index.get(proc_id, 0), proc_id)
+            )
             component_adjacency = {
                 proc_id: [child for child in adjacency.get(proc_id, []) if child in component]
-                for proc_id in component
+                for proc_id in ordered_component
             }
             cycle_edges = self._find_cycle_edges(component_adjacency, order_index)
             for source, target in cycle_edges:
@@ -170,16 +175,16 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
                     child for child in component_adjacency.get(source, []) if child != target
                 ]
 
-            levels = self._procedure_levels(component, component_adjacency, order_index)
+            levels = self._procedure_levels(ordered_component, component_adjacency, order_index)
             max_level = max(levels.values() or [0])
             level_nodes: dict[int, list[str]] = {lvl: [] for lvl in range(max_level + 1)}
             for proc_id, lvl in levels.items():
                 level_nodes.setdefault(lvl, []).append(proc_id)
             for nodes in level_nodes.values():
-                nodes.sort(key=lambda proc_id: order_index.get(proc_id, 0))
+                nodes.sort(key=lambda proc_id: (order_index.get(proc_id, 0), proc_id))
 
             service_info_by_key, proc_service_keys = self._component_service_info(
-                component,
+                ordered_component,
                 procedure_meta,
                 default_markup_type,
             )
@@ -523,7 +528,7 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
     ) -> ScenarioPlacement | None:
         procedure_meta = procedure_meta or {}
         component_frames = [
-            frame_lookup[proc_id] for proc_id in component if proc_id in frame_lookup
+            frame_lookup[proc_id] for proc_id in sorted(component) if proc_id in frame_lookup
         ]
         if not component_frames:
             return None
@@ -784,10 +789,11 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
 
         group_member_ids = {proc_id for members in chain_groups.values() for proc_id in members}
         occupied_rects: list[tuple[float, float, float, float]] = []
+        occupied_index = IntervalIndex(max(frame.size.height for frame in component_frames))
         for frame in component_frames:
             if frame.procedure_id in group_member_ids:
                 continue
-            occupied_rects.append(self._frame_rect(frame))
+            self._add_occupied_rect(occupied_rects, occupied_index, self._frame_rect(frame))
 
         updated = dict(frame_by_proc)
         horizontal_gap = max(20.0, self.config.gap_y * 0.5)
@@ -834,6 +840,7 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
                 if not self._chain_rects_overlap_any(
                     rects,
                     occupied_rects,
+                    occupied_index,
                     padding=vertical_padding,
                 ):
                     break
@@ -849,7 +856,7 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
 
             for item in planned:
                 updated[item.procedure_id] = item
-                occupied_rects.append(self._frame_rect(item))
+                self._add_occupied_rect(occupied_rects, occupied_index, self._frame_rect(item))
 
         aligned_frames = [updated.get(frame.procedure_id, frame) for frame in component_frames]
         return self._normalize_component_row_spacing(aligned_frames)
@@ -862,16 +869,27 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
             frame.origin.y + frame.size.height,
         )
 
+    def _add_occupied_rect(
+        self,
+        occupied: list[tuple[float, float, float, float]],
+        occupied_index: IntervalIndex,
+        rect: tuple[float, float, float, float],
+    ) -> None:
+        occupied.append(rect)
+        occupied_index.add(rect[1], rect[3])
+
     def _chain_rects_overlap_any(
         self,
         rects: list[tuple[float, float, float, float]],
         occupied: list[tuple[float, float, float, float]],
+        occupied_index: IntervalIndex,
         *,
         padding: float,
     ) -> bool:
+        margin = padding + 1.0
         for left in rects:
-            for right in occupied:
-                if self._chain_rects_overlap(left, right, padding=padding):
+            for idx in occupied_index.overlapping(left[1] - margin, left[3] + margin):
+                if self._chain_rects_overlap(left, occupied[idx], padding=padding):
                     return True
         return False
 
@@ -961,7 +979,7 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
         if not merge_ids:
             return [], None, None, None
 
-        merge_ids.sort(key=lambda proc_id: order_index.get(proc_id, 0))
+        merge_ids.sort(key=lambda proc_id: (order_index.get(proc_id, 0), proc_id))
         header = "Узлы слияния:"
         font_size = self.config.scenario_merge_font_size
         line_height = font_size * 1.35
@@ -1268,7 +1286,7 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
 
     def _component_service_info(
         self,
-        component: set[str],
+        component: Iterable[str],
         procedure_meta: Mapping[str, Mapping[str, object]],
         default_markup_type: str,
     ) -> tuple[dict[str, _ServiceInfo], dict[str, list[str]]]:
@@ -1415,12 +1433,16 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
 
         contains: dict[str, list[str]] = {key: [] for key in drafts}
         draft_items = list(drafts.items())
-        for idx, (outer_key, outer) in enumerate(draft_items):
-            for inner_key, inner in draft_items[idx + 1 :]:
-                if self._rect_contains(outer.origin, outer.size, inner.origin, inner.size):
-                    contains[outer_key].append(inner_key)
-                elif self._rect_contains(inner.origin, inner.size, outer.origin, outer.size):
-                    contains[inner_key].append(outer_key)
+        for outer_idx, inner_idx in overlapping_pairs(
+            [(draft.origin.x, draft.origin.x + draft.size.width) for _, draft in draft_items],
+            tolerance=_OVERLAP_TOLERANCE,
+        ):
+            outer_key, outer = draft_items[outer_idx]
+            inner_key, inner = draft_items[inner_idx]
+            if self._rect_contains(outer.origin, outer.size, inner.origin, inner.size):
+                contains[outer_key].append(inner_key)
+            elif self._rect_contains(inner.origin, inner.size, outer.origin, outer.size):
+                contains[inner_key].append(outer_key)
 
         depth_cache: dict[str, int] = {}
         visiting: set[str] = set()
@@ -2110,18 +2132,22 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
         )
 
     def _zones_have_non_nested_overlap(self, zones: list[ServiceZonePlacement]) -> bool:
-        for idx, first in enumerate(zones):
-            for second in zones[idx + 1 :]:
-                if not self._rects_overlap(first.origin, first.size, second.origin, second.size):
-                    continue
-                first_contains_second = self._rect_contains(
-                    first.origin, first.size, second.origin, second.size
-                )
-                second_contains_first = self._rect_contains(
-                    second.origin, second.size, first.origin, first.size
-                )
-                if not first_contains_second and not second_contains_first:
-                    return True
+        for first_idx, second_idx in overlapping_pairs(
+            [(zone.origin.x, zone.origin.x + zone.size.width) for zone in zones],
+            tolerance=_OVERLAP_TOLERANCE,
+        ):
+            first = zones[first_idx]
+            second = zones[second_idx]
+            if not self._rects_overlap(first.origin, first.size, second.origin, second.size):
+                continue
+            first_contains_second = self._rect_contains(
+                first.origin, first.size, second.origin, second.size
+            )
+            second_contains_first = self._rect_contains(
+                second.origin, second.size, first.origin, first.size
+            )
+            if not first_contains_second and not second_contains_first:
+                return True
         return False
 
     def _edges_cross(
@@ -2148,14 +2174,18 @@ class ProcedureGraphLayoutEngine(GridLayoutEngine):
                 )
                 edges.append((parent, child, start, end))
 
-        for idx, edge in enumerate(edges):
+        for edge_idx, other_idx in overlapping_pairs(
+            [(min(start.x, end.x), max(start.x, end.x)) for _, _, start, end in edges],
+            tolerance=_OVERLAP_TOLERANCE,
+        ):
+            edge = edges[edge_idx]
+            other = edges[other_idx]
+            if edge[0] in other[:2] or edge[1] in other[:2]:
+                continue
             _, _, start_a, end_a = edge
-            for other in edges[idx + 1 :]:
-                if edge[0] in other[:2] or edge[1] in other[:2]:
-                    continue
-                _, _, start_b, end_b = other
-                if self._segments_intersect(start_a, end_a, start_b, end_b):
-                    return True
+            _, _, start_b, end_b = other
+            if self._segments_intersect(start_a, end_a, start_b, end_b):
+                return True
         return False
 
     def _segments_intersect(self, a1: Point, a2: Point, b1: Point, b2: Point) -> bool:
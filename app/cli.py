@@ -11,11 +11,13 @@ from adapters.excalidraw.repository import FileSystemExcalidrawRepository
 from adapters.filesystem.catalog_index_repository import FileSystemCatalogIndexRepository
 from adapters.filesystem.markup_repository import FileSystemMarkupRepository
 from adapters.filesystem.markup_utils import parse_markup_json
+from adapters.layout.cache import CachedLayoutEngine, LayoutPlanCache
 from adapters.layout.grid import GridLayoutEngine
 from adapters.unidraw.repository import FileSystemUnidrawRepository
 from app.catalog_wiring import build_markup_repository, build_markup_source
 from app.config import AppSettings, load_settings
 from domain.models import MarkupDocument
+from domain.ports.layout import LayoutEngine
 from domain.ports.repositories import MarkupRepository
 from domain.services.build_catalog_index import BuildCatalogIndex
 from domain.services.convert_excalidraw_to_markup import ExcalidrawToMarkupConverter
@@ -38,10 +40,11 @@ def _run_convert_to_excalidraw(
     output_dir: Path,
     markup_repo: MarkupRepository | None = None,
     link_templates: ExcalidrawLinkTemplates | None = None,
+    layout: LayoutEngine | None = None,
 ) -> None:
     markup_repo = markup_repo or FileSystemMarkupRepository()
     excal_repo = FileSystemExcalidrawRepository()
-    layout = GridLayoutEngine()
+    layout = layout or GridLayoutEngine()
     converter = MarkupToExcalidrawConverter(layout, link_templates=link_templates)
 
     pairs = markup_repo.load_all_with_paths(input_dir)
@@ -75,15 +78,23 @@ def _run_convert_from_excalidraw(input_dir: Path, output_dir: Path) -> None:
         console.print(f"[green]Wrote[/] {target_path}")
 
 
+def _source_timestamp_ms(path: Path) -> int | None:
+    try:
+        return int(path.stat().st_mtime * 1000)
+    except OSError:
+        return None
+
+
 def _run_convert_to_unidraw(
     input_dir: Path,
     output_dir: Path,
     markup_repo: MarkupRepository | None = None,
     link_templates: ExcalidrawLinkTemplates | None = None,
+    layout: LayoutEngine | None = None,
 ) -> None:
     markup_repo = markup_repo or FileSystemMarkupRepository()
     unidraw_repo = FileSystemUnidrawRepository()
-    layout = GridLayoutEngine()
+    layout = layout or GridLayoutEngine()
     converter = MarkupToUnidrawConverter(layout, link_templates=link_templates)
 
     pairs = markup_repo.load_all_with_paths(input_dir)
@@ -93,12 +104,48 @@ def _run_convert_to_unidraw(
 
     output_dir.mkdir(parents=True, exist_ok=True)
     for path, document in pairs:
-        scene = converter.convert(document)
+        scene = converter.convert(document, timestamp_ms=_source_timestamp_ms(path))
         target_path = output_dir / f"{path.stem}.unidraw"
         unidraw_repo.save(scene, target_path)
         console.print(f"[green]Wrote[/] {target_path}")
 
 
+def _run_convert_all(
+    input_dir: Path,
+    excalidraw_dir: Path,
+    unidraw_dir: Path,
+    markup_repo: MarkupRepository | None = None,
+    link_templates: ExcalidrawLinkTemplates | None = None,
+    layout: LayoutEngine | None = None,
+) -> None:
+    markup_repo = markup_repo or FileSystemMarkupRepository()
+    excal_repo = FileSystemExcalidrawRepository()
+    unidraw_repo = FileSystemUnidrawRepository()
+    layout = layout or GridLayoutEngine()
+    excal_converter = MarkupToExcalidrawConverter(layout, link_templates=link_templates)
+    unidraw_converter = MarkupToUnidrawConverter(layout, link_templates=link_templates)
+
+    pairs = markup_repo.load_all_with_paths(input_dir)
+    if not pairs:
+        console.print(f"[yellow]No markup files found in {input_dir}[/]")
+        raise typer.Exit(code=0)
+
+    excalidraw_dir.mkdir(parents=True, exist_ok=True)
+    unidraw_dir.mkdir(parents=True, exist_ok=True)
+    for path, document in pairs:
+        prepared = excal_converter.prepare(document)
+        excal_doc = excal_converter.convert_prepared(prepared)
+        scene = unidraw_converter.convert_prepared(
+            prepared, timestamp_ms=_source_timestamp_ms(path)
+        )
+        excal_path = excalidraw_dir / f"{path.stem}.excalidraw"
+        excal_repo.save(excal_doc, excal_path)
+        console.print(f"[green]Wrote[/] {excal_path}")
+        unidraw_path = unidraw_dir / f"{path.stem}.unidraw"
+        unidraw_repo.save(scene, unidraw_path)
+        console.print(f"[green]Wrote[/] {unidraw_path}")
+
+
 def _run_build_index_from_settings(settings: AppSettings) -> None:
     builder = BuildCatalogIndex(
         build_markup_source(settings),
@@ -156,6 +203,24 @@ def convert_to_unidraw(
     _run_convert_to_unidraw(input_dir, output_dir)
 
 
+@convert_app.command("all")
+def convert_all(
+    input_dir: Path = typer.Option(
+        Path("data/markup"),
+        help="Directory with markup JSON files.",
+    ),
+    excalidraw_dir: Path = typer.Option(
+        Path("data/excalidraw_in"),
+        help="Directory to write Excalidraw scene files.",
+    ),
+    unidraw_dir: Path = typer.Option(
+        Path("data/unidraw_in"),
+        help="Directory to write Unidraw scene files.",
+    ),
+) -> None:
+    _run_convert_all(input_dir, excalidraw_dir, unidraw_dir)
+
+
 @app.command("validate")
 def validate(
     input_path: Path = typer.Argument(..., help="Markup or Excalidraw file to validate."),
@@ -223,11 +288,19 @@ def pipeline_build_all(
         settings.catalog.service_link_path,
         settings.catalog.team_link_path,
     )
+    layout = CachedLayoutEngine(
+        GridLayoutEngine(),
+        LayoutPlanCache(
+            settings.catalog.layout_cache_max_entries,
+            settings.catalog.layout_cache_dir,
+        ),
+    )
     _run_convert_to_excalidraw(
         markup_dir,
         settings.catalog.excalidraw_in_dir,
         markup_repo,
         link_templates=link_templates,
+        layout=layout,
     )
     _run_build_index_from_settings(settings)
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Annotated, ClassVar
+from typing import Annotated, ClassVar, Literal
 from urllib.parse import urlparse
 
 from pydantic import (
@@ -90,12 +90,25 @@ class CatalogSettings(BaseModel):
     excalidraw_proxy_upstream: str | None = None
     excalidraw_proxy_prefix: str = "/excalidraw"
     excalidraw_max_url_length: int = 8000
+    excalidraw_url_cache_max_entries: int = 256
     unidraw_proxy_upstream: str | None = None
     unidraw_proxy_prefix: str = "/unidraw"
     unidraw_max_url_length: int = 8000
     rebuild_token: str | None = None
     health_same_team_overlap_threshold_percent: float = 40.0
     health_cross_team_overlap_threshold_percent: float = 20.0
+    team_graph_max_active_jobs: int = 16
+    team_graph_prewarm_enabled: bool = False
+    team_graph_prewarm_selections: list[list[str]] = Field(default_factory=list)
+    team_graph_prewarm_max_jobs: int = 8
+    layout_cache_max_entries: int = 256
+    layout_cache_dir: Path | None = None
+    layout_quality: Literal["full", "fast"] = "full"
+    layout_time_budget_seconds: float | None = None
+    scene_cache_dir: Path | None = None
+    scene_cache_max_bytes: int = 1024 * 1024 * 1024
+    response_cache_max_entries: int = 64
+    response_compression_enabled: bool = True
     ui_text_overrides: dict[str, str] = Field(default_factory=dict)
     builder_excluded_team_ids: Annotated[list[str], NoDecode] = Field(default_factory=list)
     procedure_link_path: LinkPath | None = Field(
@@ -139,6 +152,39 @@ class CatalogSettings(BaseModel):
             return _split_string_list_value(value)
         return _split_string_list_value(str(value))
 
+    @field_validator("team_graph_prewarm_selections", mode="before")
+    @classmethod
+    def normalize_prewarm_selections(cls, value: object) -> list[list[str]]:
+        if value is None or value == "":
+            return []
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError as exc:
+                msg = "catalog.team_graph_prewarm_selections must be a JSON list"
+                raise ValueError(msg) from exc
+        if not isinstance(value, list):
+            msg = "catalog.team_graph_prewarm_selections must be a list of team id lists"
+            raise TypeError(msg)
+        selections: list[list[str]] = []
+        for item in value:
+            if isinstance(item, list):
+                team_ids = [str(team_id).strip() for team_id in item if str(team_id).strip()]
+            else:
+                team_ids = _split_string_list_value(str(item))
+            if team_ids:
+                selections.append(team_ids)
+        return selections
+
+    @field_validator(
+        "layout_cache_dir", "layout_time_budget_seconds", "scene_cache_dir", mode="before"
+    )
+    @classmethod
+    def normalize_optional_setting(cls, value: object) -> object:
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
     @field_validator("ui_text_overrides", mode="before")
     @classmethod
     def normalize_ui_text_overrides(cls, value: object) -> dict[str, str]:
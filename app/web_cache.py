@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+
+from fastapi.responses import Response
+
+from adapters.filesystem.compression import build_compressed_variants
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@dataclass(frozen=True)
+class CachedJsonResponse:
+    content: bytes
+    etag: str
+    encoded: Mapping[str, bytes] = field(default_factory=dict)
+
+
+class JsonResponseCache:
+    def __init__(self, max_entries: int = 64, compress: bool = True) -> None:
+        self._max_entries = max(0, max_entries)
+        self._compress = compress
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, ...], CachedJsonResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_build(
+        self,
+        key: tuple[str, ...],
+        generation: str,
+        build: Callable[[], bytes],
+    ) -> CachedJsonResponse:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+        content = build()
+        cached = CachedJsonResponse(
+            content=content,
+            etag=build_etag(generation, content),
+            encoded=build_compressed_variants(content) if self._compress else {},
+        )
+        if self._max_entries <= 0:
+            return cached
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def build_etag(generation: str, content: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(generation.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(hashlib.sha256(content).digest())
+    return f'"{digest.hexdigest()[:40]}"'
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+
+def build_response_headers(etag: str, headers: Mapping[str, str] | None = None) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        **(headers or {}),
+    }
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        value = candidate.strip()
+        if value == "*" or value.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: str | None, available: Iterable[str]) -> str | None:
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            param_name, _, value = param.strip().partition("=")
+            if param_name.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best: str | None = None
+    best_weight = 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def not_modified_response(
+    etag: str,
+    if_none_match: str | None,
+    encoding: str | None = None,
+    headers: Mapping[str, str] | None = None,
+) -> Response | None:
+    etag = encoded_etag(etag, encoding)
+    if not etag_matches(if_none_match, etag):
+        return None
+    return Response(status_code=304, headers=build_response_headers(etag, headers))
+
+
+def json_bytes_response(
+    cached: CachedJsonResponse,
+    if_none_match: str | None,
+    accept_encoding: str | None = None,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    encoding = negotiate_encoding(accept_encoding, cached.encoded)
+    not_modified = not_modified_response(cached.etag, if_none_match, encoding, headers)
+    if not_modified is not None:
+        return not_modified
+    response_headers = build_response_headers(encoded_etag(cached.etag, encoding), headers)
+    if encoding is None:
+        return Response(
+            content=cached.content, media_type=JSON_MEDIA_TYPE, headers=response_headers
+        )
+    response_headers["Content-Encoding"] = encoding
+    return Response(
+        content=cached.encoded[encoding], media_type=JSON_MEDIA_TYPE, headers=response_headers
+    )
@@ -88,6 +88,8 @@ _RUSSIAN_TRANSLATIONS: Final[dict[str, str]] = {
     "Scene will be generated on demand from markup.": "Диаграмма будет сгенерирована по запросу из разметки.",
     "Scene file not found in {dir_name}. Run build-all before opening.": "Файл диаграммы не найден в {dir_name}. Запустите build-all перед открытием.",
     "Scene is too large for URL sharing. Use Download + Import.": "Сцена слишком большая для передачи через URL. Используйте Скачать + Импорт.",
+    "Preparing Excalidraw link...": "Готовим ссылку для Excalidraw...",
+    "Failed to prepare Excalidraw link. Use Download + Import.": "Не удалось подготовить ссылку для Excalidraw. Используйте Скачать + Импорт.",
     "Scene is injected via local storage for same-origin Excalidraw.": "Сцена передается через localStorage для same-origin Excalidraw.",
     "If the scene does not load, import the downloaded file manually.": "Если диаграмма не загрузилась, импортируйте скачанный файл вручную.",
     "Markup information": "Информация по разметке",
@@ -114,6 +116,8 @@ _RUSSIAN_TRANSLATIONS: Final[dict[str, str]] = {
     "Merge": "Объединить",
     "Merge ready": "Объединение готово",
     "Merge blocked": "Объединение заблокировано",
+    "Merge cancelled": "Объединение отменено",
+    "Merge queue is full": "Очередь объединений заполнена",
     "Waiting for input": "Ожидание ввода",
     "Procedure-level diagram": "Диаграмма уровня процедур",
     "Service-level diagram": "Диаграмма уровня услуг",
@@ -7,9 +7,10 @@ import json
 import logging
 import os
 import threading
+import uuid
 from collections.abc import Callable, Mapping, Sequence
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 from dataclasses import field as dataclass_field
 from datetime import UTC, datetime, timedelta, timezone, tzinfo
 from pathlib import Path
@@ -24,14 +25,30 @@ from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, Re
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from adapters.excalidraw.url_encoder import build_excalidraw_url
+from adapters.excalidraw.url_encoder import ExcalidrawUrlBuilder
 from adapters.filesystem.catalog_index_repository import FileSystemCatalogIndexRepository
+from adapters.filesystem.compression import available_encodings, build_compressed_variants
+from adapters.filesystem.json_utils import dump_compact_json_bytes
 from adapters.filesystem.markup_repository import FileSystemMarkupRepository
+from adapters.filesystem.scene_cache import (
+    SceneCache,
+    build_scene_cache_key,
+    build_scene_file_cache_key,
+)
 from adapters.filesystem.scene_repository import FileSystemSceneRepository
+from adapters.layout.cache import CachedLayoutEngine, LayoutPlanCache, layout_engine_fingerprint
 from adapters.layout.grid import GridLayoutEngine, LayoutConfig
 from adapters.layout.procedure_graph import ProcedureGraphLayoutEngine
 from app.catalog_wiring import build_markup_repository, build_markup_source
 from app.config import AppSettings, load_settings
+from app.web_cache import (
+    CachedJsonResponse,
+    JsonResponseCache,
+    build_etag,
+    json_bytes_response,
+    negotiate_encoding,
+    not_modified_response,
+)
 from app.web_i18n import (
     UILocalizer,
     apply_ui_language_cookie,
@@ -50,8 +67,10 @@ from domain.services.build_catalog_index import BuildCatalogIndex
 from domain.services.build_cross_team_graph_dashboard import (
     BuildCrossTeamGraphDashboard,
     CrossTeamGraphDashboard,
+    ServiceGraphAggregateCache,
 )
 from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph, GraphLevel
+from domain.services.cancellation import CancellationToken, OperationCancelledError
 from domain.services.catalog_health import (
     GAMING_ISSUE_INCONSISTENT_MARKUP,
     GAMING_ISSUE_MULTIPLE_STARTS_WITHOUT_BRANCH,
@@ -82,8 +101,9 @@ from domain.services.excalidraw_links import (
     ensure_unidraw_links,
 )
 from domain.services.excalidraw_title import apply_title_focus, ensure_service_title
-from domain.services.extract_block_graph_view import extract_block_graph_view
+from domain.services.extract_block_graph_view import build_block_graph_view
 from domain.services.extract_procedure_graph_view import extract_procedure_graph_view
+from domain.services.phase_recorder import PhaseRecorder, track_phase
 
 TEMPLATES_DIR = Path(__file__).parent / "web" / "templates"
 STATIC_DIR = Path(__file__).parent / "web" / "static"
@@ -93,6 +113,10 @@ logger = logging.getLogger(__name__)
 
 SceneFormat = Literal["excalidraw", "unidraw"]
 
+TEAM_GRAPH_CLIENT_COOKIE_NAME = "cjm_catalog_client_id"
+TEAM_GRAPH_PREWARM_POLL_SECONDS = 0.2
+TEAM_GRAPH_QUEUE_RETRY_AFTER_SECONDS = 2
+
 
 @dataclass(frozen=True)
 class CatalogGroup:
@@ -122,6 +146,25 @@ class CatalogContext:
     health_builder: BuildCatalogHealthReport
     health_state: CatalogHealthState
     team_graph_jobs: TeamGraphJobState
+    scene_cache: SceneCache | None = None
+    scene_generator_fingerprint: str = ""
+    response_cache: JsonResponseCache = dataclass_field(default_factory=JsonResponseCache)
+    excalidraw_urls: ExcalidrawUrlBuilder = dataclass_field(default_factory=ExcalidrawUrlBuilder)
+
+
+@dataclass(frozen=True)
+class SceneBytes:
+    content: bytes
+    rel_path: str
+    encoded: Mapping[str, bytes] = dataclass_field(default_factory=dict)
+    provisional: bool = False
+
+
+@dataclass(frozen=True)
+class SceneSource:
+    key: str
+    store: bool
+    build: Callable[[], SceneBytes]
 
 
 @dataclass
@@ -143,7 +186,16 @@ class CatalogHealthState:
     report: CatalogHealthReport | None = None
 
 
-TeamGraphJobStatus = Literal["pending", "running", "succeeded", "failed"]
+TeamGraphJobStatus = Literal[
+    "pending",
+    "running",
+    "succeeded",
+    "failed",
+    "cancelled",
+    "queue_full",
+]
+TEAM_GRAPH_JOB_ACTIVE_STATUSES: frozenset[str] = frozenset({"pending", "running"})
+TEAM_GRAPH_JOB_RETRYABLE_STATUSES: frozenset[str] = frozenset({"failed", "cancelled", "queue_full"})
 
 
 @dataclass(frozen=True)
@@ -174,14 +226,37 @@ class TeamGraphJob:
     finished_at: datetime | None = None
     error_message: str | None = None
     result: TeamGraphBuildResult | None = None
+    cancellation: CancellationToken = dataclass_field(default_factory=CancellationToken)
+    future: concurrent.futures.Future[None] | None = None
+    client_ids: set[str] = dataclass_field(default_factory=set)
+    progress: PhaseRecorder = dataclass_field(default_factory=PhaseRecorder)
+    prewarm: bool = False
+
+
+@dataclass
+class TeamGraphPrewarmState:
+    generation: int = 0
+    job_ids: set[str] = dataclass_field(default_factory=set)
+    thread: threading.Thread | None = None
+    stop: threading.Event = dataclass_field(default_factory=threading.Event)
 
 
 @dataclass
 class TeamGraphJobState:
     executor: concurrent.futures.ThreadPoolExecutor
+    worker_count: int = 1
+    max_active_jobs: int = 0
     jobs: dict[str, TeamGraphJob] = dataclass_field(default_factory=dict)
     request_jobs: dict[str, str] = dataclass_field(default_factory=dict)
+    client_jobs: dict[str, str] = dataclass_field(default_factory=dict)
     lock: threading.RLock = dataclass_field(default_factory=threading.RLock)
+    prewarm: TeamGraphPrewarmState = dataclass_field(default_factory=TeamGraphPrewarmState)
+    aggregate_cache: ServiceGraphAggregateCache = dataclass_field(
+        default_factory=ServiceGraphAggregateCache
+    )
+    procedure_link_futures: dict[tuple[str, str], concurrent.futures.Future[CachedJsonResponse]] = (
+        dataclass_field(default_factory=dict)
+    )
 
 
 @dataclass(frozen=True)
@@ -246,10 +321,15 @@ MARKUP_TYPE_GROUP_ORDER_INDEX = {
 def create_app(settings: AppSettings) -> FastAPI:
     templates.env.filters["msk_datetime"] = format_msk_datetime
     templates.env.filters["humanize_text"] = build_humanize_text(settings.catalog.ui_text_overrides)
+    team_graph_worker_count = max(2, min(4, os.cpu_count() or 2))
     team_graph_executor = concurrent.futures.ThreadPoolExecutor(
-        max_workers=max(2, min(4, os.cpu_count() or 2)),
+        max_workers=team_graph_worker_count,
         thread_name_prefix="team-graph",
     )
+    layout_refine_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=1,
+        thread_name_prefix="layout-refine",
+    )
 
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> Any:
@@ -259,14 +339,14 @@ def create_app(settings: AppSettings) -> FastAPI:
         if settings.catalog.auto_build_index:
             if settings.catalog.rebuild_index_on_start:
                 built_index = context.index_builder.build(settings.catalog.to_index_config())
-                update_catalog_health_cache(context, built_index)
+                handle_catalog_index_refreshed(context, built_index)
             else:
                 try:
                     loaded_index = index_repo.load(settings.catalog.index_path)
-                    update_catalog_health_cache(context, loaded_index)
+                    handle_catalog_index_refreshed(context, loaded_index)
                 except FileNotFoundError:
                     built_index = context.index_builder.build(settings.catalog.to_index_config())
-                    update_catalog_health_cache(context, built_index)
+                    handle_catalog_index_refreshed(context, built_index)
             refresh_interval = settings.catalog.index_refresh_interval_seconds
             if refresh_interval > 0:
                 refresh_task = asyncio.create_task(
@@ -276,7 +356,10 @@ def create_app(settings: AppSettings) -> FastAPI:
         if refresh_task is not None:
             refresh_stop.set()
             await refresh_task
+        stop_team_graph_prewarm(context)
+        cancel_all_team_graph_jobs(context)
         team_graph_executor.shutdown(wait=False, cancel_futures=True)
+        layout_refine_executor.shutdown(wait=False, cancel_futures=True)
 
     app = FastAPI(title=settings.catalog.title, lifespan=lifespan)
 
@@ -287,12 +370,29 @@ def create_app(settings: AppSettings) -> FastAPI:
         settings.catalog.service_link_path,
         settings.catalog.team_link_path,
     )
-    procedure_graph_layout = ProcedureGraphLayoutEngine(
-        LayoutConfig(
-            block_size=Size(320.0, 120.0),
-            gap_y=120.0,
-            lane_gap=240.0,
-        )
+    layout_cache = LayoutPlanCache(
+        settings.catalog.layout_cache_max_entries,
+        settings.catalog.layout_cache_dir,
+    )
+    markup_layout = CachedLayoutEngine(
+        GridLayoutEngine(
+            LayoutConfig(
+                quality=settings.catalog.layout_quality,
+                time_budget_seconds=settings.catalog.layout_time_budget_seconds,
+            )
+        ),
+        layout_cache,
+        refine_executor=layout_refine_executor,
+    )
+    procedure_graph_layout = CachedLayoutEngine(
+        ProcedureGraphLayoutEngine(
+            LayoutConfig(
+                block_size=Size(320.0, 120.0),
+                gap_y=120.0,
+                lane_gap=240.0,
+            )
+        ),
+        layout_cache,
     )
     context = CatalogContext(
         settings=settings,
@@ -305,10 +405,8 @@ def create_app(settings: AppSettings) -> FastAPI:
             index_repo,
         ),
         to_markup=ExcalidrawToMarkupConverter(),
-        to_excalidraw=MarkupToExcalidrawConverter(
-            GridLayoutEngine(), link_templates=link_templates
-        ),
-        to_unidraw=MarkupToUnidrawConverter(GridLayoutEngine(), link_templates=link_templates),
+        to_excalidraw=MarkupToExcalidrawConverter(markup_layout, link_templates=link_templates),
+        to_unidraw=MarkupToUnidrawConverter(markup_layout, link_templates=link_templates),
         to_procedure_graph_excalidraw=ProcedureGraphToExcalidrawConverter(
             procedure_graph_layout,
             link_templates=link_templates,
@@ -328,7 +426,27 @@ def create_app(settings: AppSettings) -> FastAPI:
             ),
         ),
         health_state=CatalogHealthState(),
-        team_graph_jobs=TeamGraphJobState(executor=team_graph_executor),
+        team_graph_jobs=TeamGraphJobState(
+            executor=team_graph_executor,
+            worker_count=team_graph_worker_count,
+            max_active_jobs=settings.catalog.team_graph_max_active_jobs,
+        ),
+        scene_cache=(
+            SceneCache(settings.catalog.scene_cache_dir, settings.catalog.scene_cache_max_bytes)
+            if settings.catalog.scene_cache_dir is not None
+            else None
+        ),
+        scene_generator_fingerprint=build_scene_generator_fingerprint(
+            markup_layout, link_templates
+        ),
+        response_cache=JsonResponseCache(
+            settings.catalog.response_cache_max_entries,
+            compress=settings.catalog.response_compression_enabled,
+        ),
+        excalidraw_urls=ExcalidrawUrlBuilder(
+            settings.catalog.excalidraw_max_url_length,
+            settings.catalog.excalidraw_url_cache_max_entries,
+        ),
     )
     app.state.context = context
 
@@ -518,16 +636,14 @@ def create_app(settings: AppSettings) -> FastAPI:
                         "excalidraw",
                         ui_language=localizer.language,
                     )
-                    procedure_excalidraw_open_url = build_excalidraw_url(
+                    procedure_share_url = context.excalidraw_urls.build(
                         diagram_base_url, procedure_payload
                     )
-                    if (
-                        len(procedure_excalidraw_open_url)
-                        > context.settings.catalog.excalidraw_max_url_length
-                    ):
+                    if procedure_share_url is None:
                         procedure_excalidraw_open_url = diagram_base_url
                         open_mode = "manual"
                     else:
+                        procedure_excalidraw_open_url = procedure_share_url
                         open_mode = "direct"
 
                     service_payload = build_procedure_graph_diagram_payload(
@@ -536,16 +652,12 @@ def create_app(settings: AppSettings) -> FastAPI:
                         "excalidraw",
                         ui_language=localizer.language,
                     )
-                    service_excalidraw_open_url = build_excalidraw_url(
-                        diagram_base_url, service_payload
+                    service_excalidraw_open_url = (
+                        context.excalidraw_urls.build(diagram_base_url, service_payload)
+                        or diagram_base_url
                     )
-                    if (
-                        len(service_excalidraw_open_url)
-                        > context.settings.catalog.excalidraw_max_url_length
-                    ):
-                        service_excalidraw_open_url = diagram_base_url
                 diagram_ready = True
-            elif merge_job.status == "failed":
+            elif merge_job.status in TEAM_GRAPH_JOB_RETRYABLE_STATUSES:
                 error_message = merge_job.error_message or "Unable to build team graph."
 
         if merge_job_error and error_message is None:
@@ -776,6 +888,7 @@ def create_app(settings: AppSettings) -> FastAPI:
             merge_node_min_chain_size=merge_node_min_chain_size,
         )
         job_id = None
+        client_id = resolve_team_graph_client_id(request)
         if team_ids:
             index_signature = resolve_catalog_index_signature(context, index_data)
             job = create_or_reuse_team_graph_job(
@@ -786,6 +899,7 @@ def create_app(settings: AppSettings) -> FastAPI:
                     context,
                     index_signature=index_signature,
                 ),
+                client_id=client_id,
             )
             job_id = job.job_id
 
@@ -812,8 +926,11 @@ def create_app(settings: AppSettings) -> FastAPI:
         push_url = f"/catalog/teams/graph?{page_query}" if page_query else "/catalog/teams/graph"
         if is_htmx(request):
             response.headers["HX-Push-Url"] = push_url
+            apply_team_graph_client_cookie(response, client_id)
             return response
-        return RedirectResponse(url=push_url, status_code=303)
+        redirect = RedirectResponse(url=push_url, status_code=303)
+        apply_team_graph_client_cookie(redirect, client_id)
+        return redirect
 
     @app.get("/catalog/teams/health", response_class=HTMLResponse)
     def catalog_team_health(
@@ -859,26 +976,22 @@ def create_app(settings: AppSettings) -> FastAPI:
         excalidraw_open_url = diagram_base_url
         procedure_excalidraw_open_url = diagram_base_url
         excalidraw_scene_available = False
-        procedure_graph_enabled = True
         open_mode = "direct"
         procedure_open_mode = "manual"
         on_demand = context.settings.catalog.generate_excalidraw_on_demand
-        scene_path = context.settings.catalog.excalidraw_in_dir / item.excalidraw_rel_path
         try:
-            scene_payload = context.scene_repo.load(scene_path)
+            scene_payload = load_stored_scene_payload(context, item, "excalidraw")
             if scene_payload.get("elements") is not None:
-                enhance_scene_payload(scene_payload, context, "excalidraw")
                 if is_same_origin(request, diagram_base_url):
                     excalidraw_open_url = f"/catalog/{scene_id}/open"
                     open_mode = "local_storage"
                 else:
-                    excalidraw_open_url = build_excalidraw_url(diagram_base_url, scene_payload)
-                    if (
-                        len(excalidraw_open_url)
-                        > context.settings.catalog.excalidraw_max_url_length
-                    ):
+                    scene_share_url = context.excalidraw_urls.build(diagram_base_url, scene_payload)
+                    if scene_share_url is None:
                         excalidraw_open_url = diagram_base_url
                         open_mode = "manual"
+                    else:
+                        excalidraw_open_url = scene_share_url
                 excalidraw_scene_available = True
         except FileNotFoundError:
             if on_demand:
@@ -890,34 +1003,13 @@ def create_app(settings: AppSettings) -> FastAPI:
                     excalidraw_open_url = diagram_base_url
                     open_mode = "manual"
         procedure_graph_api_url = f"/api/scenes/{scene_id}/procedure-graph-view"
+        procedure_link_api_url = ""
         if is_same_origin(request, diagram_base_url):
             procedure_excalidraw_open_url = f"/catalog/{scene_id}/procedure-graph/open"
             procedure_open_mode = "local_storage"
         else:
-            try:
-                procedure_payload = build_scene_procedure_diagram_payload(
-                    context,
-                    index_data,
-                    item,
-                    "excalidraw",
-                    ui_language=localizer_for_request(request).language,
-                )
-            except HTTPException:
-                procedure_graph_enabled = False
-                procedure_open_mode = "manual"
-            else:
-                procedure_excalidraw_open_url = build_excalidraw_url(
-                    diagram_base_url,
-                    procedure_payload,
-                )
-                if (
-                    len(procedure_excalidraw_open_url)
-                    > context.settings.catalog.excalidraw_max_url_length
-                ):
-                    procedure_excalidraw_open_url = diagram_base_url
-                    procedure_open_mode = "manual"
-                else:
-                    procedure_open_mode = "direct"
+            procedure_link_api_url = f"/api/scenes/{scene_id}/procedure-graph-link"
+            procedure_open_mode = "pending"
         service_external_url = resolve_service_external_url(context, item)
         team_external_url = resolve_team_external_url(context, item)
         item_health = health_report.item(item.scene_id) if health_report is not None else None
@@ -950,9 +1042,10 @@ def create_app(settings: AppSettings) -> FastAPI:
                 "block_graph_api_url": f"/api/scenes/{scene_id}/block-graph",
                 "block_graph_enabled": excalidraw_scene_available,
                 "procedure_graph_api_url": procedure_graph_api_url,
-                "procedure_graph_enabled": procedure_graph_enabled,
+                "procedure_graph_enabled": True,
                 "procedure_excalidraw_open_url": procedure_excalidraw_open_url,
                 "procedure_open_mode": procedure_open_mode,
+                "procedure_link_api_url": procedure_link_api_url,
                 "item_health": item_health,
                 "validity_issue_blocks": validity_issue_blocks,
                 "catalog_back_url": catalog_back_url,
@@ -1126,11 +1219,21 @@ def create_app(settings: AppSettings) -> FastAPI:
         )
 
     @app.get("/api/index")
-    def api_index(context: CatalogContext = Depends(get_context)) -> ORJSONResponse:
+    def api_index(
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
+        context: CatalogContext = Depends(get_context),
+    ) -> Response:
         index_data = load_index(context)
         if index_data is None:
             raise HTTPException(status_code=404, detail="Catalog index not found")
-        return ORJSONResponse(index_data.to_dict())
+        generation = resolve_catalog_index_signature(context, index_data)
+        cached = context.response_cache.get_or_build(
+            ("index", generation),
+            generation,
+            lambda: dump_compact_json_bytes(index_data.to_dict(include_merge_summary=False)),
+        )
+        return json_bytes_response(cached, if_none_match, accept_encoding)
 
     @app.get("/api/team-graph-jobs/{job_id}")
     def api_team_graph_job_status(
@@ -1178,7 +1281,9 @@ def create_app(settings: AppSettings) -> FastAPI:
                 "status": job.status,
                 "error_message": job.error_message,
                 "updated_at": job.updated_at.isoformat(),
+                "started_at": job.started_at.isoformat() if job.started_at else None,
                 "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+                **job.progress.snapshot().to_dict(),
             }
         )
 
@@ -1187,37 +1292,69 @@ def create_app(settings: AppSettings) -> FastAPI:
         scene_id: str,
         format: SceneFormat = Query(default="excalidraw"),
         download: bool = Query(default=False),
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
         context: CatalogContext = Depends(get_context),
-    ) -> ORJSONResponse:
+    ) -> Response:
         index_data = load_index(context)
         item = find_item(index_data, scene_id) if index_data else None
         if not item:
             raise HTTPException(status_code=404, detail="Scene not found")
-        payload, diagram_rel_path = load_scene_payload(context, item, format)
+        assert index_data is not None
+        encoding = (
+            negotiate_encoding(accept_encoding, available_encodings())
+            if context.settings.catalog.response_compression_enabled
+            else None
+        )
+        generation = resolve_catalog_index_signature(context, index_data)
         headers = {}
         if download:
             extension = resolve_diagram_extension(format)
-            base_name = Path(diagram_rel_path).stem or scene_id
+            base_name = Path(resolve_scene_rel_path(item, format)).stem or scene_id
             filename = build_generated_diagram_filename(
                 base_name=base_name,
                 extension=extension,
                 level="blocks",
             )
             headers["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return ORJSONResponse(payload, headers=headers)
+        source = resolve_scene_source(context, item, format)
+        etag = build_etag(generation, source.key.encode("ascii")) if source is not None else None
+        if etag is not None:
+            not_modified = not_modified_response(etag, if_none_match, encoding, headers)
+            if not_modified is not None:
+                return not_modified
+        scene = load_scene_source_bytes(context, item, format, source, encoding)
+        if scene.provisional:
+            # A refined layout will replace this scene under the same key.
+            etag = None
+        cached = CachedJsonResponse(
+            content=scene.content,
+            etag=etag or build_etag(generation, scene.content),
+            encoded=scene.encoded,
+        )
+        return json_bytes_response(cached, if_none_match, accept_encoding, headers)
 
     @app.get("/api/scenes/{scene_id}/block-graph")
     def api_scene_block_graph(
         scene_id: str,
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
         context: CatalogContext = Depends(get_context),
-    ) -> ORJSONResponse:
+    ) -> Response:
         index_data = load_index(context)
         item = find_item(index_data, scene_id) if index_data else None
         if not item:
             raise HTTPException(status_code=404, detail="Scene not found")
-        scene_payload, _ = load_scene_payload(context, item, "excalidraw")
-        graph_payload = extract_block_graph_view(scene_payload)
-        return ORJSONResponse(graph_payload)
+        assert index_data is not None
+        generation = resolve_catalog_index_signature(context, index_data)
+        cached = context.response_cache.get_or_build(
+            ("block-graph", scene_id, generation),
+            generation,
+            lambda: dump_compact_json_bytes(
+                build_block_graph_view(load_item_markup(context, item))
+            ),
+        )
+        return json_bytes_response(cached, if_none_match, accept_encoding)
 
     @app.get("/api/scenes/{scene_id}/procedure-graph")
     def api_scene_procedure_graph(
@@ -1225,20 +1362,17 @@ def create_app(settings: AppSettings) -> FastAPI:
         scene_id: str,
         format: SceneFormat = Query(default="excalidraw"),
         download: bool = Query(default=False),
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
         context: CatalogContext = Depends(get_context),
-    ) -> ORJSONResponse:
+    ) -> Response:
         index_data = load_index(context)
         item = find_item(index_data, scene_id) if index_data else None
         if not item:
             raise HTTPException(status_code=404, detail="Scene not found")
         assert index_data is not None
-        payload = build_scene_procedure_diagram_payload(
-            context,
-            index_data,
-            item,
-            format,
-            ui_language=localizer_for_request(request).language,
-        )
+        language = localizer_for_request(request).language
+        cached = load_scene_procedure_diagram_response(context, index_data, item, format, language)
         headers = {}
         if download:
             extension = resolve_diagram_extension(format)
@@ -1248,7 +1382,33 @@ def create_app(settings: AppSettings) -> FastAPI:
                 level="procedures",
             )
             headers["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return ORJSONResponse(payload, headers=headers)
+        return json_bytes_response(cached, if_none_match, accept_encoding, headers)
+
+    @app.get("/api/scenes/{scene_id}/procedure-graph-link")
+    async def api_scene_procedure_graph_link(
+        request: Request,
+        scene_id: str,
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
+        context: CatalogContext = Depends(get_context),
+    ) -> Response:
+        language = localizer_for_request(request).language
+        future = submit_scene_procedure_link_build(context, scene_id, language)
+        if future is None:
+            return ORJSONResponse(
+                {
+                    "available": False,
+                    "open_url": context.settings.catalog.excalidraw_base_url,
+                    "open_mode": "manual",
+                },
+                status_code=503,
+                headers={
+                    "Retry-After": str(TEAM_GRAPH_QUEUE_RETRY_AFTER_SECONDS),
+                    "Cache-Control": "no-store",
+                },
+            )
+        cached = await asyncio.wrap_future(future)
+        return json_bytes_response(cached, if_none_match, accept_encoding)
 
     @app.get("/api/scenes/{scene_id}/procedure-graph-view")
     def api_scene_procedure_graph_view(
@@ -1309,6 +1469,7 @@ def create_app(settings: AppSettings) -> FastAPI:
                 graph_document,
                 format,
                 ui_language=localizer_for_request(request).language,
+                timestamp_ms=iso_timestamp_ms(index_data.generated_at),
             )
         else:
             items, merge_scope_items = resolve_team_graph_items(
@@ -1328,6 +1489,7 @@ def create_app(settings: AppSettings) -> FastAPI:
                 graph_level=graph_level,
                 merge_items=merge_scope_items if merge_nodes_all_markups else None,
                 ui_language=localizer_for_request(request).language,
+                timestamp_ms=iso_timestamp_ms(index_data.generated_at),
             )
         headers = {}
         if download:
@@ -1403,12 +1565,14 @@ def create_app(settings: AppSettings) -> FastAPI:
     def api_markup(
         scene_id: str,
         download: bool = Query(default=False),
+        if_none_match: str | None = Header(default=None),
         context: CatalogContext = Depends(get_context),
     ) -> Response:
         index_data = load_index(context)
         item = find_item(index_data, scene_id) if index_data else None
         if not item:
             raise HTTPException(status_code=404, detail="Scene not found")
+        assert index_data is not None
         markup_root = Path(context.settings.catalog.s3.prefix or "")
         markup_path = markup_root / item.markup_rel_path
         try:
@@ -1419,7 +1583,9 @@ def create_app(settings: AppSettings) -> FastAPI:
         if download:
             filename = Path(item.markup_rel_path).name or "markup.json"
             headers["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return Response(content=raw_bytes, media_type="application/json", headers=headers)
+        generation = resolve_catalog_index_signature(context, index_data)
+        cached = CachedJsonResponse(content=raw_bytes, etag=build_etag(generation, raw_bytes))
+        return json_bytes_response(cached, if_none_match, headers=headers)
 
     @app.post("/api/scenes/{scene_id}/upload")
     async def api_upload_scene(
@@ -1479,7 +1645,7 @@ def create_app(settings: AppSettings) -> FastAPI:
         if token != context.settings.catalog.rebuild_token:
             raise HTTPException(status_code=403, detail="Invalid token")
         index_data = context.index_builder.build(context.settings.catalog.to_index_config())
-        update_catalog_health_cache(context, index_data)
+        handle_catalog_index_refreshed(context, index_data)
         return ORJSONResponse({"status": "ok", "items": len(index_data.items)})
 
     proxy_upstream = settings.catalog.excalidraw_proxy_upstream
@@ -1577,7 +1743,7 @@ def refresh_catalog_index_if_needed(
     if state.last_source_fingerprint is None:
         try:
             rebuilt_index = context.index_builder.build(config)
-            update_catalog_health_cache(context, rebuilt_index)
+            handle_catalog_index_refreshed(context, rebuilt_index)
         except Exception:
             logger.exception("Periodic catalog index refresh failed.")
             return
@@ -1588,7 +1754,7 @@ def refresh_catalog_index_if_needed(
         return
     try:
         rebuilt_index = context.index_builder.build(config)
-        update_catalog_health_cache(context, rebuilt_index)
+        handle_catalog_index_refreshed(context, rebuilt_index)
     except Exception:
         logger.exception("Periodic catalog index refresh failed.")
         return
@@ -1615,7 +1781,7 @@ def get_context(request: Request) -> CatalogContext:
 
 def invalidate_scene_cache(context: CatalogContext) -> None:
     settings = context.settings.catalog
-    if not settings.invalidate_excalidraw_cache_on_start:
+    if not settings.invalidate_excalidraw_cache_on_start or context.scene_cache is not None:
         return
     if not settings.generate_excalidraw_on_demand:
         return
@@ -1689,6 +1855,15 @@ def ensure_catalog_health_cache(
     return report
 
 
+def handle_catalog_index_refreshed(
+    context: CatalogContext,
+    index_data: CatalogIndex | None,
+) -> None:
+    update_catalog_health_cache(context, index_data)
+    if isinstance(index_data, CatalogIndex) and context.settings.catalog.team_graph_prewarm_enabled:
+        schedule_team_graph_prewarm(context, index_data)
+
+
 def update_catalog_health_cache(
     context: CatalogContext,
     index_data: CatalogIndex | None,
@@ -1872,10 +2047,171 @@ def resolve_diagram_in_dir(settings: AppSettings, diagram_format: SceneFormat) -
     return settings.catalog.excalidraw_in_dir
 
 
+def active_scene_cache(context: CatalogContext) -> SceneCache | None:
+    if not context.settings.catalog.generate_excalidraw_on_demand:
+        return None
+    return context.scene_cache
+
+
+def load_stored_scene_payload(
+    context: CatalogContext,
+    item: CatalogItem,
+    diagram_format: SceneFormat,
+) -> dict[str, Any]:
+    scene_cache = active_scene_cache(context)
+    if scene_cache is None:
+        diagram_rel_path = resolve_scene_rel_path(item, diagram_format)
+        scene_path = resolve_diagram_in_dir(context.settings, diagram_format) / diagram_rel_path
+        payload = context.scene_repo.load(scene_path)
+        enhance_scene_payload(payload, context, diagram_format)
+        return payload
+    key, _ = resolve_markup_scene_key(context, scene_cache, item, diagram_format)
+    cached = scene_cache.get(key)
+    if cached is None:
+        raise FileNotFoundError(key)
+    return cached
+
+
+def resolve_markup_scene_key(
+    context: CatalogContext,
+    scene_cache: SceneCache,
+    item: CatalogItem,
+    diagram_format: SceneFormat,
+) -> tuple[str, MarkupDocument | None]:
+    """Return the scene cache key, loading the markup only for an unseen item revision."""
+    revision = (item.markup_rel_path, item.updated_at, diagram_format)
+    if item.updated_at:
+        key = scene_cache.source_key(revision)
+        if key is not None:
+            return key, None
+    markup = context.markup_reader.load_by_path(resolve_markup_path(context, item))
+    key = build_scene_cache_key(context.scene_generator_fingerprint, diagram_format, markup)
+    if item.updated_at:
+        scene_cache.remember_source_key(revision, key)
+    return key, markup
+
+
 def load_scene_payload(
     context: CatalogContext,
     item: CatalogItem,
     diagram_format: SceneFormat,
+) -> tuple[dict[str, Any], str]:
+    if context.scene_cache is not None:
+        scene = load_scene_bytes(context, item, diagram_format)
+        return cast(dict[str, Any], orjson.loads(scene.content)), scene.rel_path
+    return load_scene_file_payload(context, item, diagram_format)
+
+
+def resolve_scene_source(
+    context: CatalogContext,
+    item: CatalogItem,
+    diagram_format: SceneFormat,
+) -> SceneSource | None:
+    """Return the cache key and builder of a scene, or ``None`` when it has no stable key."""
+    diagram_rel_path = resolve_scene_rel_path(item, diagram_format)
+    if context.settings.catalog.generate_excalidraw_on_demand:
+        if context.scene_cache is None:
+            return None
+        try:
+            key, loaded_markup = resolve_markup_scene_key(
+                context, context.scene_cache, item, diagram_format
+            )
+        except FileNotFoundError as exc:
+            raise HTTPException(status_code=404, detail="Markup file missing") from exc
+
+        def build_markup_content() -> SceneBytes:
+            markup = loaded_markup if loaded_markup is not None else load_item_markup(context, item)
+            payload, provisional = convert_diagram_payload(
+                context, markup, diagram_format, timestamp_ms=iso_timestamp_ms(item.updated_at)
+            )
+            enhance_scene_payload(payload, context, diagram_format)
+            return SceneBytes(
+                dump_compact_json_bytes(payload), diagram_rel_path, provisional=provisional
+            )
+
+        return SceneSource(
+            key=key,
+            store=context.settings.catalog.cache_excalidraw_on_demand,
+            build=build_markup_content,
+        )
+    scene_path = resolve_diagram_in_dir(context.settings, diagram_format) / diagram_rel_path
+    try:
+        scene_stat = scene_path.stat()
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Scene file missing") from exc
+
+    def build_file_content() -> SceneBytes:
+        payload, _ = load_scene_file_payload(context, item, diagram_format)
+        return SceneBytes(dump_compact_json_bytes(payload), diagram_rel_path)
+
+    return SceneSource(
+        key=build_scene_file_cache_key(
+            context.scene_generator_fingerprint, diagram_format, scene_path, scene_stat
+        ),
+        store=True,
+        build=build_file_content,
+    )
+
+
+def load_scene_bytes(
+    context: CatalogContext,
+    item: CatalogItem,
+    diagram_format: SceneFormat,
+    encoding: str | None = None,
+) -> SceneBytes:
+    source = resolve_scene_source(context, item, diagram_format)
+    return load_scene_source_bytes(context, item, diagram_format, source, encoding)
+
+
+def load_scene_source_bytes(
+    context: CatalogContext,
+    item: CatalogItem,
+    diagram_format: SceneFormat,
+    source: SceneSource | None,
+    encoding: str | None = None,
+) -> SceneBytes:
+    diagram_rel_path = resolve_scene_rel_path(item, diagram_format)
+    requested = [encoding] if encoding is not None else []
+    scene_cache = context.scene_cache
+    if source is None or scene_cache is None:
+        if source is None:
+            payload, _ = load_scene_file_payload(context, item, diagram_format)
+            scene = SceneBytes(dump_compact_json_bytes(payload), diagram_rel_path)
+        elif source.store:
+            build = source.build
+            cached_response = context.response_cache.get_or_build(
+                ("scene", source.key), source.key, lambda: build().content
+            )
+            return SceneBytes(cached_response.content, diagram_rel_path, cached_response.encoded)
+        else:
+            scene = source.build()
+        return replace(scene, encoded=build_compressed_variants(scene.content, requested))
+    key = source.key
+    if encoding is not None:
+        encoded = scene_cache.get_bytes(key, encoding)
+        if encoded is not None:
+            # The identity body stays on disk; callers negotiate the same encoding again.
+            return SceneBytes(b"", diagram_rel_path, {encoding: encoded})
+    cached = scene_cache.get_bytes(key)
+    if cached is not None:
+        return SceneBytes(cached, diagram_rel_path)
+    built = source.build()
+    if not source.store or built.provisional:
+        return replace(built, encoded=build_compressed_variants(built.content, requested))
+    variants = (
+        build_compressed_variants(built.content)
+        if context.settings.catalog.response_compression_enabled
+        else {}
+    )
+    scene_cache.put_bytes(key, built.content, variants)
+    selected = {encoding: variants[encoding]} if encoding in variants else {}
+    return replace(built, encoded=selected)
+
+
+def load_scene_file_payload(
+    context: CatalogContext,
+    item: CatalogItem,
+    diagram_format: SceneFormat,
 ) -> tuple[dict[str, Any], str]:
     diagram_rel_path = resolve_scene_rel_path(item, diagram_format)
     scene_path = resolve_diagram_in_dir(context.settings, diagram_format) / diagram_rel_path
@@ -1892,8 +2228,8 @@ def load_scene_payload(
         ):
             should_regenerate = True
     if should_regenerate:
-        payload = build_diagram_payload(context, item, diagram_format)
-        if context.settings.catalog.cache_excalidraw_on_demand:
+        payload, provisional = build_diagram_payload(context, item, diagram_format)
+        if context.settings.catalog.cache_excalidraw_on_demand and not provisional:
             context.scene_repo.save(payload, scene_path)
     enhance_scene_payload(payload, context, diagram_format)
     return payload, diagram_rel_path
@@ -1940,18 +2276,61 @@ def build_diagram_payload(
     context: CatalogContext,
     item: CatalogItem,
     diagram_format: SceneFormat,
-) -> dict[str, Any]:
-    markup_root = Path(context.settings.catalog.s3.prefix or "")
-    markup_path = markup_root / item.markup_rel_path
+) -> tuple[dict[str, Any], bool]:
+    return convert_diagram_payload(
+        context,
+        load_item_markup(context, item),
+        diagram_format,
+        timestamp_ms=iso_timestamp_ms(item.updated_at),
+    )
+
+
+def iso_timestamp_ms(value: str) -> int | None:
+    parsed = parse_iso_datetime(value)
+    if parsed is None:
+        return None
+    return int(parsed.timestamp() * 1000)
+
+
+def resolve_markup_path(context: CatalogContext, item: CatalogItem) -> Path:
+    return Path(context.settings.catalog.s3.prefix or "") / item.markup_rel_path
+
+
+def load_item_markup(context: CatalogContext, item: CatalogItem) -> MarkupDocument:
     try:
-        markup = context.markup_reader.load_by_path(markup_path)
+        return context.markup_reader.load_by_path(resolve_markup_path(context, item))
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail="Markup file missing") from exc
+
+
+def convert_diagram_payload(
+    context: CatalogContext,
+    markup: MarkupDocument,
+    diagram_format: SceneFormat,
+    *,
+    timestamp_ms: int | None = None,
+) -> tuple[dict[str, Any], bool]:
+    """Return the scene payload and whether its layout was cut short by the time budget."""
+    document: ExcalidrawDocument | UnidrawDocument
     if diagram_format == "excalidraw":
-        document = context.to_excalidraw.convert(markup)
+        prepared = context.to_excalidraw.prepare(markup)
+        document = context.to_excalidraw.convert_prepared(prepared)
     else:
-        document = context.to_unidraw.convert(markup)
-    return cast(dict[str, Any], document.to_dict())
+        prepared = context.to_unidraw.prepare(markup)
+        document = context.to_unidraw.convert_prepared(prepared, timestamp_ms=timestamp_ms)
+    return cast(dict[str, Any], document.to_dict()), prepared.plan.refinement.budget_exhausted
+
+
+def build_scene_generator_fingerprint(
+    layout: CachedLayoutEngine,
+    link_templates: ExcalidrawLinkTemplates | None,
+) -> str:
+    payload = {
+        "layout": layout_engine_fingerprint(layout.engine),
+        "config": asdict(layout.config),
+        "links": asdict(link_templates) if link_templates is not None else None,
+    }
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
 
 def resolve_scene_team_items(index_data: CatalogIndex, item: CatalogItem) -> list[CatalogItem]:
@@ -2011,6 +2390,96 @@ def build_scene_procedure_diagram_payload(
     )
 
 
+def load_scene_procedure_diagram_response(
+    context: CatalogContext,
+    index_data: CatalogIndex,
+    item: CatalogItem,
+    diagram_format: SceneFormat,
+    language: str,
+) -> CachedJsonResponse:
+    generation = resolve_catalog_index_signature(context, index_data)
+    return context.response_cache.get_or_build(
+        ("procedure-graph", item.scene_id, diagram_format, language, generation),
+        generation,
+        lambda: dump_compact_json_bytes(
+            build_scene_procedure_diagram_payload(
+                context,
+                index_data,
+                item,
+                diagram_format,
+                ui_language=language,
+            )
+        ),
+    )
+
+
+def submit_scene_procedure_link_build(
+    context: CatalogContext,
+    scene_id: str,
+    language: str,
+) -> concurrent.futures.Future[CachedJsonResponse] | None:
+    state = context.team_graph_jobs
+    key = (scene_id, language)
+    with state.lock:
+        future = state.procedure_link_futures.get(key)
+        if future is not None:
+            return future
+        if not has_team_graph_queue_capacity(state):
+            logger.warning("Team graph queue is full; deferring procedure link for %s.", scene_id)
+            return None
+        future = state.executor.submit(
+            build_scene_procedure_link_response, context, scene_id, language
+        )
+        state.procedure_link_futures[key] = future
+
+    def forget(done: concurrent.futures.Future[CachedJsonResponse]) -> None:
+        with state.lock:
+            if state.procedure_link_futures.get(key) is done:
+                state.procedure_link_futures.pop(key, None)
+
+    future.add_done_callback(forget)
+    return future
+
+
+def build_scene_procedure_link_response(
+    context: CatalogContext,
+    scene_id: str,
+    language: str,
+) -> CachedJsonResponse:
+    index_data = load_index(context)
+    item = find_item(index_data, scene_id) if index_data else None
+    if not item:
+        raise HTTPException(status_code=404, detail="Scene not found")
+    assert index_data is not None
+    generation = resolve_catalog_index_signature(context, index_data)
+    return context.response_cache.get_or_build(
+        ("procedure-graph-link", scene_id, language, generation),
+        generation,
+        lambda: dump_compact_json_bytes(
+            build_scene_procedure_link_payload(context, index_data, item, language)
+        ),
+    )
+
+
+def build_scene_procedure_link_payload(
+    context: CatalogContext,
+    index_data: CatalogIndex,
+    item: CatalogItem,
+    language: str,
+) -> dict[str, Any]:
+    diagram_base_url = context.settings.catalog.excalidraw_base_url
+    try:
+        cached = load_scene_procedure_diagram_response(
+            context, index_data, item, "excalidraw", language
+        )
+    except HTTPException:
+        return {"available": False, "open_url": diagram_base_url, "open_mode": "manual"}
+    share_url = context.excalidraw_urls.build(diagram_base_url, orjson.loads(cached.content))
+    if share_url is None:
+        return {"available": True, "open_url": diagram_base_url, "open_mode": "manual"}
+    return {"available": True, "open_url": share_url, "open_mode": "direct"}
+
+
 def build_team_graph_document(
     context: CatalogContext,
     items: list[CatalogItem],
@@ -2037,7 +2506,7 @@ def build_team_graph_document(
                 merge_source = index_data.items
         if merge_source is None:
             merge_source = items
-        merge_documents = load_markup_documents(context, merge_source, cache=cache)
+        merge_documents = load_merge_scope_documents(context, merge_source, cache=cache)
     try:
         return BuildTeamProcedureGraph().build(
             documents,
@@ -2062,6 +2531,7 @@ def build_team_diagram_payload(
     document_cache: dict[str, MarkupDocument] | None = None,
     ui_language: str | None = None,
     force_merge_scope: bool = False,
+    timestamp_ms: int | None = None,
 ) -> dict[str, Any]:
     graph_document = build_team_graph_document(
         context,
@@ -2079,6 +2549,7 @@ def build_team_diagram_payload(
         graph_document,
         diagram_format,
         ui_language=ui_language,
+        timestamp_ms=timestamp_ms,
     )
 
 
@@ -2088,12 +2559,15 @@ def build_procedure_graph_diagram_payload(
     diagram_format: SceneFormat,
     *,
     ui_language: str | None = None,
+    timestamp_ms: int | None = None,
 ) -> dict[str, Any]:
     document: ExcalidrawDocument | UnidrawDocument
     if diagram_format == "excalidraw":
         document = context.to_procedure_graph_excalidraw.convert(graph_document)
     else:
-        document = context.to_procedure_graph_unidraw.convert(graph_document)
+        document = context.to_procedure_graph_unidraw.convert(
+            graph_document, timestamp_ms=timestamp_ms
+        )
     payload = cast(dict[str, Any], document.to_dict())
     language = ui_language or get_active_ui_language()
     _localize_markup_type_column_titles(payload, language)
@@ -2128,12 +2602,15 @@ def load_markup_documents(
     items: Sequence[CatalogItem],
     *,
     cache: dict[str, MarkupDocument] | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> list[MarkupDocument]:
     markup_root = Path(context.settings.catalog.s3.prefix or "")
     documents: list[MarkupDocument] = []
     if cache is None:
         cache = {}
     for item in items:
+        if cancellation is not None:
+            cancellation.raise_if_cancelled()
         cached = cache.get(item.markup_rel_path)
         if cached is not None:
             documents.append(cached)
@@ -2148,6 +2625,34 @@ def load_markup_documents(
     return documents
 
 
+def load_merge_scope_documents(
+    context: CatalogContext,
+    items: Sequence[CatalogItem],
+    *,
+    cache: dict[str, MarkupDocument] | None = None,
+    cancellation: CancellationToken | None = None,
+) -> list[MarkupDocument]:
+    if cache is None:
+        cache = {}
+    documents: list[MarkupDocument] = []
+    for item in items:
+        cached = cache.get(item.markup_rel_path)
+        if cached is not None:
+            documents.append(cached)
+        elif item.merge_summary is not None:
+            documents.append(item.merge_summary.to_document())
+        else:
+            documents.extend(
+                load_markup_documents(context, [item], cache=cache, cancellation=cancellation)
+            )
+    return documents
+
+
+def build_markup_document_version(item: CatalogItem, *, from_summary: bool = False) -> str:
+    source = "summary" if from_summary else "markup"
+    return f"{source}:{item.markup_rel_path}:{item.updated_at}"
+
+
 def build_team_graph_request(
     *,
     team_ids: Sequence[str],
@@ -2216,10 +2721,12 @@ def team_graph_job_matches_request(
     cache_signature: str,
     reuse_failed: bool,
 ) -> bool:
-    return (
-        job.request == build_request
-        and job.index_signature == cache_signature
-        and (job.status != "failed" or reuse_failed)
+    if job.request != build_request or job.index_signature != cache_signature:
+        return False
+    if reuse_failed:
+        return True
+    return job.status not in TEAM_GRAPH_JOB_RETRYABLE_STATUSES and not (
+        job.status in TEAM_GRAPH_JOB_ACTIVE_STATUSES and job.cancellation.is_cancelled
     )
 
 
@@ -2300,6 +2807,8 @@ def create_or_reuse_team_graph_job(
     build_request: TeamGraphBuildRequest,
     index_data: CatalogIndex,
     cache_signature: str,
+    client_id: str | None = None,
+    prewarm: bool = False,
 ) -> TeamGraphJob:
     job_id = build_team_graph_job_id(build_request, cache_signature=cache_signature)
     existing = get_team_graph_job(context, job_id)
@@ -2309,6 +2818,7 @@ def create_or_reuse_team_graph_job(
         cache_signature=cache_signature,
         reuse_failed=False,
     ):
+        assign_team_graph_job_client(context, existing, client_id)
         return existing
 
     reusable = find_team_graph_job_for_request(
@@ -2318,6 +2828,7 @@ def create_or_reuse_team_graph_job(
         reuse_failed=False,
     )
     if reusable is not None:
+        assign_team_graph_job_client(context, reusable, client_id)
         return reusable
 
     now = datetime.now(tz=UTC)
@@ -2331,6 +2842,7 @@ def create_or_reuse_team_graph_job(
             cache_signature=cache_signature,
             reuse_failed=False,
         ):
+            assign_team_graph_job_client(context, existing, client_id)
             return existing
         if existing is None:
             existing = TeamGraphJob(
@@ -2340,6 +2852,7 @@ def create_or_reuse_team_graph_job(
                 status="pending",
                 created_at=now,
                 updated_at=now,
+                prewarm=prewarm,
             )
             context.team_graph_jobs.jobs[job_id] = existing
         else:
@@ -2352,14 +2865,242 @@ def create_or_reuse_team_graph_job(
             existing.finished_at = None
             existing.error_message = None
             existing.result = None
+            existing.cancellation = CancellationToken()
+            existing.future = None
+            existing.progress = PhaseRecorder()
+            existing.prewarm = prewarm
         context.team_graph_jobs.request_jobs[request_key] = job_id
         prune_team_graph_jobs(context.team_graph_jobs, keep_job_ids={job_id})
         job_to_submit = existing
-    context.team_graph_jobs.executor.submit(run_team_graph_job, context, job_id, index_data)
+        if not has_team_graph_queue_capacity(
+            context.team_graph_jobs, exclude_job_id=job_id, client_id=client_id
+        ):
+            logger.warning(
+                "Team graph merge queue is full (%s active jobs); rejecting job %s.",
+                context.team_graph_jobs.max_active_jobs,
+                job_id,
+            )
+            existing.status = "queue_full"
+            existing.finished_at = now
+            existing.error_message = "Merge queue is full. Try Merge again in a moment."
+            return existing
+        existing.future = context.team_graph_jobs.executor.submit(
+            run_team_graph_job, context, job_id, index_data
+        )
+        assign_team_graph_job_client(context, existing, client_id)
     assert job_to_submit is not None
     return job_to_submit
 
 
+def has_team_graph_queue_capacity(
+    state: TeamGraphJobState,
+    *,
+    exclude_job_id: str | None = None,
+    client_id: str | None = None,
+) -> bool:
+    """Count live jobs except cancelled ones and the job ``client_id`` is about to replace."""
+    if state.max_active_jobs <= 0:
+        return True
+    superseded_job_id = state.client_jobs.get(client_id) if client_id else None
+    active_count = len(state.procedure_link_futures) + sum(
+        1
+        for job in state.jobs.values()
+        if job.job_id != exclude_job_id
+        and job.status in TEAM_GRAPH_JOB_ACTIVE_STATUSES
+        and not job.cancellation.is_cancelled
+        and not (
+            job.job_id == superseded_job_id and not job.prewarm and job.client_ids <= {client_id}
+        )
+    )
+    return active_count < state.max_active_jobs
+
+
+def assign_team_graph_job_client(
+    context: CatalogContext,
+    job: TeamGraphJob,
+    client_id: str | None,
+) -> None:
+    if not client_id:
+        return
+    state = context.team_graph_jobs
+    with state.lock:
+        previous_job_id = state.client_jobs.get(client_id)
+        state.client_jobs[client_id] = job.job_id
+        job.client_ids.add(client_id)
+        if previous_job_id is None or previous_job_id == job.job_id:
+            return
+        previous_job = state.jobs.get(previous_job_id)
+        if previous_job is None:
+            return
+        previous_job.client_ids.discard(client_id)
+        if previous_job.client_ids or previous_job.prewarm:
+            return
+        if cancel_team_graph_job(context, previous_job_id):
+            logger.info(
+                "Team graph merge job %s superseded by job %s.",
+                previous_job_id,
+                job.job_id,
+            )
+
+
+def cancel_team_graph_job(context: CatalogContext, job_id: str) -> bool:
+    with context.team_graph_jobs.lock:
+        job = context.team_graph_jobs.jobs.get(job_id)
+        if job is None or job.status not in TEAM_GRAPH_JOB_ACTIVE_STATUSES:
+            return False
+        job.cancellation.cancel()
+        if job.status == "pending" and (job.future is None or job.future.cancel()):
+            finish_team_graph_job(
+                context,
+                job_id,
+                status="cancelled",
+                error_message="Merge was superseded by a newer selection.",
+            )
+        return True
+
+
+def cancel_all_team_graph_jobs(context: CatalogContext) -> None:
+    with context.team_graph_jobs.lock:
+        for job_id in list(context.team_graph_jobs.jobs):
+            cancel_team_graph_job(context, job_id)
+
+
+def build_team_graph_prewarm_requests(
+    context: CatalogContext,
+    index_data: CatalogIndex,
+) -> list[TeamGraphBuildRequest]:
+    catalog_settings = context.settings.catalog
+    excluded_team_ids = normalize_team_ids(list(catalog_settings.builder_excluded_team_ids))
+    excluded_team_set = set(excluded_team_ids)
+    _, team_options = build_filter_options(index_data.items, index_data.unknown_value)
+    team_counts: dict[str, int] = {}
+    for item in index_data.items:
+        team_counts[item.team_id] = team_counts.get(item.team_id, 0) + 1
+    selections = [
+        normalize_team_ids(list(selection))
+        for selection in catalog_settings.team_graph_prewarm_selections
+    ]
+    selections.extend(
+        [team_id]
+        for team_id, _ in sorted(
+            team_options,
+            key=lambda entry: (-team_counts.get(entry[0], 0), entry[1].lower()),
+        )
+        if team_id not in excluded_team_set
+    )
+    build_requests: list[TeamGraphBuildRequest] = []
+    seen: set[TeamGraphBuildRequest] = set()
+    for team_ids in selections:
+        if not team_ids:
+            continue
+        build_request = build_team_graph_request(
+            team_ids=team_ids,
+            excluded_team_ids=excluded_team_ids,
+            merge_nodes_all_markups=False,
+            merge_selected_markups=False,
+            merge_node_min_chain_size=1,
+        )
+        if build_request in seen:
+            continue
+        seen.add(build_request)
+        build_requests.append(build_request)
+    return build_requests[: max(0, catalog_settings.team_graph_prewarm_max_jobs)]
+
+
+def schedule_team_graph_prewarm(context: CatalogContext, index_data: CatalogIndex) -> None:
+    state = context.team_graph_jobs
+    build_requests = build_team_graph_prewarm_requests(context, index_data)
+    cache_signature = build_team_graph_cache_signature(
+        context,
+        index_signature=resolve_catalog_index_signature(context, index_data),
+    )
+    with state.lock:
+        if state.prewarm.stop.is_set():
+            return
+        state.prewarm.generation += 1
+        state.prewarm.job_ids = set()
+        thread = threading.Thread(
+            target=run_team_graph_prewarm,
+            args=(context, index_data, build_requests, cache_signature, state.prewarm.generation),
+            name="team-graph-prewarm",
+            daemon=True,
+        )
+        state.prewarm.thread = thread
+    logger.info("Team graph pre-warm scheduled for %s selections.", len(build_requests))
+    thread.start()
+
+
+def stop_team_graph_prewarm(context: CatalogContext) -> None:
+    context.team_graph_jobs.prewarm.stop.set()
+
+
+def run_team_graph_prewarm(
+    context: CatalogContext,
+    index_data: CatalogIndex,
+    build_requests: Sequence[TeamGraphBuildRequest],
+    cache_signature: str,
+    generation: int,
+) -> None:
+    state = context.team_graph_jobs
+    for build_request in build_requests:
+        if not wait_for_team_graph_prewarm_slot(state, generation):
+            return
+        job = create_or_reuse_team_graph_job(
+            context,
+            build_request=build_request,
+            index_data=index_data,
+            cache_signature=cache_signature,
+            prewarm=True,
+        )
+        with state.lock:
+            if is_team_graph_prewarm_current(state, generation):
+                state.prewarm.job_ids.add(job.job_id)
+        if not wait_for_team_graph_prewarm_job(state, job.job_id, generation):
+            with state.lock:
+                if job.prewarm and not job.client_ids:
+                    cancel_team_graph_job(context, job.job_id)
+            return
+    logger.info("Team graph pre-warm finished for %s selections.", len(build_requests))
+
+
+def is_team_graph_prewarm_current(state: TeamGraphJobState, generation: int) -> bool:
+    return not state.prewarm.stop.is_set() and state.prewarm.generation == generation
+
+
+def has_team_graph_prewarm_capacity(state: TeamGraphJobState) -> bool:
+    with state.lock:
+        active_jobs = [
+            job for job in state.jobs.values() if job.status in TEAM_GRAPH_JOB_ACTIVE_STATUSES
+        ]
+        if any(job.status == "pending" for job in active_jobs):
+            return False
+        if len(active_jobs) >= max(1, state.worker_count - 1):
+            return False
+        return has_team_graph_queue_capacity(state)
+
+
+def wait_for_team_graph_prewarm_slot(state: TeamGraphJobState, generation: int) -> bool:
+    while is_team_graph_prewarm_current(state, generation):
+        if has_team_graph_prewarm_capacity(state):
+            return True
+        state.prewarm.stop.wait(TEAM_GRAPH_PREWARM_POLL_SECONDS)
+    return False
+
+
+def wait_for_team_graph_prewarm_job(
+    state: TeamGraphJobState,
+    job_id: str,
+    generation: int,
+) -> bool:
+    while is_team_graph_prewarm_current(state, generation):
+        with state.lock:
+            job = state.jobs.get(job_id)
+            if job is None or job.status not in TEAM_GRAPH_JOB_ACTIVE_STATUSES:
+                return True
+        state.prewarm.stop.wait(TEAM_GRAPH_PREWARM_POLL_SECONDS)
+    return False
+
+
 def run_team_graph_job(
     context: CatalogContext,
     job_id: str,
@@ -2367,21 +3108,41 @@ def run_team_graph_job(
 ) -> None:
     with context.team_graph_jobs.lock:
         job = context.team_graph_jobs.jobs.get(job_id)
-        if job is None:
+        if job is None or job.status != "pending":
             return
         job.status = "running"
         job.started_at = datetime.now(tz=UTC)
         job.updated_at = job.started_at
         job.error_message = None
         job.result = None
+        build_request = job.request
+        cancellation = job.cancellation
+        progress = job.progress
     try:
-        result = compute_team_graph_build_result(context, index_data, job.request)
+        result = compute_team_graph_build_result(
+            context,
+            index_data,
+            build_request,
+            cancellation=cancellation,
+            progress=progress,
+        )
+    except OperationCancelledError:
+        logger.info("Team graph merge job %s was cancelled.", job_id)
+        finish_team_graph_job(
+            context,
+            job_id,
+            cancellation=cancellation,
+            status="cancelled",
+            error_message="Merge was superseded by a newer selection.",
+        )
+        return
     except HTTPException as exc:
         message = str(exc.detail) if exc.detail is not None else "Unable to build team graph."
         logger.warning("Team graph merge job failed: %s", message)
         finish_team_graph_job(
             context,
             job_id,
+            cancellation=cancellation,
             status="failed",
             error_message=message,
         )
@@ -2391,6 +3152,7 @@ def run_team_graph_job(
         finish_team_graph_job(
             context,
             job_id,
+            cancellation=cancellation,
             status="failed",
             error_message=str(exc).strip() or "Unexpected team graph merge failure.",
         )
@@ -2398,6 +3160,7 @@ def run_team_graph_job(
     finish_team_graph_job(
         context,
         job_id,
+        cancellation=cancellation,
         status="succeeded",
         result=result,
     )
@@ -2410,17 +3173,42 @@ def finish_team_graph_job(
     status: TeamGraphJobStatus,
     result: TeamGraphBuildResult | None = None,
     error_message: str | None = None,
+    cancellation: CancellationToken | None = None,
 ) -> None:
     now = datetime.now(tz=UTC)
     with context.team_graph_jobs.lock:
         job = context.team_graph_jobs.jobs.get(job_id)
         if job is None:
             return
+        if cancellation is not None and job.cancellation is not cancellation:
+            return
         job.status = status
         job.result = result
         job.error_message = error_message
         job.updated_at = now
         job.finished_at = now
+        log_team_graph_job_timings(job)
+
+
+def log_team_graph_job_timings(job: TeamGraphJob) -> None:
+    started_at = job.started_at
+    if started_at is None or job.finished_at is None:
+        return
+    duration_ms = round((job.finished_at - started_at).total_seconds() * 1000, 3)
+    phases = job.progress.snapshot().phases
+    logger.info(
+        "Team graph merge job %s %s in %.0f ms (%s).",
+        job.job_id,
+        job.status,
+        duration_ms,
+        ", ".join(f"{phase.name}={phase.duration_ms:.0f}ms" for phase in phases) or "no phases",
+        extra={
+            "team_graph_job_id": job.job_id,
+            "team_graph_job_status": job.status,
+            "team_graph_job_duration_ms": duration_ms,
+            "team_graph_job_phases": {phase.name: phase.duration_ms for phase in phases},
+        },
+    )
 
 
 def prune_team_graph_jobs(
@@ -2434,7 +3222,10 @@ def prune_team_graph_jobs(
     removable = [
         job
         for job in state.jobs.values()
-        if job.job_id not in keep_ids and job.finished_at is not None and job.finished_at < cutoff
+        if job.job_id not in keep_ids
+        and job.job_id not in state.prewarm.job_ids
+        and job.finished_at is not None
+        and job.finished_at < cutoff
     ]
     removable.sort(key=lambda item: item.finished_at or item.updated_at)
     while removable:
@@ -2444,27 +3235,43 @@ def prune_team_graph_jobs(
         if state.request_jobs.get(request_key) == job.job_id:
             state.request_jobs.pop(request_key, None)
     if len(state.jobs) <= max_jobs:
+        prune_team_graph_client_jobs(state)
         return
     overflow = len(state.jobs) - max_jobs
+    # Unclaimed pre-warm results are dropped first so user merges keep their slots.
     finished_jobs = sorted(
         (
             job
             for job in state.jobs.values()
             if job.job_id not in keep_ids and job.finished_at is not None
         ),
-        key=lambda item: item.finished_at or item.updated_at,
+        key=lambda item: (
+            not (item.prewarm and not item.client_ids),
+            item.finished_at or item.updated_at,
+        ),
     )
     for job in finished_jobs[:overflow]:
         state.jobs.pop(job.job_id, None)
+        state.prewarm.job_ids.discard(job.job_id)
         request_key = build_team_graph_request_key(job.request, cache_signature=job.index_signature)
         if state.request_jobs.get(request_key) == job.job_id:
             state.request_jobs.pop(request_key, None)
+    prune_team_graph_client_jobs(state)
+
+
+def prune_team_graph_client_jobs(state: TeamGraphJobState) -> None:
+    for client_id, job_id in list(state.client_jobs.items()):
+        if job_id not in state.jobs:
+            state.client_jobs.pop(client_id, None)
 
 
 def compute_team_graph_build_result(
     context: CatalogContext,
     index_data: CatalogIndex,
     build_request: TeamGraphBuildRequest,
+    *,
+    cancellation: CancellationToken | None = None,
+    progress: PhaseRecorder | None = None,
 ) -> TeamGraphBuildResult:
     items, merge_scope_items = resolve_team_graph_items(
         index_data.items,
@@ -2475,32 +3282,66 @@ def compute_team_graph_build_result(
         raise HTTPException(status_code=404, detail="No scenes for selected teams.")
 
     document_cache: dict[str, MarkupDocument] = {}
-    selected_documents = load_markup_documents(context, items, cache=document_cache)
-    all_documents = selected_documents
-    if len(items) < len(merge_scope_items):
-        all_documents = load_markup_documents(context, merge_scope_items, cache=document_cache)
-
-    dashboard = BuildCrossTeamGraphDashboard().build(
-        selected_documents=selected_documents,
-        all_documents=all_documents,
-        selected_team_ids=list(build_request.team_ids),
-        merge_selected_markups=build_request.merge_selected_markups,
-        merge_node_min_chain_size=build_request.merge_node_min_chain_size,
-        merge_documents=all_documents if build_request.merge_nodes_all_markups else None,
-    )
+    with track_phase(progress, "load_markups"):
+        selected_documents = load_markup_documents(
+            context,
+            items,
+            cache=document_cache,
+            cancellation=cancellation,
+        )
+        all_documents = selected_documents
+        if len(items) < len(merge_scope_items):
+            all_documents = load_merge_scope_documents(
+                context,
+                merge_scope_items,
+                cache=document_cache,
+                cancellation=cancellation,
+            )
 
-    builder = BuildTeamProcedureGraph()
-    try:
-        procedure_graph_document = builder.build(
-            selected_documents,
-            merge_documents=all_documents if build_request.merge_nodes_all_markups else None,
+    selected_versions = [build_markup_document_version(item) for item in items]
+    all_versions = selected_versions
+    if all_documents is not selected_documents:
+        all_versions = [
+            build_markup_document_version(
+                item, from_summary=item.markup_rel_path not in document_cache
+            )
+            for item in merge_scope_items
+        ]
+
+    with track_phase(progress, "dashboard"):
+        dashboard = BuildCrossTeamGraphDashboard(
+            aggregate_cache=context.team_graph_jobs.aggregate_cache
+        ).build(
+            selected_documents=selected_documents,
+            all_documents=all_documents,
+            selected_team_ids=list(build_request.team_ids),
             merge_selected_markups=build_request.merge_selected_markups,
             merge_node_min_chain_size=build_request.merge_node_min_chain_size,
-            graph_level="procedure",
+            merge_documents=all_documents if build_request.merge_nodes_all_markups else None,
+            cancellation=cancellation,
+            progress=progress,
+            selected_document_versions=selected_versions,
+            all_document_versions=all_versions,
         )
+
+    builder = BuildTeamProcedureGraph()
+    try:
+        with track_phase(progress, "procedure_graph"):
+            procedure_graph_document = builder.build(
+                selected_documents,
+                merge_documents=all_documents if build_request.merge_nodes_all_markups else None,
+                merge_selected_markups=build_request.merge_selected_markups,
+                merge_node_min_chain_size=build_request.merge_node_min_chain_size,
+                graph_level="procedure",
+                cancellation=cancellation,
+                progress=progress,
+            )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    service_graph_document = builder.build_service_graph_document(procedure_graph_document)
+    if cancellation is not None:
+        cancellation.raise_if_cancelled()
+    with track_phase(progress, "service_graph"):
+        service_graph_document = builder.build_service_graph_document(procedure_graph_document)
     return TeamGraphBuildResult(
         dashboard=dashboard,
         procedure_graph_document=procedure_graph_document,
@@ -2919,6 +3760,23 @@ def markup_type_group_sort_key(value: str) -> tuple[int, int, str]:
     return (0, order, normalized)
 
 
+def resolve_team_graph_client_id(request: Request) -> str:
+    raw_value = str(request.cookies.get(TEAM_GRAPH_CLIENT_COOKIE_NAME) or "").strip()
+    if raw_value and len(raw_value) <= 64 and raw_value.isalnum():
+        return raw_value
+    return uuid.uuid4().hex
+
+
+def apply_team_graph_client_cookie(response: Response, client_id: str) -> None:
+    response.set_cookie(
+        key=TEAM_GRAPH_CLIENT_COOKIE_NAME,
+        value=client_id,
+        httponly=True,
+        samesite="lax",
+        path="/",
+    )
+
+
 def is_htmx(request: Request) -> bool:
     return request.headers.get("HX-Request") == "true"
 
@@ -5,7 +5,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from domain.models import MarkupDocument
+from domain.models import MarkupDocument, Procedure
 
 
 @dataclass(frozen=True)
@@ -16,6 +16,79 @@ class MarkupSourceItem:
     updated_at: datetime
 
 
+@dataclass(frozen=True)
+class MarkupMergeSummary:
+    markup_type: str
+    service_name: str | None = None
+    team_id: int | str | None = None
+    team_name: str | None = None
+    finedog_unit_id: str | None = None
+    procedure_ids: list[str] = field(default_factory=list)
+    procedure_graph: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_document(cls, document: MarkupDocument) -> MarkupMergeSummary:
+        procedure_ids: list[str] = []
+        seen: set[str] = set()
+        for procedure in document.procedures:
+            if procedure.procedure_id in seen:
+                continue
+            seen.add(procedure.procedure_id)
+            procedure_ids.append(procedure.procedure_id)
+        return cls(
+            markup_type=document.markup_type,
+            service_name=document.service_name,
+            team_id=document.team_id,
+            team_name=document.team_name,
+            finedog_unit_id=document.finedog_unit_id,
+            procedure_ids=procedure_ids,
+            procedure_graph={
+                source: list(targets) for source, targets in document.procedure_graph.items()
+            },
+        )
+
+    def to_document(self) -> MarkupDocument:
+        return MarkupDocument(
+            markup_type=self.markup_type,
+            service_name=self.service_name,
+            team_id=self.team_id,
+            team_name=self.team_name,
+            finedog_unit_id=self.finedog_unit_id,
+            procedures=[
+                Procedure(procedure_id=procedure_id) for procedure_id in self.procedure_ids
+            ],
+            procedure_graph={
+                source: list(targets) for source, targets in self.procedure_graph.items()
+            },
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "markup_type": self.markup_type,
+            "service_name": self.service_name,
+            "team_id": self.team_id,
+            "team_name": self.team_name,
+            "finedog_unit_id": self.finedog_unit_id,
+            "procedure_ids": list(self.procedure_ids),
+            "procedure_graph": {key: list(value) for key, value in self.procedure_graph.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Any) -> MarkupMergeSummary | None:
+        if not isinstance(payload, dict):
+            return None
+        team_id = payload.get("team_id")
+        return cls(
+            markup_type=str(payload.get("markup_type", "")),
+            service_name=_load_optional_string(payload.get("service_name")),
+            team_id=team_id if isinstance(team_id, int | str) else None,
+            team_name=_load_optional_string(payload.get("team_name")),
+            finedog_unit_id=_load_optional_string(payload.get("finedog_unit_id")),
+            procedure_ids=_load_raw_string_list(payload.get("procedure_ids")),
+            procedure_graph=_load_raw_procedure_graph(payload.get("procedure_graph")),
+        )
+
+
 @dataclass(frozen=True)
 class CatalogItem:
     scene_id: str
@@ -49,9 +122,10 @@ class CatalogItem:
     postpone_end_block_count: int = 0
     has_start_end_overlap: bool = False
     consistent: bool = True
+    merge_summary: MarkupMergeSummary | None = None
 
-    def to_dict(self) -> dict[str, Any]:
-        return {
+    def to_dict(self, *, include_merge_summary: bool = True) -> dict[str, Any]:
+        payload: dict[str, Any] = {
             "scene_id": self.scene_id,
             "title": self.title,
             "tags": list(self.tags),
@@ -96,6 +170,11 @@ class CatalogItem:
             "postpone_end_block_count": int(self.postpone_end_block_count),
             "has_start_end_overlap": bool(self.has_start_end_overlap),
         }
+        if include_merge_summary:
+            payload["merge_summary"] = (
+                self.merge_summary.to_dict() if self.merge_summary is not None else None
+            )
+        return payload
 
     @classmethod
     def from_dict(cls, payload: dict[str, Any]) -> CatalogItem:
@@ -151,6 +230,7 @@ class CatalogItem:
                 payload.get("postpone_end_block_count")
             ),
             has_start_end_overlap=_load_bool(payload.get("has_start_end_overlap")),
+            merge_summary=MarkupMergeSummary.from_dict(payload.get("merge_summary")),
         )
 
 
@@ -168,6 +248,24 @@ def _load_string_list(raw: Any) -> list[str]:
     return result
 
 
+def _load_raw_string_list(raw: Any) -> list[str]:
+    if not isinstance(raw, list | tuple):
+        return []
+    return [str(value) for value in raw]
+
+
+def _load_raw_procedure_graph(raw: Any) -> dict[str, list[str]]:
+    if not isinstance(raw, dict):
+        return {}
+    return {str(source): _load_raw_string_list(targets) for source, targets in raw.items()}
+
+
+def _load_optional_string(raw: Any) -> str | None:
+    if raw is None:
+        return None
+    return str(raw)
+
+
 def _load_procedure_blocks(raw: Any) -> dict[str, list[str]]:
     if not isinstance(raw, dict):
         return {}
@@ -307,7 +405,7 @@ class CatalogIndex:
     unknown_value: str
     items: list[CatalogItem] = field(default_factory=list)
 
-    def to_dict(self) -> dict[str, Any]:
+    def to_dict(self, *, include_merge_summary: bool = True) -> dict[str, Any]:
         return {
             "generated_at": self.generated_at,
             "group_by": list(self.group_by),
@@ -316,7 +414,9 @@ class CatalogIndex:
             "sort_by": self.sort_by,
             "sort_order": self.sort_order,
             "unknown_value": self.unknown_value,
-            "items": [item.to_dict() for item in self.items],
+            "items": [
+                item.to_dict(include_merge_summary=include_merge_summary) for item in self.items
+            ],
         }
 
     @classmethod
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Any, cast
 
+import orjson
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator, model_validator
 
 METADATA_SCHEMA_VERSION = "1.0"
@@ -508,6 +511,14 @@ class ScenarioProceduresBlock:
     finedog_unit_id: str | None = None
 
 
+@dataclass(frozen=True)
+class LayoutRefinement:
+    quality: str = "full"
+    applied: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    budget_exhausted: bool = False
+
+
 @dataclass(frozen=True)
 class LayoutPlan:
     frames: list[FramePlacement]
@@ -517,6 +528,11 @@ class LayoutPlan:
     scenarios: list[ScenarioPlacement] = field(default_factory=list)
     service_zones: list[ServiceZonePlacement] = field(default_factory=list)
     markup_type_columns: list[MarkupTypeColumnPlacement] = field(default_factory=list)
+    refinement: LayoutRefinement = field(default_factory=LayoutRefinement)
+
+
+def scene_content_hash(payload: Mapping[str, Any]) -> str:
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
 
 @dataclass(frozen=True)
@@ -535,6 +551,9 @@ class ExcalidrawDocument:
             "files": self.files,
         }
 
+    def content_hash(self) -> str:
+        return scene_content_hash(self.to_dict())
+
 
 @dataclass(frozen=True)
 class UnidrawDocument:
@@ -551,3 +570,6 @@ class UnidrawDocument:
             "appState": self.app_state,
             "files": self.files,
         }
+
+    def content_hash(self) -> str:
+        return scene_content_hash(self.to_dict())
@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 
-from domain.models import Procedure
+from domain.models import MarkupDocument, Procedure
 
 
 @dataclass(frozen=True)
@@ -33,6 +33,40 @@ def build_block_owner_index(
     return owners
 
 
+def resolve_owned_blocks(
+    document: MarkupDocument,
+    block_graph_nodes: set[str] | None = None,
+) -> dict[str, set[str]]:
+    explicit_owners: dict[str, set[str]] = {}
+    for procedure in document.procedures:
+        proc_id = procedure.procedure_id
+        explicit_blocks = (
+            set(procedure.start_block_ids)
+            | set(procedure.end_block_ids)
+            | set(procedure.branches.keys())
+        )
+        if block_graph_nodes:
+            explicit_blocks.update(set(procedure.block_id_to_block_name.keys()) & block_graph_nodes)
+        for block_id in explicit_blocks:
+            explicit_owners.setdefault(block_id, set()).add(proc_id)
+
+    explicit_by_proc: dict[str, list[str]] = {}
+    for block_id, owners in explicit_owners.items():
+        for owner in owners:
+            explicit_by_proc.setdefault(owner, []).append(block_id)
+
+    owned_by_proc: dict[str, set[str]] = {}
+    for procedure in document.procedures:
+        proc_id = procedure.procedure_id
+        owned = set(explicit_by_proc.get(proc_id, ()))
+        for targets in procedure.branches.values():
+            for target in targets:
+                if target not in explicit_owners:
+                    owned.add(target)
+        owned_by_proc[proc_id] = owned
+    return owned_by_proc
+
+
 def resolve_block_graph_edges(
     block_graph: Mapping[str, Iterable[str]],
     owners_by_block: Mapping[str, set[str]],
@@ -8,7 +8,13 @@ from datetime import UTC
 from pathlib import Path
 from typing import Any
 
-from domain.catalog import CatalogIndex, CatalogIndexConfig, CatalogItem, MarkupSourceItem
+from domain.catalog import (
+    CatalogIndex,
+    CatalogIndexConfig,
+    CatalogItem,
+    MarkupMergeSummary,
+    MarkupSourceItem,
+)
 from domain.models import MarkupDocument, is_completion_end_block
 from domain.ports.catalog import CatalogIndexRepository, MarkupCatalogSource
 
@@ -156,6 +162,7 @@ class BuildCatalogIndex:
             non_postpone_end_block_count=non_postpone_end_block_count,
             postpone_end_block_count=postpone_end_block_count,
             has_start_end_overlap=has_start_end_overlap,
+            merge_summary=MarkupMergeSummary.from_document(document),
         )
 
     def _relative_path(self, path: Path, base: Path) -> str:
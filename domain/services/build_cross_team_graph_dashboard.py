@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 
@@ -12,7 +13,9 @@ from domain.models import (
     merge_end_types,
 )
 from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph
-from domain.services.graph_metrics import compute_graph_metrics
+from domain.services.cancellation import CancellationToken, raise_if_cancelled
+from domain.services.graph_metrics import GraphMetrics, compute_graph_metrics
+from domain.services.phase_recorder import PhaseRecorder, mark_phase, track_phase
 from domain.services.shared_node_merge_rules import (
     ServiceNodeState,
     build_service_node_state,
@@ -173,8 +176,12 @@ class _GraphAggregate:
     block_ids_by_procedure: dict[str, set[str]] = field(default_factory=dict)
     start_block_ids_by_procedure: dict[str, set[str]] = field(default_factory=dict)
     end_block_types_by_procedure: dict[str, dict[str, str]] = field(default_factory=dict)
+    _node_state: ServiceNodeState | None = field(default=None, repr=False, compare=False)
+    _graph_metrics: GraphMetrics | None = field(default=None, repr=False, compare=False)
 
     def add_document(self, document: MarkupDocument) -> None:
+        self._node_state = None
+        self._graph_metrics = None
         for procedure in document.procedures:
             self._register_procedure_id(procedure.procedure_id)
         for source, targets in document.procedure_graph.items():
@@ -205,16 +212,35 @@ class _GraphAggregate:
             block_ids = self.block_ids_by_procedure.setdefault(procedure.procedure_id, set())
             block_ids.update(procedure.block_ids())
 
+    def node_state(self) -> ServiceNodeState:
+        if self._node_state is None:
+            self._node_state = build_service_node_state(
+                self.key,
+                self.procedure_ids,
+                self.adjacency,
+            )
+        return self._node_state
+
+    def graph_metrics(self) -> GraphMetrics:
+        if self._graph_metrics is None:
+            self._graph_metrics = compute_graph_metrics(self.to_adjacency())
+        return self._graph_metrics
+
     def block_count(self) -> int:
         return sum(len(block_ids) for block_ids in self.block_ids_by_procedure.values())
 
     def to_adjacency(self, nodes: set[str] | None = None) -> dict[str, list[str]]:
         scoped_nodes = set(nodes) if nodes is not None else set(self.procedure_ids)
-        scoped_adjacency = self._scoped_adjacency(scoped_nodes)
-        adjacency: dict[str, list[str]] = {}
-        for node in sorted(scoped_nodes):
-            adjacency[node] = sorted(scoped_adjacency.get(node, set()))
-        return adjacency
+        return _sorted_adjacency(scoped_nodes, self._scoped_adjacency(scoped_nodes))
+
+    def scoped_graph_metrics(self, scopes: Mapping[str, set[str]]) -> dict[str, GraphMetrics]:
+        proc_ids_by_base = self._proc_ids_by_base()
+        return {
+            key: compute_graph_metrics(
+                _sorted_adjacency(nodes, self._scoped_adjacency(nodes, proc_ids_by_base))
+            )
+            for key, nodes in scopes.items()
+        }
 
     def visible_procedure_ids(self) -> set[str]:
         return {proc_id for proc_id, block_ids in self.block_ids_by_procedure.items() if block_ids}
@@ -351,14 +377,22 @@ class _GraphAggregate:
 
         return tuple(ordered), levels
 
-    def _scoped_adjacency(self, scoped_nodes: set[str]) -> dict[str, set[str]]:
-        adjacency: dict[str, set[str]] = {node: set() for node in scoped_nodes}
-        if not scoped_nodes:
-            return adjacency
-
+    def _proc_ids_by_base(self) -> dict[str, set[str]]:
         proc_ids_by_base: dict[str, set[str]] = {}
         for proc_id in self.procedure_ids:
             proc_ids_by_base.setdefault(_normalize_scoped_procedure_id(proc_id), set()).add(proc_id)
+        return proc_ids_by_base
+
+    def _scoped_adjacency(
+        self,
+        scoped_nodes: set[str],
+        proc_ids_by_base: Mapping[str, set[str]] | None = None,
+    ) -> dict[str, set[str]]:
+        adjacency: dict[str, set[str]] = {node: set() for node in scoped_nodes}
+        if not scoped_nodes:
+            return adjacency
+        if proc_ids_by_base is None:
+            proc_ids_by_base = self._proc_ids_by_base()
 
         def is_graph_only(proc_id: str) -> bool:
             return not self.block_ids_by_procedure.get(proc_id, set())
@@ -421,7 +455,45 @@ class _ServiceDocumentSnapshot:
     procedure_ids: frozenset[str]
 
 
+@dataclass(frozen=True)
+class _DocumentAggregates:
+    graph: _GraphAggregate
+    snapshot: _ServiceDocumentSnapshot
+
+
+class ServiceGraphAggregateCache:
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, _DocumentAggregates] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_build(self, version: str, document: MarkupDocument) -> _DocumentAggregates:
+        with self._lock:
+            cached = self._entries.get(version)
+            if cached is not None:
+                self._entries.move_to_end(version)
+                return cached
+        aggregates = _build_document_aggregates(document)
+        with self._lock:
+            self._entries[version] = aggregates
+            self._entries.move_to_end(version)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return aggregates
+
+
 class BuildCrossTeamGraphDashboard:
+    def __init__(self, aggregate_cache: ServiceGraphAggregateCache | None = None) -> None:
+        self._aggregate_cache = aggregate_cache
+
     def build(
         self,
         selected_documents: Sequence[MarkupDocument],
@@ -431,14 +503,26 @@ class BuildCrossTeamGraphDashboard:
         merge_node_min_chain_size: int = 1,
         merge_documents: Sequence[MarkupDocument] | None = None,
         top_limit: int = 10,
+        cancellation: CancellationToken | None = None,
+        progress: PhaseRecorder | None = None,
+        selected_document_versions: Sequence[str | None] | None = None,
+        all_document_versions: Sequence[str | None] | None = None,
     ) -> CrossTeamGraphDashboard:
-        selected_graphs = self._collect_graphs(selected_documents)
-        selected_service_docs = [doc for doc in selected_documents if _is_service_markup(doc)]
-        all_service_docs = [doc for doc in all_documents if _is_service_markup(doc)]
-        selected_services = self._collect_graphs(selected_service_docs)
-        all_services = self._collect_graphs(all_service_docs)
+        raise_if_cancelled(cancellation)
+        mark_phase(progress, "collect_graphs")
+        selected_entries = _versioned_documents(selected_documents, selected_document_versions)
+        all_entries = _versioned_documents(all_documents, all_document_versions)
+        selected_graphs = self._collect_graphs(selected_entries)
+        selected_service_entries = [
+            entry for entry in selected_entries if _is_service_markup(entry[0])
+        ]
+        all_service_entries = [entry for entry in all_entries if _is_service_markup(entry[0])]
+        selected_services = self._collect_graphs(selected_service_entries)
+        all_services = self._collect_graphs(all_service_entries)
         procedure_names = self._collect_procedure_names(selected_documents)
+        raise_if_cancelled(cancellation)
 
+        mark_phase(progress, "graph_view")
         selected_team_set = {
             team_id for team_id in (str(value).strip() for value in selected_team_ids) if team_id
         }
@@ -452,7 +536,18 @@ class BuildCrossTeamGraphDashboard:
             merge_selected_markups=merge_selected_markups,
             merge_node_min_chain_size=merge_node_min_chain_size,
             merge_documents=merge_documents,
+            merge_scope_entries=(
+                all_entries
+                if merge_documents is all_documents
+                else selected_entries
+                if merge_documents is None
+                else None
+            ),
+            cancellation=cancellation,
+            progress=progress,
         )
+        raise_if_cancelled(cancellation)
+        mark_phase(progress, "procedure_stats")
         markup_type_counts = tuple(self._build_markup_type_counts(selected_documents))
         total_procedure_count = sum(len(document.procedures) for document in selected_documents)
         unique_procedure_ids = {
@@ -527,7 +622,8 @@ class BuildCrossTeamGraphDashboard:
             key=str.lower,
         )
 
-        selected_snapshots = self._collect_service_snapshots(selected_service_docs)
+        mark_phase(progress, "merge_pairs")
+        selected_snapshots = self._collect_service_snapshots(selected_service_entries)
         all_service_states = self._build_service_node_states(all_services)
         pair_merge_nodes = collect_pair_merge_nodes(
             all_service_states,
@@ -536,7 +632,9 @@ class BuildCrossTeamGraphDashboard:
         )
         pair_merge_counts = self._build_pair_merge_counts(pair_merge_nodes)
         selected_service_keys = set(selected_services.keys())
+        raise_if_cancelled(cancellation)
 
+        mark_phase(progress, "intersections")
         internal_intersection_entities: set[str] = set()
         external_intersection_entities: set[str] = set()
         external_team_counter: Counter[str] = Counter()
@@ -624,6 +722,7 @@ class BuildCrossTeamGraphDashboard:
             if has_external:
                 external_intersection_entities.add(entity_label)
 
+        mark_phase(progress, "split_services")
         split_service_count = 0
         target_service_count = 0
         split_entities: list[str] = []
@@ -634,8 +733,7 @@ class BuildCrossTeamGraphDashboard:
                 service.service_name,
                 service.markup_type,
             )
-            component_count = _count_weak_components(service.procedure_ids, service.adjacency)
-            has_split_graph = component_count > 1
+            has_split_graph = service.graph_metrics().weak_component_count > 1
             if has_split_graph:
                 split_service_count += 1
                 split_entities.append(entity_label)
@@ -646,6 +744,8 @@ class BuildCrossTeamGraphDashboard:
                 target_service_count += 1
                 target_entities.append(entity_label)
 
+        raise_if_cancelled(cancellation)
+        mark_phase(progress, "linking_procedures")
         linking_procedures = tuple(
             self._build_linking_procedures(
                 selected_graphs,
@@ -653,6 +753,8 @@ class BuildCrossTeamGraphDashboard:
                 top_limit=top_limit,
             )
         )
+        raise_if_cancelled(cancellation)
+        mark_phase(progress, "overloaded_services")
         flow_graph = _GraphAggregate(
             key="__flow__",
             team_id="__flow__",
@@ -682,9 +784,11 @@ class BuildCrossTeamGraphDashboard:
                 merge_selected_markups=merge_selected_markups,
                 merge_node_min_chain_size=merge_node_min_chain_size,
                 top_limit=top_limit,
+                cancellation=cancellation,
             )
         )
 
+        mark_phase(progress, "team_intersections")
         external_team_intersections = tuple(
             TeamIntersectionStat(
                 team_name=name,
@@ -784,11 +888,18 @@ class BuildCrossTeamGraphDashboard:
         merge_selected_markups: bool,
         merge_node_min_chain_size: int,
         merge_documents: Sequence[MarkupDocument] | None = None,
+        merge_scope_entries: Sequence[tuple[MarkupDocument, str | None]] | None = None,
+        cancellation: CancellationToken | None = None,
+        progress: PhaseRecorder | None = None,
     ) -> tuple[MarkupDocument, list[str], dict[str, set[str]], tuple[GraphGroupStat, ...]]:
         merge_representative_ids: set[str] | None = None
         if merge_node_min_chain_size > 1:
-            merge_scope = merge_documents if merge_documents is not None else selected_documents
-            merge_scope_services = [doc for doc in merge_scope if _is_service_markup(doc)]
+            if merge_scope_entries is None:
+                merge_scope = merge_documents if merge_documents is not None else selected_documents
+                merge_scope_entries = _versioned_documents(merge_scope, None)
+            merge_scope_services = [
+                entry for entry in merge_scope_entries if _is_service_markup(entry[0])
+            ]
             if merge_scope_services:
                 merge_scope_states = self._build_service_node_states(
                     self._collect_graphs(merge_scope_services)
@@ -802,12 +913,15 @@ class BuildCrossTeamGraphDashboard:
                 for representative_ids in pair_merge_nodes.values():
                     merge_representative_ids.update(representative_ids)
 
-        graph_document = BuildTeamProcedureGraph().build(
-            selected_documents,
-            merge_documents=merge_documents,
-            merge_selected_markups=merge_selected_markups,
-            merge_node_min_chain_size=merge_node_min_chain_size,
-        )
+        with track_phase(progress, "procedure_graph"):
+            graph_document = BuildTeamProcedureGraph().build(
+                selected_documents,
+                merge_documents=merge_documents,
+                merge_selected_markups=merge_selected_markups,
+                merge_node_min_chain_size=merge_node_min_chain_size,
+                cancellation=cancellation,
+                progress=progress,
+            )
         components = _collect_graph_components(graph_document)
         graph_keys_by_procedure_id: dict[str, set[str]] = {}
         procedure_meta = graph_document.procedure_meta or {}
@@ -924,41 +1038,48 @@ class BuildCrossTeamGraphDashboard:
         )
         return graph_document, graph_keys, graph_keys_by_procedure_id, graph_groups
 
-    def _collect_graphs(self, documents: Sequence[MarkupDocument]) -> dict[str, _GraphAggregate]:
+    def _collect_graphs(
+        self,
+        entries: Sequence[tuple[MarkupDocument, str | None]],
+    ) -> dict[str, _GraphAggregate]:
+        entries_by_key: dict[str, list[tuple[MarkupDocument, str | None]]] = {}
+        for document, version in entries:
+            entries_by_key.setdefault(_graph_key(document)[0], []).append((document, version))
         graphs: dict[str, _GraphAggregate] = {}
-        for document in documents:
-            graph_key, team_id, team_name, service_name, markup_type = _graph_key(document)
-            graph = graphs.get(graph_key)
-            if graph is None:
-                graph = _GraphAggregate(
-                    key=graph_key,
-                    team_id=team_id,
-                    team_name=team_name,
-                    service_name=service_name,
-                    markup_type=markup_type,
-                )
-                graphs[graph_key] = graph
-            graph.add_document(document)
+        for graph_key, key_entries in entries_by_key.items():
+            if len(key_entries) == 1:
+                document, version = key_entries[0]
+                cached = self._cached_aggregates(document, version)
+                if cached is not None:
+                    graphs[graph_key] = cached.graph
+                    continue
+            graph = _new_graph_aggregate(key_entries[0][0])
+            for document, _version in key_entries:
+                graph.add_document(document)
+            graphs[graph_key] = graph
         return graphs
 
     def _collect_service_snapshots(
         self,
-        documents: Sequence[MarkupDocument],
+        entries: Sequence[tuple[MarkupDocument, str | None]],
     ) -> tuple[_ServiceDocumentSnapshot, ...]:
         snapshots: list[_ServiceDocumentSnapshot] = []
-        for document in documents:
-            graph_key, team_id, team_name, _service_name, markup_type = _graph_key(document)
+        for document, version in entries:
+            cached = self._cached_aggregates(document, version)
             snapshots.append(
-                _ServiceDocumentSnapshot(
-                    service_key=graph_key,
-                    team_id=team_id,
-                    team_name=team_name,
-                    markup_type=markup_type,
-                    procedure_ids=frozenset(_document_procedure_ids(document)),
-                )
+                cached.snapshot if cached is not None else _build_service_snapshot(document)
             )
         return tuple(snapshots)
 
+    def _cached_aggregates(
+        self,
+        document: MarkupDocument,
+        version: str | None,
+    ) -> _DocumentAggregates | None:
+        if self._aggregate_cache is None or version is None:
+            return None
+        return self._aggregate_cache.get_or_build(version, document)
+
     def _build_markup_type_counts(
         self,
         documents: Sequence[MarkupDocument],
@@ -1000,14 +1121,7 @@ class BuildCrossTeamGraphDashboard:
         self,
         services: Mapping[str, _GraphAggregate],
     ) -> dict[str, ServiceNodeState]:
-        return {
-            service.key: build_service_node_state(
-                service.key,
-                service.procedure_ids,
-                service.adjacency,
-            )
-            for service in services.values()
-        }
+        return {service.key: service.node_state() for service in services.values()}
 
     def _build_pair_merge_counts(
         self,
@@ -1031,9 +1145,7 @@ class BuildCrossTeamGraphDashboard:
     ) -> list[ProcedureLinkStat]:
         proc_to_graph_keys: dict[str, set[str]] = {}
         graph_labels_by_key: dict[str, str] = {}
-        graph_metrics_by_key = {
-            graph.key: compute_graph_metrics(graph.to_adjacency()) for graph in graphs.values()
-        }
+        graph_metrics_by_key = {graph.key: graph.graph_metrics() for graph in graphs.values()}
         merged_adjacency: dict[str, set[str]] = {}
         for graph in graphs.values():
             graph_label = _entity_label(graph.team_name, graph.service_name, graph.markup_type)
@@ -1159,6 +1271,7 @@ class BuildCrossTeamGraphDashboard:
         merge_selected_markups: bool,
         merge_node_min_chain_size: int,
         top_limit: int,
+        cancellation: CancellationToken | None = None,
     ) -> list[ServiceLoadStat]:
         merge_node_ids_by_service: dict[str, set[str]] = {}
         states = self._build_service_node_states(services)
@@ -1171,27 +1284,34 @@ class BuildCrossTeamGraphDashboard:
             merge_node_ids_by_service.setdefault(left_key, set()).update(proc_ids)
             merge_node_ids_by_service.setdefault(right_key, set()).update(proc_ids)
 
-        stats: list[ServiceLoadStat] = []
+        display_scopes: dict[str, set[str]] = {}
+        flow_visible_proc_ids = flow_graph.visible_procedure_ids()
         for service in services.values():
-            visible_proc_ids = service.visible_procedure_ids()
+            raise_if_cancelled(cancellation)
             scoped_proc_ids = set(flow_proc_ids_by_service.get(service.key, set()))
             if not scoped_proc_ids:
+                visible_proc_ids = service.visible_procedure_ids()
                 scoped_proc_ids = {
                     flow_proc_id
                     for flow_proc_id in flow_graph.procedure_ids
                     if _normalize_scoped_procedure_id(flow_proc_id) in visible_proc_ids
                 }
-            display_scoped_proc_ids = scoped_proc_ids & flow_graph.visible_procedure_ids()
+            display_scoped_proc_ids = scoped_proc_ids & flow_visible_proc_ids
+            if display_scoped_proc_ids:
+                display_scopes[service.key] = display_scoped_proc_ids
+        metrics_by_service = flow_graph.scoped_graph_metrics(display_scopes)
+
+        stats: list[ServiceLoadStat] = []
+        for service in services.values():
+            raise_if_cancelled(cancellation)
+            display_scoped_proc_ids = display_scopes.get(service.key, set())
             if not display_scoped_proc_ids:
                 continue
-            adjacency = flow_graph.to_adjacency(display_scoped_proc_ids)
-            graph_metrics = compute_graph_metrics(adjacency)
-            visible_adjacency = {node: set(children) for node, children in adjacency.items()}
+            visible_proc_ids = service.visible_procedure_ids()
+            graph_metrics = metrics_by_service[service.key]
             merge_nodes = merge_node_ids_by_service.get(service.key, set()) & visible_proc_ids
             in_team_merge_nodes = len(merge_nodes)
-            weak_component_count = _count_weak_components(
-                display_scoped_proc_ids, visible_adjacency
-            )
+            weak_component_count = graph_metrics.weak_component_count
             cycle_nodes = set(graph_metrics.cycle_path or ())
             ordered_scoped_proc_ids = [
                 proc_id for proc_id in global_proc_order if proc_id in display_scoped_proc_ids
@@ -1351,6 +1471,43 @@ class BuildCrossTeamGraphDashboard:
         return tuple(stats)
 
 
+def _versioned_documents(
+    documents: Sequence[MarkupDocument],
+    versions: Sequence[str | None] | None,
+) -> list[tuple[MarkupDocument, str | None]]:
+    if versions is None or len(versions) != len(documents):
+        return [(document, None) for document in documents]
+    return list(zip(documents, versions, strict=True))
+
+
+def _new_graph_aggregate(document: MarkupDocument) -> _GraphAggregate:
+    graph_key, team_id, team_name, service_name, markup_type = _graph_key(document)
+    return _GraphAggregate(
+        key=graph_key,
+        team_id=team_id,
+        team_name=team_name,
+        service_name=service_name,
+        markup_type=markup_type,
+    )
+
+
+def _build_service_snapshot(document: MarkupDocument) -> _ServiceDocumentSnapshot:
+    graph_key, team_id, team_name, _service_name, markup_type = _graph_key(document)
+    return _ServiceDocumentSnapshot(
+        service_key=graph_key,
+        team_id=team_id,
+        team_name=team_name,
+        markup_type=markup_type,
+        procedure_ids=frozenset(_document_procedure_ids(document)),
+    )
+
+
+def _build_document_aggregates(document: MarkupDocument) -> _DocumentAggregates:
+    graph = _new_graph_aggregate(document)
+    graph.add_document(document)
+    return _DocumentAggregates(graph=graph, snapshot=_build_service_snapshot(document))
+
+
 def _is_service_markup(document: MarkupDocument) -> bool:
     markup_type = str(document.markup_type or "").strip().lower()
     return markup_type in {"service", "system_service_search"}
@@ -1381,30 +1538,8 @@ def _document_procedure_ids(document: MarkupDocument) -> set[str]:
     return proc_ids
 
 
-def _count_weak_components(nodes: set[str], adjacency: Mapping[str, set[str]]) -> int:
-    if not nodes:
-        return 0
-    undirected: dict[str, set[str]] = {node: set() for node in nodes}
-    for source, targets in adjacency.items():
-        undirected.setdefault(source, set())
-        for target in targets:
-            undirected.setdefault(target, set())
-            undirected[source].add(target)
-            undirected[target].add(source)
-    visited: set[str] = set()
-    components = 0
-    for node in undirected:
-        if node in visited:
-            continue
-        components += 1
-        stack = [node]
-        while stack:
-            current = stack.pop()
-            if current in visited:
-                continue
-            visited.add(current)
-            stack.extend(undirected.get(current, set()) - visited)
-    return components
+def _sorted_adjacency(nodes: set[str], adjacency: Mapping[str, set[str]]) -> dict[str, list[str]]:
+    return {node: sorted(adjacency.get(node, set())) for node in sorted(nodes)}
 
 
 def _normalize_scoped_procedure_id(proc_id: str) -> str:
@@ -6,6 +6,8 @@ from typing import Any, Literal
 
 from domain.markup_type_labels import humanize_markup_type_for_brackets
 from domain.models import MarkupDocument, Procedure, is_completion_end_block, merge_end_types
+from domain.services.cancellation import CancellationToken, raise_if_cancelled
+from domain.services.phase_recorder import PhaseRecorder, mark_phase
 from domain.services.shared_node_merge_rules import (
     ServiceNodeState,
     build_service_node_state,
@@ -35,7 +37,10 @@ class BuildTeamProcedureGraph:
         merge_selected_markups: bool = True,
         merge_node_min_chain_size: int = 1,
         graph_level: GraphLevel = "procedure",
+        cancellation: CancellationToken | None = None,
+        progress: PhaseRecorder | None = None,
     ) -> MarkupDocument:
+        raise_if_cancelled(cancellation)
         procedures: list[Procedure] = []
         procedure_meta: dict[str, dict[str, object]] = {}
         team_labels: set[str] = set()
@@ -52,19 +57,26 @@ class BuildTeamProcedureGraph:
         merge_chain_groups_by_proc: dict[str, tuple[tuple[str, ...], ...]] = {}
         merge_scope = merge_documents if merge_documents is not None else documents
         if merge_scope:
+            mark_phase(progress, "merge_services")
             merge_services, merge_service_keys = self._collect_merge_services(merge_scope)
             self._apply_service_colors(merge_services, merge_service_keys)
+            raise_if_cancelled(cancellation)
+            mark_phase(progress, "merge_nodes")
             merge_node_ids = self._resolve_merge_node_ids(
                 merge_scope,
                 merge_selected_markups=merge_selected_markups,
                 merge_node_min_chain_size=merge_node_min_chain_size,
             )
+            raise_if_cancelled(cancellation)
+            mark_phase(progress, "chain_groups")
             merge_chain_groups_by_proc = self._resolve_merge_chain_groups_by_proc(
                 merge_scope,
                 merge_selected_markups=merge_selected_markups,
                 merge_node_min_chain_size=merge_node_min_chain_size,
             )
+            raise_if_cancelled(cancellation)
 
+        mark_phase(progress, "collect_documents")
         if merge_selected_markups:
             (
                 procedure_payloads,
@@ -98,8 +110,10 @@ class BuildTeamProcedureGraph:
                 team_names.add(str(document.team_name))
 
         service_colors = self._apply_service_colors(procedure_services, service_keys)
+        raise_if_cancelled(cancellation)
 
         if merge_documents is not None and merge_selected_markups:
+            mark_phase(progress, "merge_documents")
             (
                 merge_payloads,
                 merge_order,
@@ -124,13 +138,16 @@ class BuildTeamProcedureGraph:
                             continue
                         procedure_payloads[proc_id] = dict(payload)
                         procedure_order.append(proc_id)
+            raise_if_cancelled(cancellation)
 
+        mark_phase(progress, "drop_intermediates")
         removed_proc_ids, procedure_graph = self._drop_intermediate_procedures(
             procedure_payloads,
             procedure_order,
             procedure_graph,
             merge_node_ids=merge_node_ids,
             source_proc_by_scoped=source_proc_by_scoped,
+            cancellation=cancellation,
         )
         if removed_proc_ids:
             procedure_order = [
@@ -140,6 +157,7 @@ class BuildTeamProcedureGraph:
                 procedure_payloads.pop(proc_id, None)
                 procedure_services.pop(proc_id, None)
 
+        mark_phase(progress, "assemble")
         for proc_id in procedure_order:
             payload = procedure_payloads[proc_id]
             procedures.append(Procedure.model_validate(payload))
@@ -237,6 +255,8 @@ class BuildTeamProcedureGraph:
             procedure_meta=procedure_meta,
         )
         if graph_level == "service":
+            raise_if_cancelled(cancellation)
+            mark_phase(progress, "service_graph")
             return self.build_service_graph_document(merged_document)
         return merged_document
 
@@ -251,6 +271,7 @@ class BuildTeamProcedureGraph:
         *,
         merge_node_ids: set[str],
         source_proc_by_scoped: dict[str, str] | None = None,
+        cancellation: CancellationToken | None = None,
     ) -> tuple[set[str], dict[str, list[str]]]:
         adjacency: dict[str, list[str]] = {
             source: list(dict.fromkeys(targets)) for source, targets in procedure_graph.items()
@@ -263,6 +284,7 @@ class BuildTeamProcedureGraph:
 
         removed: set[str] = set()
         while True:
+            raise_if_cancelled(cancellation)
             incoming_by_proc: dict[str, set[str]] = {proc_id: set() for proc_id in adjacency}
             for source, targets in adjacency.items():
                 for target in targets:
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import threading
+
+
+class OperationCancelledError(RuntimeError):
+    pass
+
+
+class CancellationToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelledError("Operation was cancelled.")
+
+
+def raise_if_cancelled(cancellation: CancellationToken | None) -> None:
+    if cancellation is not None:
+        cancellation.raise_if_cancelled()
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import re
 from collections import defaultdict
-from collections.abc import Iterable, Mapping
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 from domain.models import (
@@ -11,7 +11,6 @@ from domain.models import (
     END_TYPE_COLORS,
     END_TYPE_DEFAULT,
     END_TYPE_TURN_OUT,
-    METADATA_SCHEMA_VERSION,
     MarkupDocument,
     Procedure,
     merge_end_types,
@@ -26,6 +25,14 @@ _INLINE_TAG_RE = re.compile(
 Metadata = dict[str, Any]
 Element = Mapping[str, Any]
 
+_EMPTY_METADATA: Metadata = {}
+
+_BLOCK_TYPES = frozenset({"rectangle", "text"})
+_MARKER_TYPES = frozenset({"ellipse", "text"})
+_MARKER_ROLES = frozenset({"start_marker", "end_marker"})
+_BLOCK_GRAPH_EDGE_TYPES = frozenset({"block_graph", "block_graph_cycle"})
+_PROCEDURE_GRAPH_EDGE_TYPES = frozenset({"procedure_flow", "procedure_cycle"})
+
 
 @dataclass(frozen=True)
 class BlockCandidate:
@@ -44,16 +51,44 @@ class MarkerCandidate:
     return_to_parent: bool = False
 
 
+@dataclass(frozen=True)
+class ElementBucket:
+    elements: list[Element] = field(default_factory=list)
+    metadata: list[Metadata] = field(default_factory=list)
+
+    def __iter__(self) -> Iterator[tuple[Element, Metadata]]:
+        return zip(self.elements, self.metadata, strict=True)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def add(self, element: Element, meta: Metadata) -> None:
+        self.elements.append(element)
+        self.metadata.append(meta)
+
+
+@dataclass(frozen=True)
+class ElementBuckets:
+    frames: ElementBucket = field(default_factory=ElementBucket)
+    blocks: ElementBucket = field(default_factory=ElementBucket)
+    markers: ElementBucket = field(default_factory=ElementBucket)
+    labels: ElementBucket = field(default_factory=ElementBucket)
+    arrows: ElementBucket = field(default_factory=ElementBucket)
+    block_graph_arrows: ElementBucket = field(default_factory=ElementBucket)
+    procedure_graph_arrows: ElementBucket = field(default_factory=ElementBucket)
+    globals_meta: Metadata | None = None
+
+
 class ExcalidrawToMarkupConverter:
     def convert(self, document: Mapping[str, Any]) -> MarkupDocument:
-        elements: Iterable[Element] = document.get("elements", [])
-        frames, proc_names = self._collect_frames(elements)
-        blocks = self._collect_blocks(elements, frames)
-        block_initials = self._collect_block_initials(elements)
-        markers = self._collect_markers(elements, frames)
-        block_names = self._collect_block_names(elements, frames)
-
-        globals_meta = self._infer_globals(elements)
+        buckets = self._classify(document.get("elements", []))
+        frames, proc_names = self._collect_frames(buckets.frames)
+        blocks = self._collect_blocks(buckets.blocks, frames)
+        block_initials = self._collect_block_initials(buckets.blocks)
+        markers = self._collect_markers(buckets.markers, frames)
+        block_names = self._collect_block_names(buckets.labels, frames)
+
+        globals_meta = self._infer_globals(buckets.globals_meta)
         start_map: dict[str, set[str]] = defaultdict(set)
         end_map: dict[str, dict[str, str]] = defaultdict(dict)
         return_map: dict[str, set[str]] = defaultdict(set)
@@ -74,8 +109,7 @@ class ExcalidrawToMarkupConverter:
                 continue
             turn_out_sources[marker.procedure_id].add(marker.block_id)
 
-        for arrow in filter(self._is_arrow, elements):
-            meta = self._metadata(arrow)
+        for arrow, meta in buckets.arrows:
             raw_edge_type = meta.get("edge_type")
             edge_type = raw_edge_type if isinstance(raw_edge_type, str) else ""
             if not edge_type:
@@ -122,16 +156,18 @@ class ExcalidrawToMarkupConverter:
                     branch_map[procedure_id][source_block].add(target_block)
                 continue
 
-            if edge_type in {"block_graph", "block_graph_cycle"}:
+            if edge_type in _BLOCK_GRAPH_EDGE_TYPES:
                 continue
 
             text = arrow.get("text")
             if isinstance(text, str) and text.lower() == "branch" and source_block and target_block:
                 branch_map[procedure_id][source_block].add(target_block)
 
-        block_graph = self._collect_block_graph(elements, blocks)
+        block_graph = self._collect_block_graph(buckets.block_graph_arrows, blocks)
         if block_graph and turn_out_sources:
-            inferred_branches = self._branches_from_block_graph_arrows(elements, blocks, markers)
+            inferred_branches = self._branches_from_block_graph_arrows(
+                buckets.block_graph_arrows, blocks, markers
+            )
             if not inferred_branches:
                 inferred_branches = self._branches_from_block_graph(block_graph, blocks)
             for proc_id, sources in turn_out_sources.items():
@@ -144,7 +180,7 @@ class ExcalidrawToMarkupConverter:
         procedures = self._build_procedures(
             blocks, start_map, end_map, return_map, branch_map, frames, block_names, proc_names
         )
-        procedure_graph = self._collect_procedure_graph(elements, procedures)
+        procedure_graph = self._collect_procedure_graph(buckets.procedure_graph_arrows, procedures)
         if block_graph and not any(procedure_graph.values()):
             procedure_graph = self._infer_procedure_graph_from_block_graph(block_graph, procedures)
         return MarkupDocument(
@@ -161,13 +197,40 @@ class ExcalidrawToMarkupConverter:
             block_graph_initials=block_initials,
         )
 
-    def _collect_frames(self, elements: Iterable[Element]) -> tuple[dict[str, str], dict[str, str]]:
-        frames: dict[str, str] = {}
-        proc_names: dict[str, str] = {}
+    def _classify(self, elements: Iterable[Element]) -> ElementBuckets:
+        buckets = ElementBuckets()
+        globals_meta: Metadata | None = None
         for element in elements:
-            if element.get("type") != "frame":
-                continue
             meta = self._metadata(element)
+            if globals_meta is None and meta.get("markup_type"):
+                globals_meta = meta
+            element_type = element.get("type")
+            if element_type == "arrow":
+                buckets.arrows.add(element, meta)
+                edge_type = meta.get("edge_type")
+                if edge_type in _BLOCK_GRAPH_EDGE_TYPES:
+                    buckets.block_graph_arrows.add(element, meta)
+                elif edge_type in _PROCEDURE_GRAPH_EDGE_TYPES:
+                    buckets.procedure_graph_arrows.add(element, meta)
+                continue
+            if element_type == "frame":
+                buckets.frames.add(element, meta)
+                continue
+            if element_type in _BLOCK_TYPES:
+                buckets.blocks.add(element, meta)
+            role = meta.get("role")
+            if element_type in _MARKER_TYPES and role in _MARKER_ROLES:
+                buckets.markers.add(element, meta)
+            elif element_type == "text" and role == "block_label":
+                buckets.labels.add(element, meta)
+        return replace(buckets, globals_meta=globals_meta)
+
+    def _collect_frames(
+        self, frame_elements: ElementBucket
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        frames: dict[str, str] = {}
+        proc_names: dict[str, str] = {}
+        for element, meta in frame_elements:
             meta_proc = meta.get("procedure_id")
             name_proc = element.get("name")
             procedure_id = meta_proc if isinstance(meta_proc, str) else None
@@ -188,14 +251,11 @@ class ExcalidrawToMarkupConverter:
 
     def _collect_blocks(
         self,
-        elements: Iterable[Element],
+        block_elements: ElementBucket,
         frames: dict[str, str],
     ) -> dict[str, BlockCandidate]:
         blocks: dict[str, BlockCandidate] = {}
-        for element in elements:
-            if element.get("type") not in {"rectangle", "text"}:
-                continue
-            meta = self._metadata(element)
+        for element, meta in block_elements:
             frame_id = element.get("frameId")
             frame_key = frame_id if isinstance(frame_id, str) else ""
             meta_proc = meta.get("procedure_id")
@@ -217,12 +277,9 @@ class ExcalidrawToMarkupConverter:
             )
         return blocks
 
-    def _collect_block_initials(self, elements: Iterable[Element]) -> set[str]:
+    def _collect_block_initials(self, block_elements: ElementBucket) -> set[str]:
         initials: set[str] = set()
-        for element in elements:
-            if element.get("type") not in {"rectangle", "text"}:
-                continue
-            meta = self._metadata(element)
+        for _, meta in block_elements:
             block_id = meta.get("block_id")
             if not isinstance(block_id, str):
                 continue
@@ -232,17 +289,12 @@ class ExcalidrawToMarkupConverter:
 
     def _collect_markers(
         self,
-        elements: Iterable[Element],
+        marker_elements: ElementBucket,
         frames: dict[str, str],
     ) -> dict[str, MarkerCandidate]:
         markers: dict[str, MarkerCandidate] = {}
-        for element in elements:
-            if element.get("type") not in {"ellipse", "text"}:
-                continue
-            meta = self._metadata(element)
-            role = meta.get("role")
-            if role not in {"start_marker", "end_marker"}:
-                continue
+        for element, meta in marker_elements:
+            role = meta["role"]
             frame_id = element.get("frameId")
             frame_key = frame_id if isinstance(frame_id, str) else ""
             meta_proc = meta.get("procedure_id")
@@ -269,16 +321,11 @@ class ExcalidrawToMarkupConverter:
 
     def _collect_block_names(
         self,
-        elements: Iterable[Element],
+        label_elements: ElementBucket,
         frames: dict[str, str],
     ) -> dict[str, dict[str, str]]:
         names: dict[str, dict[str, str]] = defaultdict(dict)
-        for element in elements:
-            if element.get("type") != "text":
-                continue
-            meta = self._metadata(element)
-            if meta.get("role") != "block_label":
-                continue
+        for element, meta in label_elements:
             frame_id = element.get("frameId")
             frame_key = frame_id if isinstance(frame_id, str) else ""
             meta_proc = meta.get("procedure_id")
@@ -342,15 +389,10 @@ class ExcalidrawToMarkupConverter:
         return procedures
 
     def _collect_procedure_graph(
-        self, elements: Iterable[Element], procedures: list[Procedure]
+        self, arrows: ElementBucket, procedures: list[Procedure]
     ) -> dict[str, list[str]]:
         graph: dict[str, list[str]] = {procedure.procedure_id: [] for procedure in procedures}
-        for element in elements:
-            if not self._is_arrow(element):
-                continue
-            meta = self._metadata(element)
-            if meta.get("edge_type") not in {"procedure_flow", "procedure_cycle"}:
-                continue
+        for _, meta in arrows:
             source = meta.get("procedure_id")
             target = meta.get("target_procedure_id")
             if not isinstance(source, str) or not isinstance(target, str):
@@ -363,16 +405,11 @@ class ExcalidrawToMarkupConverter:
 
     def _collect_block_graph(
         self,
-        elements: Iterable[Element],
+        arrows: ElementBucket,
         blocks: dict[str, BlockCandidate],
     ) -> dict[str, list[str]]:
         graph: dict[str, list[str]] = {}
-        for element in elements:
-            if not self._is_arrow(element):
-                continue
-            meta = self._metadata(element)
-            if meta.get("edge_type") not in {"block_graph", "block_graph_cycle"}:
-                continue
+        for element, meta in arrows:
             source = meta.get("source_block_id")
             target = meta.get("target_block_id")
             if not isinstance(source, str) or not isinstance(target, str):
@@ -408,18 +445,12 @@ class ExcalidrawToMarkupConverter:
 
     def _branches_from_block_graph_arrows(
         self,
-        elements: Iterable[Element],
+        arrows: ElementBucket,
         blocks: Mapping[str, BlockCandidate],
         markers: Mapping[str, MarkerCandidate],
     ) -> dict[str, dict[str, set[str]]]:
         branches: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
-        for element in elements:
-            if not self._is_arrow(element):
-                continue
-            meta = self._metadata(element)
-            if meta.get("edge_type") not in {"block_graph", "block_graph_cycle"}:
-                continue
-
+        for element, meta in arrows:
             source_block = meta.get("source_block_id")
             target_block = meta.get("target_block_id")
             if not isinstance(source_block, str) or not isinstance(target_block, str):
@@ -436,7 +467,7 @@ class ExcalidrawToMarkupConverter:
 
             source_proc = meta.get("procedure_id")
             if not isinstance(source_proc, str) or not source_proc:
-                source_proc = self._infer_procedure_id(meta, dict(blocks), dict(markers), element)
+                source_proc = self._infer_procedure_id(meta, blocks, markers, element)
             if not source_proc:
                 continue
             branches[source_proc][source_block].add(target_block)
@@ -509,17 +540,11 @@ class ExcalidrawToMarkupConverter:
     def _metadata(self, element: Element) -> Metadata:
         custom = element.get("customData")
         if not isinstance(custom, dict):
-            return {}
+            return _EMPTY_METADATA
         meta_raw = custom.get(CUSTOM_DATA_KEY)
         if not isinstance(meta_raw, dict):
-            return {}
-        schema_version = meta_raw.get("schema_version")
-        if schema_version and str(schema_version) != METADATA_SCHEMA_VERSION:
-            return dict(meta_raw)
-        return dict(meta_raw)
-
-    def _is_arrow(self, element: Element) -> bool:
-        return element.get("type") == "arrow"
+            return _EMPTY_METADATA
+        return meta_raw
 
     def _block_from_binding(
         self, binding: Mapping[str, Any], blocks: Mapping[str, BlockCandidate]
@@ -533,8 +558,8 @@ class ExcalidrawToMarkupConverter:
     def _infer_procedure_id(
         self,
         metadata: Mapping[str, Any],
-        blocks: dict[str, BlockCandidate],
-        markers: dict[str, MarkerCandidate],
+        blocks: Mapping[str, BlockCandidate],
+        markers: Mapping[str, MarkerCandidate],
         arrow: Element,
     ) -> str:
         procedure_id = metadata.get("procedure_id")
@@ -587,20 +612,17 @@ class ExcalidrawToMarkupConverter:
         start_id = start_binding.get("elementId")
         return bool(isinstance(start_id, str) and start_id not in markers)
 
-    def _infer_globals(self, elements: Iterable[Element]) -> dict[str, Any]:
-        for element in elements:
-            meta = self._metadata(element)
-            markup_type = meta.get("markup_type")
-            if markup_type:
-                return {
-                    "markup_type": str(markup_type),
-                    "consistent": bool(meta.get("consistent", True)),
-                    "finedog_unit_id": self._normalize_meta_str(meta.get("finedog_unit_id")),
-                    "service_name": self._normalize_meta_str(meta.get("service_name")),
-                    "criticality_level": self._normalize_meta_str(meta.get("criticality_level")),
-                    "team_id": self._normalize_team_id(meta.get("team_id")),
-                    "team_name": self._normalize_meta_str(meta.get("team_name")),
-                }
+    def _infer_globals(self, meta: Metadata | None) -> dict[str, Any]:
+        if meta is not None:
+            return {
+                "markup_type": str(meta["markup_type"]),
+                "consistent": bool(meta.get("consistent", True)),
+                "finedog_unit_id": self._normalize_meta_str(meta.get("finedog_unit_id")),
+                "service_name": self._normalize_meta_str(meta.get("service_name")),
+                "criticality_level": self._normalize_meta_str(meta.get("criticality_level")),
+                "team_id": self._normalize_team_id(meta.get("team_id")),
+                "team_name": self._normalize_meta_str(meta.get("team_name")),
+            }
         return {
             "markup_type": "service",
             "consistent": True,
@@ -716,8 +738,8 @@ class ExcalidrawToMarkupConverter:
             excalidraw_tags,
         ):
             tags.extend(self._split_tags(source))
-        for field in ("text", "name"):
-            value = element.get(field)
+        for key in ("text", "name"):
+            value = element.get(key)
             if isinstance(value, str):
                 tags.extend(self._extract_inline_tags(value))
         end_type: str | None = None
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import random
 import uuid
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -29,6 +28,8 @@ from domain.ports.layout import LayoutEngine
 from domain.services.block_graph_resolution import (
     resolve_block_graph_edges,
 )
+from domain.services.graph_kernel import IndexedGraph
+from domain.services.text_layout import fit_text
 
 Metadata = dict[str, Any]
 Element = dict[str, Any]
@@ -49,14 +50,31 @@ class ElementRegistry:
             self.index[element_id] = element
 
 
+@dataclass(frozen=True)
+class PreparedMarkup:
+    document: MarkupDocument
+    plan: LayoutPlan
+    base_metadata: Metadata
+    display_markup_type: str
+    proc_name_lookup: dict[str, str]
+    end_block_type_lookup: dict[tuple[str, str], str]
+    return_block_lookup: set[tuple[str, str]]
+    block_name_lookup: dict[tuple[str, str], str]
+    source_procedure_ids: dict[str, str]
+    start_label_index: dict[tuple[str, str], int]
+    branch_cycle_edges: dict[str, set[tuple[str, str]]]
+
+
 class MarkupToDiagramConverter(ABC):
     def __init__(self, layout_engine: LayoutEngine) -> None:
         self.layout_engine = layout_engine
         self.namespace = uuid.uuid5(uuid.NAMESPACE_DNS, "cjm-ui-convertor")
 
     def convert(self, document: MarkupDocument) -> Any:
+        return self.convert_prepared(self.prepare(document))
+
+    def prepare(self, document: MarkupDocument) -> PreparedMarkup:
         plan = self.layout_engine.build_plan(document)
-        registry = ElementRegistry()
         base_metadata = self._base_metadata(document)
         display_markup_type = str(
             base_metadata.get("display_markup_type", document.markup_type) or ""
@@ -67,9 +85,6 @@ class MarkupToDiagramConverter(ABC):
             for proc in document.procedures
             if proc.procedure_name
         }
-        frame_ids = self._build_frames(plan.frames, registry, base_metadata, proc_name_lookup)
-        self._build_separators(plan.separators, registry, base_metadata)
-        self._build_scenarios(plan.scenarios, registry, base_metadata)
         included_procs = {frame.procedure_id for frame in plan.frames}
         end_block_type_lookup = {
             (proc.procedure_id, block_id): proc.end_block_types.get(block_id, END_TYPE_DEFAULT)
@@ -96,18 +111,6 @@ class MarkupToDiagramConverter(ABC):
             if isinstance(source_proc_id, str) and source_proc_id:
                 source_procedure_ids[proc_id] = source_proc_id
 
-        blocks = self._build_blocks(
-            plan.blocks,
-            frame_ids,
-            registry,
-            base_metadata,
-            end_block_type_lookup,
-            block_name_lookup,
-            document.block_graph_initials,
-            return_block_lookup,
-            source_procedure_ids=source_procedure_ids,
-        )
-
         start_label_index: dict[tuple[str, str], int] = {}
         start_blocks_global = [
             (proc.procedure_id, blk_id)
@@ -117,14 +120,58 @@ class MarkupToDiagramConverter(ABC):
         ]
         for idx, (proc_id, blk_id) in enumerate(start_blocks_global, start=1):
             start_label_index[(proc_id, blk_id)] = idx
+
+        branch_cycle_edges: dict[str, set[tuple[str, str]]] = {}
+        if not document.block_graph:
+            branch_cycle_edges = {
+                procedure.procedure_id: self._edges_in_cycles(procedure.branches)
+                for procedure in document.procedures
+            }
+
+        return PreparedMarkup(
+            document=document,
+            plan=plan,
+            base_metadata=base_metadata,
+            display_markup_type=display_markup_type,
+            proc_name_lookup=proc_name_lookup,
+            end_block_type_lookup=end_block_type_lookup,
+            return_block_lookup=return_block_lookup,
+            block_name_lookup=block_name_lookup,
+            source_procedure_ids=source_procedure_ids,
+            start_label_index=start_label_index,
+            branch_cycle_edges=branch_cycle_edges,
+        )
+
+    def convert_prepared(self, prepared: PreparedMarkup) -> Any:
+        document = prepared.document
+        plan = prepared.plan
+        base_metadata = prepared.base_metadata
+        registry = ElementRegistry()
+
+        frame_ids = self._build_frames(
+            plan.frames, registry, base_metadata, prepared.proc_name_lookup
+        )
+        self._build_separators(plan.separators, registry, base_metadata)
+        self._build_scenarios(plan.scenarios, registry, base_metadata)
+        blocks = self._build_blocks(
+            plan.blocks,
+            frame_ids,
+            registry,
+            base_metadata,
+            prepared.end_block_type_lookup,
+            prepared.block_name_lookup,
+            document.block_graph_initials,
+            prepared.return_block_lookup,
+            source_procedure_ids=prepared.source_procedure_ids,
+        )
         markers = self._build_markers(
             plan.markers,
             frame_ids,
             registry,
             base_metadata,
-            start_label_index,
-            end_block_type_lookup,
-            return_block_lookup,
+            prepared.start_label_index,
+            prepared.end_block_type_lookup,
+            prepared.return_block_lookup,
         )
 
         self._build_start_edges(document, blocks, markers, registry, base_metadata)
@@ -134,10 +181,16 @@ class MarkupToDiagramConverter(ABC):
             markers,
             registry,
             base_metadata,
-            end_block_type_lookup,
-            return_block_lookup,
+            prepared.end_block_type_lookup,
+            prepared.return_block_lookup,
+        )
+        self._build_branch_edges(
+            document,
+            blocks,
+            registry,
+            base_metadata,
+            cycle_edges_by_proc=prepared.branch_cycle_edges,
         )
-        self._build_branch_edges(document, blocks, registry, base_metadata)
         self._build_procedure_flow_edges(
             document, plan.frames, frame_ids, registry, base_metadata, blocks
         )
@@ -146,7 +199,7 @@ class MarkupToDiagramConverter(ABC):
             registry,
             base_metadata,
             document.service_name,
-            display_markup_type,
+            prepared.display_markup_type,
         )
         self._center_on_first_frame(plan, registry.elements)
         self._post_process_elements(registry.elements)
@@ -1087,13 +1140,15 @@ class MarkupToDiagramConverter(ABC):
         blocks: dict[tuple[str, str], BlockPlacement],
         registry: ElementRegistry,
         base_metadata: Metadata,
+        cycle_edges_by_proc: dict[str, set[tuple[str, str]]] | None = None,
     ) -> None:
         if document.block_graph:
             return
-        cycle_edges_by_proc: dict[str, set[tuple[str, str]]] = {
-            procedure.procedure_id: self._edges_in_cycles(procedure.branches)
-            for procedure in document.procedures
-        }
+        if cycle_edges_by_proc is None:
+            cycle_edges_by_proc = {
+                procedure.procedure_id: self._edges_in_cycles(procedure.branches)
+                for procedure in document.procedures
+            }
         branch_offsets: dict[tuple[str, str], list[float]] = {}
         for procedure in document.procedures:
             for source_block, targets in procedure.branches.items():
@@ -1436,70 +1491,15 @@ class MarkupToDiagramConverter(ABC):
         return [[0.0, 0.0], [0.0, elbow_offset], [dx, elbow_offset], [dx, dy]]
 
     def _edges_in_cycles(self, adjacency: dict[str, list[str]]) -> set[tuple[str, str]]:
-        normalized: dict[str, list[str]] = {
-            node: list(children) for node, children in adjacency.items()
+        graph = IndexedGraph.from_adjacency(adjacency)
+        component_ids = graph.component_ids()
+        return {
+            (source, target)
+            for source, targets in adjacency.items()
+            for target in targets
+            if component_ids[graph.index[source]] == component_ids[graph.index[target]]
         }
 
-        nodes = set(normalized.keys())
-        for children in normalized.values():
-            nodes.update(children)
-        if not nodes:
-            return set()
-
-        index = 0
-        indices: dict[str, int] = {}
-        lowlinks: dict[str, int] = {}
-        stack: list[str] = []
-        on_stack: set[str] = set()
-        components: list[list[str]] = []
-
-        def strongconnect(node: str) -> None:
-            nonlocal index
-            indices[node] = index
-            lowlinks[node] = index
-            index += 1
-            stack.append(node)
-            on_stack.add(node)
-
-            for child in normalized.get(node, []):
-                if child not in indices:
-                    strongconnect(child)
-                    lowlinks[node] = min(lowlinks[node], lowlinks[child])
-                elif child in on_stack:
-                    lowlinks[node] = min(lowlinks[node], indices[child])
-
-            if lowlinks[node] == indices[node]:
-                component: list[str] = []
-                while True:
-                    current = stack.pop()
-                    on_stack.remove(current)
-                    component.append(current)
-                    if current == node:
-                        break
-                components.append(component)
-
-        for node in nodes:
-            if node not in indices:
-                strongconnect(node)
-
-        component_id: dict[str, int] = {}
-        component_sizes: dict[int, int] = {}
-        for idx, component in enumerate(components):
-            component_sizes[idx] = len(component)
-            for node in component:
-                component_id[node] = idx
-
-        cycle_edges: set[tuple[str, str]] = set()
-        for source, targets in normalized.items():
-            for target in targets:
-                src_id = component_id.get(source)
-                tgt_id = component_id.get(target)
-                if src_id is None or tgt_id is None or src_id != tgt_id:
-                    continue
-                if component_sizes.get(src_id, 0) > 1 or source == target:
-                    cycle_edges.add((source, target))
-        return cycle_edges
-
     def _plan_bounds(self, plan: LayoutPlan) -> tuple[float, float, float, float] | None:
         min_x = float("inf")
         min_y = float("inf")
@@ -1585,63 +1585,13 @@ class MarkupToDiagramConverter(ABC):
         min_size: float,
         max_size: float,
     ) -> tuple[str, float, float]:
-        if not text.strip():
-            size = max_size
-            height = min(max_height, size * 1.35)
-            return text, size, height
-
-        words = text.split()
-        width_factor = 0.6
-        line_height = 1.35
-
-        def wrap_words(max_chars: int) -> list[str]:
-            lines: list[str] = []
-            current: list[str] = []
-            count = 0
-            for word in words:
-                if not current:
-                    if len(word) <= max_chars:
-                        current = [word]
-                        count = len(word)
-                    else:
-                        for idx in range(0, len(word), max_chars):
-                            chunk = word[idx : idx + max_chars]
-                            if current:
-                                lines.append(" ".join(current))
-                            current = [chunk]
-                            count = len(chunk)
-                    continue
-                if count + 1 + len(word) <= max_chars:
-                    current.append(word)
-                    count += 1 + len(word)
-                else:
-                    lines.append(" ".join(current))
-                    current = [word]
-                    count = len(word)
-            if current:
-                lines.append(" ".join(current))
-            return lines
-
-        start = int(max_size)
-        end = int(min_size)
-        for size in range(start, end - 1, -1):
-            max_chars = max(1, int(max_width / (size * width_factor)))
-            lines = wrap_words(max_chars)
-            height_needed = len(lines) * size * line_height
-            if height_needed <= max_height:
-                return "\n".join(lines), float(size), min(max_height, height_needed)
-
-        size = max(min_size, 1.0)
-        max_chars = max(1, int(max_width / (size * width_factor)))
-        lines = wrap_words(max_chars)
-        height_needed = len(lines) * size * line_height
-        return "\n".join(lines), size, min(max_height, height_needed)
+        return fit_text(text, max_width, max_height, min_size, max_size)
 
     def _stable_id(self, *parts: str) -> str:
         return str(uuid.uuid5(self.namespace, "|".join(parts)))
 
-    def _rand_seed(self) -> int:
-        return random.randint(1, 2**31 - 1)
+    def _stable_seed(self, label: str) -> int:
+        return int(uuid.uuid5(self.namespace, label).int % (2**31 - 1))
 
     def _with_base_metadata(self, metadata: Metadata, base: Metadata) -> Metadata:
         merged = dict(base)
@@ -1806,3 +1756,13 @@ class MarkupToDiagramConverter(ABC):
         end_arrowhead: str | None = None,
     ) -> Element:
         raise NotImplementedError
+
+
+def convert_with_shared_layout(
+    document: MarkupDocument,
+    converters: Sequence[MarkupToDiagramConverter],
+) -> list[Any]:
+    if not converters:
+        return []
+    prepared = converters[0].prepare(document)
+    return [converter.convert_prepared(prepared) for converter in converters]
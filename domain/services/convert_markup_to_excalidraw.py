@@ -137,9 +137,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
                 "backgroundColor": background_color,
                 "fillStyle": "solid",
                 "strokeStyle": "dashed" if is_intermediate else "solid",
-                "seed": self._rand_seed(),
+                "seed": self._stable_seed(element_id),
                 "version": 1,
-                "versionNonce": self._rand_seed(),
+                "versionNonce": self._stable_seed(f"{element_id}:nonce"),
                 "nameFontSize": 28,
             },
             metadata=metadata,
@@ -163,9 +163,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
             "strokeColor": stroke_color or "#1e1e1e",
             "backgroundColor": background_color or "#cce5ff",
             "fillStyle": fill_style or "hachure",
-            "seed": self._rand_seed(),
+            "seed": self._stable_seed(element_id),
             "version": 1,
-            "versionNonce": self._rand_seed(),
+            "versionNonce": self._stable_seed(f"{element_id}:nonce"),
             "strokeStyle": stroke_style or "solid",
             "boundElements": [],
         }
@@ -203,9 +203,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
                 "backgroundColor": "#f7f3ea",
                 "fillStyle": "solid",
                 "roughness": 0,
-                "seed": self._rand_seed(),
+                "seed": self._stable_seed(element_id),
                 "version": 1,
-                "versionNonce": self._rand_seed(),
+                "versionNonce": self._stable_seed(f"{element_id}:nonce"),
                 "roundness": {"type": 3},
             },
             metadata=metadata,
@@ -233,9 +233,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
                 "backgroundColor": background_color or "#e9f0fb",
                 "fillStyle": "solid",
                 "roughness": 0,
-                "seed": self._rand_seed(),
+                "seed": self._stable_seed(element_id),
                 "version": 1,
-                "versionNonce": self._rand_seed(),
+                "versionNonce": self._stable_seed(f"{element_id}:nonce"),
                 "roundness": {"type": 3},
             },
             metadata=metadata,
@@ -261,9 +261,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
                 "backgroundColor": "#eef3ff",
                 "fillStyle": "solid",
                 "roughness": 0,
-                "seed": self._rand_seed(),
+                "seed": self._stable_seed(element_id),
                 "version": 1,
-                "versionNonce": self._rand_seed(),
+                "versionNonce": self._stable_seed(f"{element_id}:nonce"),
                 "roundness": {"type": 3},
                 "strokeWidth": 2,
             },
@@ -297,9 +297,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
                 "fillStyle": "solid",
                 "strokeStyle": stroke_style or "solid",
                 "strokeWidth": stroke_width if stroke_width is not None else 1,
-                "seed": self._rand_seed(),
+                "seed": self._stable_seed(element_id),
                 "version": 1,
-                "versionNonce": self._rand_seed(),
+                "versionNonce": self._stable_seed(f"{element_id}:nonce"),
             },
             metadata=metadata,
         )
@@ -334,9 +334,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
             "groupIds": group_ids or [],
             "frameId": None,
             "roundness": None,
-            "seed": self._rand_seed(),
+            "seed": self._stable_seed(element_id),
             "version": 1,
-            "versionNonce": self._rand_seed(),
+            "versionNonce": self._stable_seed(f"{element_id}:nonce"),
             "isDeleted": False,
             "boundElements": [],
             "locked": False,
@@ -401,9 +401,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
             "groupIds": group_ids or [],
             "frameId": frame_id,
             "roundness": None,
-            "seed": self._rand_seed(),
+            "seed": self._stable_seed(element_id),
             "version": 1,
-            "versionNonce": self._rand_seed(),
+            "versionNonce": self._stable_seed(f"{element_id}:nonce"),
             "isDeleted": False,
             "boundElements": [],
             "locked": False,
@@ -449,9 +449,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
             "opacity": 100,
             "groupIds": group_ids or [],
             "roundness": None,
-            "seed": self._rand_seed(),
+            "seed": self._stable_seed(element_id),
             "version": 1,
-            "versionNonce": self._rand_seed(),
+            "versionNonce": self._stable_seed(f"{element_id}:nonce"),
             "isDeleted": False,
             "boundElements": [],
             "locked": False,
@@ -516,9 +516,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
             "opacity": 100,
             "groupIds": [],
             "roundness": roundness,
-            "seed": self._rand_seed(),
+            "seed": self._stable_seed(arrow_id),
             "version": 1,
-            "versionNonce": self._rand_seed(),
+            "versionNonce": self._stable_seed(f"{arrow_id}:nonce"),
             "isDeleted": False,
             "boundElements": [],
             "locked": False,
@@ -565,9 +565,9 @@ class MarkupToExcalidrawConverter(MarkupToDiagramConverter):
             "opacity": 100,
             "groupIds": group_ids or [],
             "roundness": None,
-            "seed": self._rand_seed(),
+            "seed": self._stable_seed(element_id),
             "version": 1,
-            "versionNonce": self._rand_seed(),
+            "versionNonce": self._stable_seed(f"{element_id}:nonce"),
             "isDeleted": False,
             "boundElements": [],
             "locked": False,
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import html
 import math
-import time
 import uuid
 from typing import Any, cast
 
@@ -19,8 +18,10 @@ from domain.services.convert_markup_base import (
     Element,
     MarkupToDiagramConverter,
     Metadata,
+    PreparedMarkup,
 )
 from domain.services.excalidraw_links import ExcalidrawLinkTemplates, ensure_unidraw_links
+from domain.services.text_layout import fit_text, text_width
 
 _DEFAULT_TEXT_FONT_FAMILY = "Caveat, Segoe UI Emoji"
 _DEFAULT_SHAPE_FONT_FAMILY = "Neue Haas Unica, Segoe UI Emoji"
@@ -56,19 +57,28 @@ class MarkupToUnidrawConverter(MarkupToDiagramConverter):
         self,
         layout_engine: LayoutEngine,
         link_templates: ExcalidrawLinkTemplates | None = None,
+        timestamp_ms: int = 0,
     ) -> None:
         super().__init__(layout_engine)
-        self._timestamp_ms = 0
+        self._timestamp_ms = timestamp_ms
+        self._element_timestamp_ms = timestamp_ms
         self._z_index = 0
         self._created_by = str(uuid.uuid5(self.namespace, "unidraw-user"))
         self._element_bounds: dict[str, tuple[Point, Size]] = {}
         self.link_templates = link_templates
 
-    def convert(self, document: MarkupDocument) -> UnidrawDocument:
-        self._timestamp_ms = int(time.time() * 1000)
+    def convert(
+        self, document: MarkupDocument, *, timestamp_ms: int | None = None
+    ) -> UnidrawDocument:
+        return self.convert_prepared(self.prepare(document), timestamp_ms=timestamp_ms)
+
+    def convert_prepared(
+        self, prepared: PreparedMarkup, *, timestamp_ms: int | None = None
+    ) -> UnidrawDocument:
+        self._element_timestamp_ms = self._timestamp_ms if timestamp_ms is None else timestamp_ms
         self._z_index = 0
         self._element_bounds = {}
-        return cast(UnidrawDocument, super().convert(document))
+        return cast(UnidrawDocument, super().convert_prepared(prepared))
 
     def _build_document(
         self, elements: list[Element], app_state: dict[str, Any]
@@ -420,55 +430,7 @@ class MarkupToUnidrawConverter(MarkupToDiagramConverter):
         width_factor: float,
         line_height: float,
     ) -> tuple[str, float, float]:
-        if not text.strip():
-            size = max_size
-            height = min(max_height, size * line_height)
-            return text, size, height
-
-        words = text.split()
-
-        def wrap_words(max_chars: int) -> list[str]:
-            lines: list[str] = []
-            current: list[str] = []
-            count = 0
-            for word in words:
-                if not current:
-                    if len(word) <= max_chars:
-                        current = [word]
-                        count = len(word)
-                    else:
-                        for idx in range(0, len(word), max_chars):
-                            chunk = word[idx : idx + max_chars]
-                            if current:
-                                lines.append(" ".join(current))
-                            current = [chunk]
-                            count = len(chunk)
-                    continue
-                if count + 1 + len(word) <= max_chars:
-                    current.append(word)
-                    count += 1 + len(word)
-                else:
-                    lines.append(" ".join(current))
-                    current = [word]
-                    count = len(word)
-            if current:
-                lines.append(" ".join(current))
-            return lines
-
-        start = int(max_size)
-        end = int(min_size)
-        for size in range(start, end - 1, -1):
-            max_chars = max(1, int(max_width / (size * width_factor)))
-            lines = wrap_words(max_chars)
-            height_needed = len(lines) * size * line_height
-            if height_needed <= max_height:
-                return "\n".join(lines), float(size), min(max_height, height_needed)
-
-        size = max(min_size, 1.0)
-        max_chars = max(1, int(max_width / (size * width_factor)))
-        lines = wrap_words(max_chars)
-        height_needed = len(lines) * size * line_height
-        return "\n".join(lines), size, min(max_height, height_needed)
+        return fit_text(text, max_width, max_height, min_size, max_size, width_factor, line_height)
 
     def _text_width(
         self,
@@ -477,15 +439,7 @@ class MarkupToUnidrawConverter(MarkupToDiagramConverter):
         max_width: float | None,
         width_factor: float,
     ) -> float:
-        lines = content.splitlines() if content else []
-        if not lines:
-            width = max_width if max_width is not None else 1.0
-            return max(1.0, width)
-        max_len = max(len(line) for line in lines)
-        width = max_len * font_size * width_factor
-        if max_width is not None:
-            width = min(width, max_width)
-        return max(1.0, width)
+        return text_width(content, font_size, max_width, width_factor)
 
     def _line_element(
         self,
@@ -611,9 +565,13 @@ class MarkupToUnidrawConverter(MarkupToDiagramConverter):
             "position": {"x": position.x, "y": position.y},
             "size": {"width": size.width, "height": size.height},
             "version": 1,
-            "versionNonce": (version_nonce if version_nonce is not None else self._rand_seed()),
-            "createdAt": self._timestamp_ms,
-            "updatedAt": self._timestamp_ms,
+            "versionNonce": (
+                version_nonce
+                if version_nonce is not None
+                else self._stable_seed(f"{element_id}:nonce")
+            ),
+            "createdAt": self._element_timestamp_ms,
+            "updatedAt": self._element_timestamp_ms,
             "createdBy": self._created_by,
             "alpha": _UNIDRAW_ALPHA,
             "zIndex": z_index if z_index is not None else computed_z,
@@ -211,7 +211,10 @@ class ProcedureGraphToUnidrawConverter(ProcedureGraphConverterMixin, MarkupToUni
                 self._apply_service_zone_label_style(label_element)
             registry.add(label_element)
 
-    def convert(self, document: MarkupDocument) -> UnidrawDocument:
+    def convert(
+        self, document: MarkupDocument, *, timestamp_ms: int | None = None
+    ) -> UnidrawDocument:
+        self._element_timestamp_ms = self._timestamp_ms if timestamp_ms is None else timestamp_ms
         return cast(UnidrawDocument, self._convert_procedure_graph(document))
 
     def _merge_key(self, metadata: dict[str, Any]) -> tuple[str, int] | None:
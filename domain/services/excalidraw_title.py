@@ -6,6 +6,7 @@ from typing import Any
 
 from domain.markup_type_labels import humanize_markup_type, humanize_markup_type_for_brackets
 from domain.models import CUSTOM_DATA_KEY
+from domain.services.text_layout import fit_text
 
 Element = dict[str, Any]
 Metadata = dict[str, Any]
@@ -298,57 +299,7 @@ class ExcalidrawTitleInjector:
         min_size: float,
         max_size: float,
     ) -> tuple[str, float, float]:
-        if not text.strip():
-            size = max_size
-            height = min(max_height, size * 1.35)
-            return text, size, height
-
-        words = text.split()
-        width_factor = 0.6
-        line_height = 1.35
-
-        def wrap_words(max_chars: int) -> list[str]:
-            lines: list[str] = []
-            current: list[str] = []
-            count = 0
-            for word in words:
-                if not current:
-                    if len(word) <= max_chars:
-                        current = [word]
-                        count = len(word)
-                    else:
-                        for idx in range(0, len(word), max_chars):
-                            chunk = word[idx : idx + max_chars]
-                            if current:
-                                lines.append(" ".join(current))
-                            current = [chunk]
-                            count = len(chunk)
-                    continue
-                if count + 1 + len(word) <= max_chars:
-                    current.append(word)
-                    count += 1 + len(word)
-                else:
-                    lines.append(" ".join(current))
-                    current = [word]
-                    count = len(word)
-            if current:
-                lines.append(" ".join(current))
-            return lines
-
-        start = int(max_size)
-        end = int(min_size)
-        for size in range(start, end - 1, -1):
-            max_chars = max(1, int(max_width / (size * width_factor)))
-            lines = wrap_words(max_chars)
-            height_needed = len(lines) * size * line_height
-            if height_needed <= max_height:
-                return "\n".join(lines), float(size), min(max_height, height_needed)
-
-        size = max(min_size, 1.0)
-        max_chars = max(1, int(max_width / (size * width_factor)))
-        lines = wrap_words(max_chars)
-        height_needed = len(lines) * size * line_height
-        return "\n".join(lines), size, min(max_height, height_needed)
+        return fit_text(text, max_width, max_height, min_size, max_size)
 
     def _line_element(
         self,
@@ -2,7 +2,14 @@ from __future__ import annotations
 
 from typing import Any
 
-from domain.models import CUSTOM_DATA_KEY
+from domain.models import CUSTOM_DATA_KEY, END_TYPE_DEFAULT, MarkupDocument
+from domain.services.block_graph_resolution import (
+    build_block_owner_index,
+    resolve_block_graph_edges,
+    resolve_owned_blocks,
+)
+from domain.services.graph_kernel import IndexedGraph
+from domain.services.graph_metrics import build_directed_graph
 
 _EDGE_TYPES = {"branch", "branch_cycle", "block_graph", "block_graph_cycle"}
 _BLOCK_GRAPH_EDGE_TYPES = {"block_graph", "block_graph_cycle"}
@@ -159,6 +166,163 @@ def extract_block_graph_view(scene_payload: dict[str, Any]) -> dict[str, Any]:
         nodes_by_id[target_node_id] = target_node
         edges.append(edge)
 
+    return _graph_payload(nodes_by_id, edges)
+
+
+def build_block_graph_view(document: MarkupDocument) -> dict[str, Any]:
+    block_graph_nodes = (
+        build_directed_graph(document.block_graph).vertices if document.block_graph else set()
+    )
+    owned_blocks_by_proc = resolve_owned_blocks(document, block_graph_nodes)
+    initials = set(document.block_graph_initials)
+    block_nodes_by_key: dict[tuple[str, str], dict[str, Any]] = {}
+    for procedure in document.procedures:
+        procedure_id = procedure.procedure_id
+        meta = document.procedure_meta.get(procedure_id, {})
+        source_procedure_id = _as_text(meta.get("source_procedure_id")) or procedure_id
+        return_block_ids = set(procedure.return_block_ids)
+        end_block_ids = set(procedure.end_block_ids)
+        for block_id in owned_blocks_by_proc.get(procedure_id, ()):
+            key = (procedure_id, block_id)
+            if key in block_nodes_by_key:
+                continue
+            returns_to_parent = block_id in return_block_ids
+            end_block_type = ""
+            if block_id in end_block_ids and not returns_to_parent:
+                end_block_type = procedure.end_block_types.get(block_id, END_TYPE_DEFAULT)
+            block_nodes_by_key[key] = {
+                "id": _node_id(procedure_id, block_id),
+                "procedure_id": procedure_id,
+                "source_procedure_id": source_procedure_id,
+                "block_id": block_id,
+                "label": procedure.block_id_to_block_name.get(block_id) or block_id,
+                "is_initial": block_id in initials,
+                "end_block_type": end_block_type,
+                "returns_to_parent": returns_to_parent,
+            }
+
+    if document.block_graph:
+        edges = _block_graph_edges(document, owned_blocks_by_proc, block_nodes_by_key)
+    else:
+        edges = _branch_edges(document, block_nodes_by_key)
+    nodes_by_id: dict[str, dict[str, Any]] = {}
+    for edge in edges:
+        for key in (
+            (edge["source_procedure_id"], edge["source_block_id"]),
+            (edge["target_procedure_id"], edge["target_block_id"]),
+        ):
+            node = block_nodes_by_key[key]
+            nodes_by_id[node["id"]] = node
+    return _graph_payload(nodes_by_id, edges)
+
+
+def _block_graph_edges(
+    document: MarkupDocument,
+    owned_blocks_by_proc: dict[str, set[str]],
+    block_nodes_by_key: dict[tuple[str, str], dict[str, Any]],
+) -> list[dict[str, Any]]:
+    owners_by_block = build_block_owner_index(document.procedures, owned_blocks_by_proc)
+    resolved = [
+        (
+            (edge.source_procedure_id, edge.source_block_id),
+            (edge.target_procedure_id, edge.target_block_id),
+        )
+        for edge in resolve_block_graph_edges(
+            document.block_graph, owners_by_block, document.procedure_graph
+        )
+    ]
+    resolved = [
+        (source, target)
+        for source, target in resolved
+        if source in block_nodes_by_key and target in block_nodes_by_key
+    ]
+    adjacency: dict[str, list[str]] = {}
+    for source, target in resolved:
+        adjacency.setdefault(_node_id(*source), []).append(_node_id(*target))
+    cycle_edges = _edges_in_cycles(adjacency)
+    initial_ids = sorted(node["id"] for node in block_nodes_by_key.values() if node["is_initial"])
+    graph = IndexedGraph.from_adjacency(adjacency, nodes=[*initial_ids, *sorted(adjacency)])
+    reverse_edges = {
+        (graph.node_ids[source], graph.node_ids[target]) for source, target in graph.back_edges()
+    }
+    edges: list[dict[str, Any]] = []
+    for source, target in resolved:
+        edge_key = (_node_id(*source), _node_id(*target))
+        is_cycle = edge_key in cycle_edges
+        edge_type = "block_graph_cycle" if is_cycle and edge_key in reverse_edges else "block_graph"
+        edges.append(_edge_payload(source, target, edge_type, is_cycle))
+    return edges
+
+
+def _branch_edges(
+    document: MarkupDocument,
+    block_nodes_by_key: dict[tuple[str, str], dict[str, Any]],
+) -> list[dict[str, Any]]:
+    owners_by_block: dict[str, list[str]] = {}
+    for procedure_id, block_id in block_nodes_by_key:
+        owners_by_block.setdefault(block_id, []).append(procedure_id)
+    edges: list[dict[str, Any]] = []
+    for procedure in document.procedures:
+        procedure_id = procedure.procedure_id
+        cycle_edges = _edges_in_cycles(procedure.branches)
+        for source_block_id, targets in procedure.branches.items():
+            if (procedure_id, source_block_id) not in block_nodes_by_key:
+                continue
+            for target_block_id in targets:
+                target_procedure_id = procedure_id
+                if (procedure_id, target_block_id) not in block_nodes_by_key:
+                    candidates = owners_by_block.get(target_block_id, [])
+                    if len(candidates) != 1:
+                        continue
+                    target_procedure_id = candidates[0]
+                is_cycle = (source_block_id, target_block_id) in cycle_edges
+                edges.append(
+                    _edge_payload(
+                        (procedure_id, source_block_id),
+                        (target_procedure_id, target_block_id),
+                        "branch_cycle" if is_cycle else "branch",
+                        is_cycle,
+                    )
+                )
+    return edges
+
+
+def _edges_in_cycles(adjacency: dict[str, list[str]]) -> set[tuple[str, str]]:
+    graph = IndexedGraph.from_adjacency(adjacency)
+    component_ids = graph.component_ids()
+    return {
+        (source, target)
+        for source, targets in adjacency.items()
+        for target in targets
+        if component_ids[graph.index[source]] == component_ids[graph.index[target]]
+    }
+
+
+def _edge_payload(
+    source: tuple[str, str],
+    target: tuple[str, str],
+    edge_type: str,
+    is_cycle: bool,
+) -> dict[str, Any]:
+    source_procedure_id, source_block_id = source
+    target_procedure_id, target_block_id = target
+    return {
+        "id": f"{source_procedure_id}::{source_block_id}->{target_procedure_id}::{target_block_id}:{edge_type}",
+        "source": _node_id(source_procedure_id, source_block_id),
+        "target": _node_id(target_procedure_id, target_block_id),
+        "source_procedure_id": source_procedure_id,
+        "target_procedure_id": target_procedure_id,
+        "source_block_id": source_block_id,
+        "target_block_id": target_block_id,
+        "edge_type": edge_type,
+        "is_cycle": is_cycle,
+    }
+
+
+def _graph_payload(
+    nodes_by_id: dict[str, dict[str, Any]],
+    edges: list[dict[str, Any]],
+) -> dict[str, Any]:
     if not edges:
         return _empty_graph_payload()
 
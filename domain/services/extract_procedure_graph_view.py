@@ -4,6 +4,7 @@ from collections.abc import Mapping
 from typing import Any
 
 from domain.models import MarkupDocument, is_completion_end_block, procedure_end_kind
+from domain.services.graph_kernel import IndexedGraph
 
 
 def extract_procedure_graph_view(document: MarkupDocument) -> dict[str, Any]:
@@ -43,17 +44,13 @@ def extract_procedure_graph_view(document: MarkupDocument) -> dict[str, Any]:
             }
         )
 
-    path_cache: dict[tuple[str, str], bool] = {}
+    graph = IndexedGraph.from_adjacency(adjacency)
+    component_ids = graph.component_ids()
     adjacency_sets = {source: set(targets) for source, targets in adjacency.items()}
     edges: list[dict[str, Any]] = []
     for source in sorted(adjacency):
         for target in adjacency.get(source, []):
-            is_cycle = source == target or _path_exists(
-                adjacency,
-                start=target,
-                goal=source,
-                cache=path_cache,
-            )
+            is_cycle = component_ids[graph.index[source]] == component_ids[graph.index[target]]
             is_reverse = _is_reverse_edge(source, target, adjacency_sets)
             edges.append(
                 {
@@ -187,36 +184,6 @@ def _normalize_adjacency(
     return adjacency
 
 
-def _path_exists(
-    adjacency: Mapping[str, list[str]],
-    *,
-    start: str,
-    goal: str,
-    cache: dict[tuple[str, str], bool],
-) -> bool:
-    cache_key = (start, goal)
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    stack = [start]
-    visited: set[str] = set()
-    while stack:
-        current = stack.pop()
-        if current == goal:
-            cache[cache_key] = True
-            return True
-        if current in visited:
-            continue
-        visited.add(current)
-        for next_node in adjacency.get(current, []):
-            if next_node not in visited:
-                stack.append(next_node)
-
-    cache[cache_key] = False
-    return False
-
-
 def _is_reverse_edge(
     source: str,
     target: str,
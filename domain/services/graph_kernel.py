@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class GraphAnalysis:
+    strong_components: list[list[int]]
+    cyclic_component_count: int
+    cycle: list[int] | None
+    weak_component_count: int
+
+
+class IndexedGraph:
+    __slots__ = ("_in_degrees", "index", "node_ids", "offsets", "targets")
+
+    def __init__(
+        self,
+        node_ids: list[str],
+        offsets: array[int],
+        targets: array[int],
+        index: dict[str, int] | None = None,
+    ) -> None:
+        self.node_ids = node_ids
+        self.index = (
+            index if index is not None else {node_id: idx for idx, node_id in enumerate(node_ids)}
+        )
+        self.offsets = offsets
+        self.targets = targets
+        self._in_degrees: list[int] | None = None
+
+    @classmethod
+    def from_adjacency(
+        cls,
+        adjacency: Mapping[str, Iterable[str]],
+        *,
+        nodes: Iterable[str] | None = None,
+        restrict_to_nodes: bool = False,
+        unique_targets: bool = True,
+        sort_key: Callable[[str], Any] | None = None,
+    ) -> IndexedGraph:
+        node_ids: list[str] = list(dict.fromkeys(nodes)) if nodes is not None else []
+        index = {node_id: idx for idx, node_id in enumerate(node_ids)}
+        edges: list[list[int]] = [[] for _ in node_ids]
+        for source, raw_targets in adjacency.items():
+            source_idx = index.get(source)
+            if source_idx is None:
+                if restrict_to_nodes:
+                    continue
+                source_idx = index[source] = len(node_ids)
+                node_ids.append(source)
+                edges.append([])
+            bucket = edges[source_idx]
+            for target in raw_targets:
+                target_idx = index.get(target)
+                if target_idx is None:
+                    if restrict_to_nodes:
+                        continue
+                    target_idx = index[target] = len(node_ids)
+                    node_ids.append(target)
+                    edges.append([])
+                elif unique_targets and target_idx in bucket:
+                    continue
+                bucket.append(target_idx)
+
+        offsets = array("i", [0])
+        targets = array("i")
+        for bucket in edges:
+            if sort_key is not None:
+                bucket.sort(key=lambda idx: sort_key(node_ids[idx]))
+            targets.extend(bucket)
+            offsets.append(len(targets))
+        return cls(node_ids, offsets, targets, index)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def successors(self, node: int) -> array[int]:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def has_edge(self, source: int, target: int) -> bool:
+        return target in self.successors(source)
+
+    def out_degrees(self) -> list[int]:
+        offsets = self.offsets
+        return [offsets[node + 1] - offsets[node] for node in range(len(self.node_ids))]
+
+    def in_degrees(self) -> list[int]:
+        if self._in_degrees is None:
+            degrees = [0] * len(self.node_ids)
+            for target in self.targets:
+                degrees[target] += 1
+            self._in_degrees = degrees
+        return list(self._in_degrees)
+
+    def ids(self, nodes: Iterable[int]) -> list[str]:
+        node_ids = self.node_ids
+        return [node_ids[node] for node in nodes]
+
+    def strongly_connected_components(self, order: Iterable[int] | None = None) -> list[list[int]]:
+        return self.analyze(order).strong_components
+
+    def analyze(self, order: Iterable[int] | None = None) -> GraphAnalysis:
+        node_count = len(self.node_ids)
+        offsets = self.offsets
+        targets = self.targets
+        indices = [-1] * node_count
+        lowlinks = [0] * node_count
+        on_stack = [False] * node_count
+        on_path = [False] * node_count
+        parents = list(range(node_count))
+        weak_component_count = node_count
+        stack: list[int] = []
+        components: list[list[int]] = []
+        cycle: list[int] | None = None
+        counter = 0
+        cursor = list(offsets)
+        for root in order if order is not None else range(node_count):
+            if indices[root] != -1:
+                continue
+            indices[root] = lowlinks[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            on_path[root] = True
+            work = [root]
+            while work:
+                node = work[-1]
+                position = cursor[node]
+                end = offsets[node + 1]
+                while position < end:
+                    child = targets[position]
+                    position += 1
+                    left = node
+                    while parents[left] != left:
+                        parents[left] = parents[parents[left]]
+                        left = parents[left]
+                    right = child
+                    while parents[right] != right:
+                        parents[right] = parents[parents[right]]
+                        right = parents[right]
+                    if left != right:
+                        parents[right] = left
+                        weak_component_count -= 1
+                    if indices[child] == -1:
+                        indices[child] = lowlinks[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = True
+                        on_path[child] = True
+                        work.append(child)
+                        break
+                    if cycle is None and on_path[child]:
+                        cycle = [*work[work.index(child) :], child]
+                    if on_stack[child] and indices[child] < lowlinks[node]:
+                        lowlinks[node] = indices[child]
+                cursor[node] = position
+                if work[-1] != node:
+                    continue
+                work.pop()
+                on_path[node] = False
+                if lowlinks[node] == indices[node]:
+                    component: list[int] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+        if order is not None:
+            visited = sum(1 for index in indices if index != -1)
+            weak_component_count -= node_count - visited
+        cyclic_count = sum(
+            1
+            for component in components
+            if len(component) > 1 or self.has_edge(component[0], component[0])
+        )
+        return GraphAnalysis(
+            strong_components=components,
+            cyclic_component_count=cyclic_count,
+            cycle=cycle,
+            weak_component_count=weak_component_count,
+        )
+
+    def component_ids(self) -> list[int]:
+        ids = [0] * len(self.node_ids)
+        for component_id, component in enumerate(self.strongly_connected_components()):
+            for member in component:
+                ids[member] = component_id
+        return ids
+
+    def cyclic_components(self, order: Iterable[int] | None = None) -> list[list[int]]:
+        return [
+            component
+            for component in self.strongly_connected_components(order)
+            if len(component) > 1 or self.has_edge(component[0], component[0])
+        ]
+
+    def find_cycle(self, order: Iterable[int] | None = None) -> list[int] | None:
+        node_count = len(self.node_ids)
+        offsets = self.offsets
+        targets = self.targets
+        color = [0] * node_count
+        cursor = list(offsets)
+        path: list[int] = []
+        for root in order if order is not None else range(node_count):
+            if color[root] != 0:
+                continue
+            color[root] = 1
+            path.append(root)
+            while path:
+                node = path[-1]
+                position = cursor[node]
+                end = offsets[node + 1]
+                while position < end:
+                    child = targets[position]
+                    position += 1
+                    if color[child] == 0:
+                        color[child] = 1
+                        path.append(child)
+                        break
+                    if color[child] == 1:
+                        return [*path[path.index(child) :], child]
+                cursor[node] = position
+                if path[-1] != node:
+                    continue
+                path.pop()
+                color[node] = 2
+        return None
+
+    def back_edges(self, order: Iterable[int] | None = None) -> list[tuple[int, int]]:
+        node_count = len(self.node_ids)
+        offsets = self.offsets
+        targets = self.targets
+        state = [0] * node_count
+        found: list[tuple[int, int]] = []
+        cursor = list(offsets)
+        for root in order if order is not None else range(node_count):
+            if state[root] != 0:
+                continue
+            state[root] = 1
+            work = [root]
+            while work:
+                node = work[-1]
+                position = cursor[node]
+                end = offsets[node + 1]
+                while position < end:
+                    child = targets[position]
+                    position += 1
+                    if state[child] == 0:
+                        state[child] = 1
+                        work.append(child)
+                        break
+                    if state[child] == 1:
+                        found.append((node, child))
+                cursor[node] = position
+                if work[-1] != node:
+                    continue
+                work.pop()
+                state[node] = 2
+        return found
+
+    def weak_components(self, order: Iterable[int] | None = None) -> list[list[int]]:
+        node_count = len(self.node_ids)
+        neighbors: list[list[int]] = [[] for _ in range(node_count)]
+        offsets = self.offsets
+        targets = self.targets
+        for source in range(node_count):
+            for position in range(offsets[source], offsets[source + 1]):
+                target = targets[position]
+                neighbors[source].append(target)
+                neighbors[target].append(source)
+        visited = [False] * node_count
+        components: list[list[int]] = []
+        for root in order if order is not None else range(node_count):
+            if visited[root]:
+                continue
+            visited[root] = True
+            component = [root]
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for neighbor in neighbors[node]:
+                    if not visited[neighbor]:
+                        visited[neighbor] = True
+                        component.append(neighbor)
+                        stack.append(neighbor)
+            components.append(component)
+        return components
+
+    def reachable(self, sources: Iterable[int]) -> list[bool]:
+        offsets = self.offsets
+        targets = self.targets
+        seen = [False] * len(self.node_ids)
+        stack: list[int] = []
+        for source in sources:
+            if not seen[source]:
+                seen[source] = True
+                stack.append(source)
+        while stack:
+            node = stack.pop()
+            for position in range(offsets[node], offsets[node + 1]):
+                target = targets[position]
+                if not seen[target]:
+                    seen[target] = True
+                    stack.append(target)
+        return seen
+
+    def topological_levels(self, priority: Sequence[Hashable]) -> list[int]:
+        offsets = self.offsets
+        targets = self.targets
+        indegree = self.in_degrees()
+        levels = [0] * len(self.node_ids)
+        queue = [(priority[node], node) for node, degree in enumerate(indegree) if degree == 0]
+        heapq.heapify(queue)
+        while queue:
+            _, node = heapq.heappop(queue)
+            next_level = levels[node] + 1
+            for position in range(offsets[node], offsets[node + 1]):
+                child = targets[position]
+                levels[child] = max(levels[child], next_level)
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(queue, (priority[child], child))
+        return levels
+
+    def count_paths(self, starts: Iterable[int]) -> int:
+        offsets = self.offsets
+        targets = self.targets
+        memo: list[int | None] = [None] * len(self.node_ids)
+        visiting = [False] * len(self.node_ids)
+        subtotals = [0] * len(self.node_ids)
+        cursor = list(offsets)
+
+        def resolve(node: int) -> int | None:
+            cached = memo[node]
+            if cached is not None:
+                return cached
+            if visiting[node]:
+                return 0
+            if offsets[node] == offsets[node + 1]:
+                memo[node] = 1
+                return 1
+            return None
+
+        total = 0
+        for start in starts:
+            value = resolve(start)
+            if value is not None:
+                total += value
+                continue
+            visiting[start] = True
+            work = [start]
+            while work:
+                node = work[-1]
+                position = cursor[node]
+                end = offsets[node + 1]
+                subtotal = subtotals[node]
+                while position < end:
+                    child = targets[position]
+                    position += 1
+                    value = resolve(child)
+                    if value is None:
+                        visiting[child] = True
+                        work.append(child)
+                        break
+                    subtotal += value
+                cursor[node] = position
+                subtotals[node] = subtotal
+                if work[-1] != node:
+                    continue
+                work.pop()
+                visiting[node] = False
+                memo[node] = subtotal
+                if work:
+                    subtotals[work[-1]] += subtotal
+            total += memo[start] or 0
+        return total
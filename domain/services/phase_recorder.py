@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    name: str
+    duration_ms: float
+    calls: int
+
+
+@dataclass(frozen=True)
+class PhaseSnapshot:
+    current_phase: str | None
+    current_phase_elapsed_ms: float | None
+    phases: tuple[PhaseTiming, ...]
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "current_phase": self.current_phase,
+            "current_phase_elapsed_ms": self.current_phase_elapsed_ms,
+            "phases": [
+                {
+                    "name": phase.name,
+                    "duration_ms": phase.duration_ms,
+                    "calls": phase.calls,
+                }
+                for phase in self.phases
+            ],
+        }
+
+
+@dataclass
+class _PhaseFrame:
+    name: str
+    started_at: float
+    is_step: bool
+
+
+class PhaseRecorder:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stack: list[_PhaseFrame] = []
+        self._durations: dict[str, float] = {}
+        self._calls: dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        with self._lock:
+            depth = len(self._stack)
+            self._push(name, is_step=False)
+        try:
+            yield
+        finally:
+            with self._lock:
+                while len(self._stack) > depth:
+                    self._close_top()
+
+    def step(self, name: str) -> None:
+        with self._lock:
+            self._close_step()
+            self._push(name, is_step=True)
+
+    def snapshot(self) -> PhaseSnapshot:
+        with self._lock:
+            current = self._stack[-1] if self._stack else None
+            return PhaseSnapshot(
+                current_phase=current.name if current is not None else None,
+                current_phase_elapsed_ms=(
+                    _to_ms(self._clock() - current.started_at) if current is not None else None
+                ),
+                phases=tuple(
+                    PhaseTiming(
+                        name=name,
+                        duration_ms=_to_ms(duration),
+                        calls=self._calls[name],
+                    )
+                    for name, duration in self._durations.items()
+                    if name in self._calls
+                ),
+            )
+
+    def _push(self, name: str, *, is_step: bool) -> None:
+        parent = self._stack[-1] if self._stack else None
+        qualified_name = f"{parent.name}.{name}" if parent is not None else name
+        self._durations.setdefault(qualified_name, 0.0)
+        self._stack.append(
+            _PhaseFrame(name=qualified_name, started_at=self._clock(), is_step=is_step)
+        )
+
+    def _close_step(self) -> None:
+        if self._stack and self._stack[-1].is_step:
+            self._close_top()
+
+    def _close_top(self) -> None:
+        frame = self._stack.pop()
+        elapsed = self._clock() - frame.started_at
+        self._durations[frame.name] += elapsed
+        self._calls[frame.name] = self._calls.get(frame.name, 0) + 1
+
+
+def track_phase(progress: PhaseRecorder | None, name: str) -> AbstractContextManager[None]:
+    if progress is None:
+        return nullcontext()
+    return progress.phase(name)
+
+
+def mark_phase(progress: PhaseRecorder | None, name: str) -> None:
+    if progress is not None:
+        progress.step(name)
+
+
+def _to_ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
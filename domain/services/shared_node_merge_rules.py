@@ -5,6 +5,8 @@ from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from itertools import combinations
 
+from domain.services.graph_kernel import IndexedGraph
+
 
 @dataclass(frozen=True)
 class ServiceNodeState:
@@ -283,51 +285,14 @@ def _cycle_nodes(
     proc_ids: set[str],
     forward_edges: Mapping[str, set[str]],
 ) -> set[str]:
-    index = 0
-    indices: dict[str, int] = {}
-    lowlink: dict[str, int] = {}
-    stack: list[str] = []
-    on_stack: set[str] = set()
-    cycle_nodes: set[str] = set()
-
-    def strongconnect(node_id: str) -> None:
-        nonlocal index
-        indices[node_id] = index
-        lowlink[node_id] = index
-        index += 1
-        stack.append(node_id)
-        on_stack.add(node_id)
-
-        for target in sorted(forward_edges.get(node_id, set()), key=str.lower):
-            if target not in indices:
-                strongconnect(target)
-                lowlink[node_id] = min(lowlink[node_id], lowlink[target])
-            elif target in on_stack:
-                lowlink[node_id] = min(lowlink[node_id], indices[target])
-
-        if lowlink[node_id] != indices[node_id]:
-            return
-
-        component: list[str] = []
-        while stack:
-            member = stack.pop()
-            on_stack.discard(member)
-            component.append(member)
-            if member == node_id:
-                break
-        if len(component) > 1:
-            cycle_nodes.update(component)
-            return
-        if component:
-            member = component[0]
-            if member in forward_edges.get(member, set()):
-                cycle_nodes.add(member)
-
-    for node_id in sorted(proc_ids, key=str.lower):
-        if node_id in indices:
-            continue
-        strongconnect(node_id)
-    return cycle_nodes
+    graph = IndexedGraph.from_adjacency(
+        forward_edges, nodes=sorted(proc_ids, key=str.lower), sort_key=str.lower
+    )
+    return {
+        graph.node_ids[member]
+        for component in graph.cyclic_components(range(len(proc_ids)))
+        for member in component
+    }
 
 
 def _linear_runs(
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+
+DEFAULT_WIDTH_FACTOR = 0.6
+DEFAULT_LINE_HEIGHT = 1.35
+TEXT_LAYOUT_CACHE_SIZE = 8192
+
+
+def wrap_words(words: Sequence[str], max_chars: int) -> list[str]:
+    lines: list[str] = []
+    current: list[str] = []
+    count = 0
+    for word in words:
+        if not current:
+            if len(word) <= max_chars:
+                current = [word]
+                count = len(word)
+            else:
+                for idx in range(0, len(word), max_chars):
+                    chunk = word[idx : idx + max_chars]
+                    if current:
+                        lines.append(" ".join(current))
+                    current = [chunk]
+                    count = len(chunk)
+            continue
+        if count + 1 + len(word) <= max_chars:
+            current.append(word)
+            count += 1 + len(word)
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            count = len(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+@lru_cache(maxsize=TEXT_LAYOUT_CACHE_SIZE, typed=True)
+def fit_text(
+    text: str,
+    max_width: float,
+    max_height: float,
+    min_size: float,
+    max_size: float,
+    width_factor: float = DEFAULT_WIDTH_FACTOR,
+    line_height: float = DEFAULT_LINE_HEIGHT,
+) -> tuple[str, float, float]:
+    if not text.strip():
+        size = max_size
+        height = min(max_height, size * line_height)
+        return text, size, height
+
+    words = text.split()
+    wrapped: dict[int, list[str]] = {}
+
+    def wrap(max_chars: int) -> list[str]:
+        lines = wrapped.get(max_chars)
+        if lines is None:
+            lines = wrapped[max_chars] = wrap_words(words, max_chars)
+        return lines
+
+    start = int(max_size)
+    end = int(min_size)
+    for size in range(start, end - 1, -1):
+        max_chars = max(1, int(max_width / (size * width_factor)))
+        lines = wrap(max_chars)
+        height_needed = len(lines) * size * line_height
+        if height_needed <= max_height:
+            return "\n".join(lines), float(size), min(max_height, height_needed)
+
+    size = max(min_size, 1.0)
+    max_chars = max(1, int(max_width / (size * width_factor)))
+    lines = wrap(max_chars)
+    height_needed = len(lines) * size * line_height
+    return "\n".join(lines), size, min(max_height, height_needed)
+
+
+@lru_cache(maxsize=TEXT_LAYOUT_CACHE_SIZE)
+def line_metrics(content: str) -> tuple[int, int]:
+    lines = content.splitlines()
+    return len(lines), max((len(line) for line in lines), default=0)
+
+
+def text_width(
+    content: str,
+    font_size: float,
+    max_width: float | None,
+    width_factor: float,
+) -> float:
+    line_count, max_len = line_metrics(content) if content else (0, 0)
+    if not line_count:
+        width = max_width if max_width is not None else 1.0
+        return max(1.0, width)
+    width = max_len * font_size * width_factor
+    if max_width is not None:
+        width = min(width, max_width)
+    return max(1.0, width)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from adapters.layout.grid import GridLayoutEngine
+from domain.services.convert_excalidraw_to_markup import ExcalidrawToMarkupConverter
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from scripts.benchmark_text_layout import build_label_heavy_document
+
+
+def _measure(label: str, repeat: int, func: Callable[[], object]) -> None:
+    durations: list[float] = []
+    for _ in range(max(1, repeat)):
+        started_at = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started_at)
+    print(
+        f"{label}: min={min(durations) * 1000:.1f}ms "
+        f"median={statistics.median(durations) * 1000:.1f}ms "
+        f"max={max(durations) * 1000:.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark Excalidraw to markup conversion on a large synthetic scene."
+    )
+    parser.add_argument("--procedures", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=40)
+    parser.add_argument("--labels", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    document = build_label_heavy_document(args.procedures, args.blocks, args.labels, args.seed)
+    scene = MarkupToExcalidrawConverter(GridLayoutEngine()).convert(document).to_dict()
+    converter = ExcalidrawToMarkupConverter()
+    print(f"elements={len(scene['elements'])}")
+
+    _measure("classify", args.repeat, lambda: converter._classify(scene["elements"]))
+    _measure("convert", args.repeat, lambda: converter.convert(scene))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable, Mapping
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from lzstring import LZString  # type: ignore[import-untyped]
+
+from adapters.excalidraw.lz_string import compress_to_encoded_uri_component
+from adapters.excalidraw.url_encoder import (
+    ExcalidrawUrlBuilder,
+    estimate_min_encoded_length,
+    serialize_scene_payload,
+)
+from adapters.filesystem.markup_repository import FileSystemMarkupRepository
+from adapters.layout.grid import GridLayoutEngine
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+
+
+def _measure(label: str, repeat: int, func: Callable[[], object]) -> None:
+    durations: list[float] = []
+    for _ in range(max(1, repeat)):
+        started_at = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started_at)
+    print(
+        f"{label}: min={min(durations) * 1000:.1f}ms "
+        f"median={statistics.median(durations) * 1000:.1f}ms "
+        f"max={max(durations) * 1000:.1f}ms"
+    )
+
+
+def _build_uncached_url(max_url_length: int, scene: Mapping[str, Any]) -> str | None:
+    return ExcalidrawUrlBuilder(max_url_length).build("/", scene)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark Excalidraw #json share URL encoding on example scenes."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-url-length", type=int, default=8000)
+    parser.add_argument("--markup-dir", type=Path, default=Path("examples/markup"))
+    args = parser.parse_args()
+
+    converter = MarkupToExcalidrawConverter(GridLayoutEngine())
+    markup_repo = FileSystemMarkupRepository()
+    reference = LZString()
+    for path in sorted(args.markup_dir.glob("*.json")):
+        scene = converter.convert(markup_repo.load_by_path(path)).to_dict()
+        payload = serialize_scene_payload(scene)
+        encoded = compress_to_encoded_uri_component(payload)
+        print(
+            f"{path.stem}: payload={len(payload) / 1024:.1f}KiB "
+            f"encoded={len(encoded) / 1024:.1f}KiB "
+            f"estimate={estimate_min_encoded_length(payload) / 1024:.1f}KiB"
+        )
+        _measure(
+            "  lzstring", args.repeat, partial(reference.compressToEncodedURIComponent, payload)
+        )
+        _measure("  compress", args.repeat, partial(compress_to_encoded_uri_component, payload))
+        _measure("  estimate", args.repeat, partial(estimate_min_encoded_length, payload))
+        _measure(
+            "  uncached url",
+            args.repeat,
+            partial(_build_uncached_url, args.max_url_length, scene),
+        )
+        builder = ExcalidrawUrlBuilder(args.max_url_length)
+        _measure("  cached url", args.repeat, partial(builder.build, "/", scene))
+
+
+if __name__ == "__main__":
+    main()
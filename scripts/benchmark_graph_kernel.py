@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph
+from domain.services.graph_kernel import IndexedGraph
+from domain.services.graph_metrics import compute_graph_metrics
+from scripts.benchmark_layout import build_synthetic_team_documents
+
+
+def _measure(label: str, repeat: int, func: Callable[[], object]) -> None:
+    durations: list[float] = []
+    for _ in range(max(1, repeat)):
+        started_at = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started_at)
+    print(
+        f"{label}: min={min(durations) * 1000:.1f}ms "
+        f"median={statistics.median(durations) * 1000:.1f}ms "
+        f"max={max(durations) * 1000:.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark graph kernel algorithms on a synthetic merged team graph."
+    )
+    parser.add_argument("--procedures", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    documents = build_synthetic_team_documents(args.procedures, seed=args.seed)
+    graph_document = BuildTeamProcedureGraph().build(documents, merge_node_min_chain_size=1)
+    adjacency = graph_document.procedure_graph
+    graph = IndexedGraph.from_adjacency(adjacency)
+    chain = {f"n{idx}": [f"n{idx + 1}"] for idx in range(args.procedures * 4)}
+    print(
+        f"documents={len(documents)} nodes={len(graph)} edges={graph.edge_count} "
+        f"chain_nodes={len(chain) + 1}"
+    )
+
+    _measure("intern", args.repeat, lambda: IndexedGraph.from_adjacency(adjacency))
+    _measure("scc", args.repeat, graph.strongly_connected_components)
+    _measure("weak_components", args.repeat, graph.weak_components)
+    _measure(
+        "topological_levels",
+        args.repeat,
+        lambda: graph.topological_levels(list(range(len(graph)))),
+    )
+    _measure("count_paths", args.repeat, lambda: graph.count_paths(range(len(graph))))
+    _measure("graph_metrics", args.repeat, lambda: compute_graph_metrics(adjacency))
+    _measure("graph_metrics_chain", args.repeat, lambda: compute_graph_metrics(chain))
+
+
+if __name__ == "__main__":
+    main()
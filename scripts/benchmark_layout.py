@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from itertools import pairwise
+
+from adapters.layout.procedure_graph import ProcedureGraphLayoutEngine
+from domain.models import MarkupDocument
+from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph
+
+
+def build_synthetic_team_documents(
+    procedure_count: int,
+    *,
+    procedures_per_service: int = 5,
+    shared_ratio: float = 0.2,
+    seed: int = 42,
+) -> list[MarkupDocument]:
+    rng = random.Random(seed)
+    service_count = max(1, procedure_count // procedures_per_service)
+    shared_pool = [f"shared_{idx}" for idx in range(max(1, procedure_count // 25))]
+    documents: list[MarkupDocument] = []
+    for service_idx in range(service_count):
+        proc_ids: list[str] = []
+        for proc_idx in range(procedures_per_service):
+            if rng.random() < shared_ratio:
+                proc_ids.append(rng.choice(shared_pool))
+            else:
+                proc_ids.append(f"svc{service_idx}_proc{proc_idx}")
+        proc_ids = list(dict.fromkeys(proc_ids))
+        procedure_graph: dict[str, list[str]] = {proc_id: [] for proc_id in proc_ids}
+        for left, right in pairwise(proc_ids):
+            procedure_graph[left].append(right)
+        if len(proc_ids) > 2 and rng.random() < 0.3:
+            procedure_graph[proc_ids[0]].append(proc_ids[-1])
+        documents.append(
+            MarkupDocument.model_validate(
+                {
+                    "markup_type": "service",
+                    "service_name": f"Service {service_idx}",
+                    "finedog_unit_id": f"svc-{service_idx}",
+                    "team_id": f"team-{service_idx % 7}",
+                    "team_name": f"Team {service_idx % 7}",
+                    "procedures": [
+                        {
+                            "proc_id": proc_id,
+                            "start_block_ids": [f"{proc_id}_start"],
+                            "end_block_ids": [f"{proc_id}_end"],
+                            "branches": {f"{proc_id}_start": [f"{proc_id}_end"]},
+                        }
+                        for proc_id in proc_ids
+                    ],
+                    "procedure_graph": procedure_graph,
+                }
+            )
+        )
+    return documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark procedure graph layout on a synthetic team graph."
+    )
+    parser.add_argument("--procedures", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--merge-node-min-chain-size", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--shared-ratio",
+        type=float,
+        default=0.2,
+        help="Share of cross-service calls; low values produce many small components.",
+    )
+    args = parser.parse_args()
+
+    documents = build_synthetic_team_documents(
+        args.procedures, shared_ratio=args.shared_ratio, seed=args.seed
+    )
+    graph_document = BuildTeamProcedureGraph().build(
+        documents,
+        merge_node_min_chain_size=args.merge_node_min_chain_size,
+    )
+    engine = ProcedureGraphLayoutEngine()
+    durations: list[float] = []
+    for _ in range(max(1, args.repeat)):
+        started_at = time.perf_counter()
+        plan = engine.build_plan(graph_document)
+        durations.append(time.perf_counter() - started_at)
+
+    print(
+        f"documents={len(documents)} procedures={len(graph_document.procedures)} "
+        f"frames={len(plan.frames)} zones={len(plan.service_zones)}"
+    )
+    print(
+        f"layout: min={min(durations) * 1000:.1f}ms "
+        f"median={statistics.median(durations) * 1000:.1f}ms "
+        f"max={max(durations) * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import statistics
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from adapters.filesystem.compression import available_encodings, compress_bytes
+from adapters.filesystem.json_utils import dump_compact_json_bytes
+from adapters.filesystem.markup_repository import FileSystemMarkupRepository
+from adapters.layout.grid import GridLayoutEngine
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from scripts.benchmark_text_layout import build_label_heavy_document
+
+
+def _measure(label: str, repeat: int, func: Callable[[], object]) -> None:
+    durations: list[float] = []
+    for _ in range(max(1, repeat)):
+        started_at = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started_at)
+    print(
+        f"{label}: min={min(durations) * 1000:.1f}ms "
+        f"median={statistics.median(durations) * 1000:.1f}ms "
+        f"max={max(durations) * 1000:.1f}ms"
+    )
+
+
+def _report(name: str, content: bytes, repeat: int) -> None:
+    print(f"{name}: identity={len(content) / 1024:.1f}KiB")
+    for encoding in available_encodings():
+        encoded = compress_bytes(content, encoding)
+        ratio = len(content) / max(1, len(encoded))
+        print(f"  {encoding}: size={len(encoded) / 1024:.1f}KiB ratio={ratio:.1f}x")
+        _measure(f"  {encoding} compress", repeat, partial(compress_bytes, content, encoding))
+    gzipped = compress_bytes(content, "gzip")
+    _measure("  gzip decompress", repeat, lambda: gzip.decompress(gzipped))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark response compression on representative Excalidraw scenes."
+    )
+    parser.add_argument("--procedures", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=40)
+    parser.add_argument("--labels", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--markup-dir", type=Path, default=Path("examples/markup"))
+    args = parser.parse_args()
+
+    converter = MarkupToExcalidrawConverter(GridLayoutEngine())
+    markup_repo = FileSystemMarkupRepository()
+    documents = {
+        "basic": markup_repo.load_by_path(args.markup_dir / "basic.json"),
+        "complex_graph": markup_repo.load_by_path(args.markup_dir / "complex_graph.json"),
+        "label_heavy": build_label_heavy_document(
+            args.procedures, args.blocks, args.labels, args.seed
+        ),
+    }
+    for name, document in documents.items():
+        content = dump_compact_json_bytes(converter.convert(document).to_dict())
+        _report(name, content, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+from itertools import pairwise
+
+from adapters.layout.grid import GridLayoutEngine
+from domain.models import MarkupDocument
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from domain.services.convert_markup_to_unidraw import MarkupToUnidrawConverter
+from domain.services.text_layout import fit_text, line_metrics
+
+_WORDS = (
+    "Проверить",
+    "клиента",
+    "заявку",
+    "отправить",
+    "уведомление",
+    "payment",
+    "status",
+    "callback",
+    "retry",
+    "validate",
+)
+
+
+def build_label_heavy_document(
+    procedure_count: int, blocks_per_procedure: int, label_pool: int, seed: int
+) -> MarkupDocument:
+    rng = random.Random(seed)
+    labels = [" ".join(rng.choices(_WORDS, k=rng.randint(2, 9))) for _ in range(label_pool)]
+    procedures = []
+    for proc_idx in range(procedure_count):
+        block_ids = [f"p{proc_idx}_b{idx}" for idx in range(blocks_per_procedure)]
+        procedures.append(
+            {
+                "proc_id": f"proc_{proc_idx}",
+                "proc_name": rng.choice(labels),
+                "start_block_ids": [block_ids[0]],
+                "end_block_ids": [block_ids[-1]],
+                "branches": {source: [target] for source, target in pairwise(block_ids)},
+                "block_id_to_block_name": {block_id: rng.choice(labels) for block_id in block_ids},
+            }
+        )
+    return MarkupDocument.model_validate(
+        {"markup_type": "service", "service_name": "Label heavy", "procedures": procedures}
+    )
+
+
+def _measure(
+    label: str, repeat: int, func: Callable[[], object], setup: Callable[[], None]
+) -> None:
+    durations: list[float] = []
+    for _ in range(max(1, repeat)):
+        setup()
+        started_at = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started_at)
+    print(
+        f"{label}: min={min(durations) * 1000:.1f}ms "
+        f"median={statistics.median(durations) * 1000:.1f}ms "
+        f"max={max(durations) * 1000:.1f}ms"
+    )
+
+
+def _clear_text_cache() -> None:
+    fit_text.cache_clear()
+    line_metrics.cache_clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark text fitting on label-heavy Excalidraw/Unidraw conversion."
+    )
+    parser.add_argument("--procedures", type=int, default=40)
+    parser.add_argument("--blocks", type=int, default=25)
+    parser.add_argument("--labels", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    document = build_label_heavy_document(args.procedures, args.blocks, args.labels, args.seed)
+    excalidraw = MarkupToExcalidrawConverter(GridLayoutEngine())
+    unidraw = MarkupToUnidrawConverter(GridLayoutEngine())
+    prepared = excalidraw.prepare(document)
+    labels = [
+        name
+        for procedure in document.procedures
+        for name in procedure.block_id_to_block_name.values()
+    ]
+    print(f"blocks={len(prepared.plan.blocks)} labels={len(labels)} distinct={len(set(labels))}")
+
+    def fit_all() -> None:
+        for label in labels:
+            fit_text(label, 296.0, 96.0, 10.0, 20.0)
+
+    def fit_all_uncached() -> None:
+        for label in labels:
+            fit_text.__wrapped__(label, 296.0, 96.0, 10.0, 20.0)
+
+    _measure("fit_text uncached", args.repeat, fit_all_uncached, lambda: None)
+    _measure("fit_text cold", args.repeat, fit_all, _clear_text_cache)
+    _measure("fit_text warm", args.repeat, fit_all, lambda: None)
+    _measure(
+        "excalidraw cold",
+        args.repeat,
+        lambda: excalidraw.convert_prepared(prepared),
+        _clear_text_cache,
+    )
+    _measure(
+        "excalidraw warm", args.repeat, lambda: excalidraw.convert_prepared(prepared), lambda: None
+    )
+    _measure(
+        "unidraw cold", args.repeat, lambda: unidraw.convert_prepared(prepared), _clear_text_cache
+    )
+    _measure("unidraw warm", args.repeat, lambda: unidraw.convert_prepared(prepared), lambda: None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 import json
+import random
 
+import pytest
 from lzstring import LZString  # type: ignore[import-untyped]
 
-from adapters.excalidraw.url_encoder import encode_scene_payload
+from adapters.excalidraw import url_encoder
+from adapters.excalidraw.lz_string import compress_to_encoded_uri_component
+from adapters.excalidraw.url_encoder import (
+    ExcalidrawUrlBuilder,
+    encode_scene_payload,
+    estimate_min_encoded_length,
+    serialize_scene_payload,
+)
 
 
 def test_encode_scene_payload_roundtrip() -> None:
@@ -16,3 +25,98 @@ def test_encode_scene_payload_roundtrip() -> None:
     encoded = encode_scene_payload(payload)
     decoded = LZString().decompressFromEncodedURIComponent(encoded)
     assert json.loads(decoded) == payload
+
+
+def test_compress_to_encoded_uri_component_matches_reference_implementation() -> None:
+    rng = random.Random(7)
+    alphabets = ["ab", "abcdefg", "abcЖЯ€", "".join(map(chr, range(32, 127)))]
+    samples = ["", "a", "aaaaaaaa", "привет мир", "hello hello hello"]
+    samples.extend(
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+        for alphabet in alphabets
+        for _ in range(50)
+    )
+    reference = LZString()
+    for sample in samples:
+        assert compress_to_encoded_uri_component(sample) == (
+            reference.compressToEncodedURIComponent(sample)
+        )
+
+
+def _large_scene() -> dict[str, object]:
+    rng = random.Random(3)
+    return {
+        "elements": [
+            {"id": f"el-{idx}", "x": rng.random(), "y": rng.random(), "text": f"{rng.random()}"}
+            for idx in range(400)
+        ]
+    }
+
+
+def test_estimate_min_encoded_length_does_not_exceed_encoded_length() -> None:
+    scenes: tuple[dict[str, object], ...] = ({"elements": [], "appState": {}}, _large_scene())
+    for scene in scenes:
+        payload = serialize_scene_payload(scene)
+        assert estimate_min_encoded_length(payload) <= len(
+            compress_to_encoded_uri_component(payload)
+        )
+
+
+def _fail_serialize(_: object) -> str:
+    raise AssertionError("cache hits must not serialize the scene")
+
+
+def test_excalidraw_url_builder_caches_urls_by_scene_content(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = 0
+
+    def counting_compress(text: str) -> str:
+        nonlocal calls
+        calls += 1
+        return compress_to_encoded_uri_component(text)
+
+    monkeypatch.setattr(url_encoder, "compress_to_encoded_uri_component", counting_compress)
+    builder = ExcalidrawUrlBuilder(max_url_length=8000)
+    scene: dict[str, object] = {"elements": [{"id": "a"}], "appState": {}}
+
+    first = builder.build("https://draw.example/#old", scene)
+    monkeypatch.setattr(url_encoder, "serialize_scene_payload", _fail_serialize)
+    second = builder.build("https://draw.example/", {"appState": {}, "elements": [{"id": "a"}]})
+
+    assert first == second
+    assert first is not None
+    assert first.startswith("https://draw.example/#json=")
+    assert calls == 1
+
+
+def test_excalidraw_url_builder_skips_compression_when_url_cannot_fit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def failing_compress(_: str) -> str:
+        raise AssertionError("oversized scenes must not be compressed")
+
+    monkeypatch.setattr(url_encoder, "compress_to_encoded_uri_component", failing_compress)
+    builder = ExcalidrawUrlBuilder(max_url_length=200)
+
+    assert builder.build("https://draw.example/", _large_scene()) is None
+
+
+def test_excalidraw_url_builder_encodes_exactly_when_estimate_is_near_the_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = 0
+
+    def counting_compress(text: str) -> str:
+        nonlocal calls
+        calls += 1
+        return compress_to_encoded_uri_component(text)
+
+    monkeypatch.setattr(url_encoder, "compress_to_encoded_uri_component", counting_compress)
+    scene = _large_scene()
+    base_url = "https://draw.example/"
+    estimate = estimate_min_encoded_length(serialize_scene_payload(scene))
+    builder = ExcalidrawUrlBuilder(max_url_length=len(base_url) + len("#json=") + estimate - 1)
+
+    assert builder.build(base_url, scene) is None
+    assert calls == 1
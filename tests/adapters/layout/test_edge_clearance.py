@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from adapters.layout.grid import GridLayoutEngine
-from domain.models import MarkupDocument
+import random
+
+from adapters.layout.grid import GridLayoutEngine, _SegmentIndex
+from domain.models import MarkupDocument, Point
 
 
 def test_end_blocks_shifted_for_cross_procedure_edges() -> None:
@@ -65,3 +67,34 @@ def test_start_markers_shift_diagonally_when_overlapping_edges() -> None:
     row_shift = layout.config.block_size.height + layout.config.gap_y
     assert marker_d.position.y >= default_y + row_shift
     assert marker_d.position.x < default_x
+
+
+def test_segment_index_candidates_cover_all_intersections_after_moves() -> None:
+    rng = random.Random(7)
+    layout = GridLayoutEngine()
+    index = _SegmentIndex(cell_size=200.0)
+    segments: list[tuple[Point, Point]] = []
+
+    def random_segment() -> tuple[Point, Point]:
+        start = Point(rng.uniform(-500, 3000), rng.uniform(-500, 3000))
+        length = rng.choice([50.0, 400.0, 6000.0])
+        end = Point(start.x + rng.uniform(-length, length), start.y + rng.uniform(-length, length))
+        return start, end
+
+    for _ in range(120):
+        segment = random_segment()
+        segments.append(segment)
+        index.add(*segment)
+    for segment_idx in rng.sample(range(len(segments)), 40):
+        segments[segment_idx] = random_segment()
+        index.move(segment_idx, *segments[segment_idx])
+
+    for _ in range(200):
+        x, y = rng.uniform(-500, 3000), rng.uniform(-500, 3000)
+        rect = (x, y, x + rng.uniform(10, 400), y + rng.uniform(10, 200))
+        expected = {
+            segment_idx
+            for segment_idx, (start, end) in enumerate(segments)
+            if layout._segment_intersects_rect(start, end, rect)
+        }
+        assert expected <= index.candidates(rect)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from adapters.layout.cache import (
+    CachedLayoutEngine,
+    LayoutPlanCache,
+    build_layout_cache_key,
+    layout_engine_fingerprint,
+)
+from adapters.layout.grid import GridLayoutEngine, LayoutConfig
+from adapters.layout.procedure_graph import ProcedureGraphLayoutEngine
+from domain.models import LayoutPlan, MarkupDocument
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+
+class _CountingEngine(GridLayoutEngine):
+    def __init__(self, config: LayoutConfig | None = None) -> None:
+        super().__init__(config)
+        self.calls = 0
+
+    def build_plan(self, document: MarkupDocument) -> LayoutPlan:
+        self.calls += 1
+        return super().build_plan(document)
+
+
+def test_cached_layout_engine_reuses_plan_for_equal_documents() -> None:
+    engine = _CountingEngine()
+    cached = CachedLayoutEngine(engine, LayoutPlanCache())
+    document = load_markup_fixture("basic.json")
+
+    plan = cached.build_plan(document)
+    again = cached.build_plan(document.model_copy(deep=True))
+
+    assert again is plan
+    assert plan == GridLayoutEngine().build_plan(document)
+    assert engine.calls == 1
+
+
+def test_cached_layout_engine_keys_on_document_and_config() -> None:
+    cache = LayoutPlanCache()
+    engine = _CountingEngine()
+    wide_engine = _CountingEngine(LayoutConfig(gap_x=300.0))
+    document = load_markup_fixture("basic.json")
+    changed = document.model_copy(update={"service_name": "Other service"})
+
+    CachedLayoutEngine(engine, cache).build_plan(document)
+    CachedLayoutEngine(engine, cache).build_plan(changed)
+    CachedLayoutEngine(wide_engine, cache).build_plan(document)
+    CachedLayoutEngine(ProcedureGraphLayoutEngine(), cache).build_plan(document)
+
+    assert engine.calls == 2
+    assert wide_engine.calls == 1
+    assert len(cache) == 4
+
+
+def test_layout_cache_key_covers_return_blocks() -> None:
+    document = load_markup_fixture("basic.json")
+    with_return = document.model_copy(
+        update={
+            "procedures": [
+                procedure.model_copy(update={"return_block_ids": procedure.end_block_ids})
+                for procedure in document.procedures
+            ]
+        }
+    )
+
+    fingerprint = layout_engine_fingerprint(GridLayoutEngine())
+
+    assert build_layout_cache_key(fingerprint, LayoutConfig(), document) != (
+        build_layout_cache_key(fingerprint, LayoutConfig(), with_return)
+    )
+
+
+def test_layout_plan_cache_evicts_least_recently_used() -> None:
+    cache = LayoutPlanCache(max_entries=2)
+    plans = {key: LayoutPlan(frames=[], blocks=[], markers=[]) for key in ("a", "b", "c")}
+
+    cache.put("a", plans["a"])
+    cache.put("b", plans["b"])
+    assert cache.get("a") is plans["a"]
+    cache.put("c", plans["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is plans["a"]
+    assert cache.get("c") is plans["c"]
+
+
+def test_layout_plan_cache_disk_tier_survives_new_instance(tmp_path: Path) -> None:
+    document = load_markup_fixture("basic.json")
+    first_engine = _CountingEngine()
+    plan = CachedLayoutEngine(first_engine, LayoutPlanCache(cache_dir=tmp_path)).build_plan(
+        document
+    )
+
+    second_engine = _CountingEngine()
+    restored = CachedLayoutEngine(second_engine, LayoutPlanCache(cache_dir=tmp_path)).build_plan(
+        document
+    )
+
+    assert restored == plan
+    assert second_engine.calls == 0
+    assert len(list(tmp_path.rglob("*.pickle"))) == 1
+
+
+def test_layout_plan_cache_ignores_corrupt_disk_entries(tmp_path: Path) -> None:
+    cache = LayoutPlanCache(cache_dir=tmp_path)
+    entry = tmp_path / "ab" / "abcdef.pickle"
+    entry.parent.mkdir()
+    entry.write_bytes(b"not a pickle")
+
+    assert cache.get("abcdef") is None
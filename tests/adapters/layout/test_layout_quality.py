@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from adapters.layout.cache import CachedLayoutEngine, LayoutPlanCache
+from adapters.layout.grid import (
+    LAYOUT_QUALITY_FAST,
+    PASS_BARYCENTRIC_SWEEPS,
+    PASS_EDGE_AVOIDANCE,
+    PASS_ROW_SMOOTHING,
+    GridLayoutEngine,
+    LayoutConfig,
+)
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+
+def test_full_quality_records_applied_passes() -> None:
+    plan = GridLayoutEngine().build_plan(load_markup_fixture("complex_graph.json"))
+
+    assert plan.refinement.quality == "full"
+    assert plan.refinement.skipped == []
+    assert plan.refinement.budget_exhausted is False
+    assert {PASS_BARYCENTRIC_SWEEPS, PASS_ROW_SMOOTHING, PASS_EDGE_AVOIDANCE} <= set(
+        plan.refinement.applied
+    )
+
+
+def test_fast_quality_skips_refinement_but_keeps_every_node() -> None:
+    document = load_markup_fixture("complex_graph.json")
+    full = GridLayoutEngine().build_plan(document)
+
+    fast = GridLayoutEngine(LayoutConfig(quality=LAYOUT_QUALITY_FAST)).build_plan(document)
+
+    assert fast.refinement.applied == []
+    assert set(fast.refinement.skipped) == set(full.refinement.applied)
+    assert fast.refinement.budget_exhausted is False
+    assert {(b.procedure_id, b.block_id) for b in fast.blocks} == {
+        (b.procedure_id, b.block_id) for b in full.blocks
+    }
+    assert len(fast.markers) == len(full.markers)
+
+
+def test_generous_budget_matches_unbudgeted_plan() -> None:
+    document = load_markup_fixture("complex_graph.json")
+
+    plan = GridLayoutEngine(LayoutConfig(time_budget_seconds=60.0)).build_plan(document)
+
+    assert plan.refinement.budget_exhausted is False
+    assert plan == GridLayoutEngine().build_plan(document)
+
+
+def test_exhausted_budget_skips_passes_and_is_not_cached() -> None:
+    document = load_markup_fixture("complex_graph.json")
+    cache = LayoutPlanCache()
+    engine = CachedLayoutEngine(GridLayoutEngine(LayoutConfig(time_budget_seconds=0.0)), cache)
+
+    plan = engine.build_plan(document)
+
+    assert plan.refinement.budget_exhausted is True
+    assert plan.refinement.applied == []
+    assert PASS_ROW_SMOOTHING in plan.refinement.skipped
+    assert len(cache) == 0
+
+
+def test_exhausted_budget_refines_plan_in_background() -> None:
+    document = load_markup_fixture("complex_graph.json")
+    cache = LayoutPlanCache()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        engine = CachedLayoutEngine(
+            GridLayoutEngine(LayoutConfig(time_budget_seconds=0.0)),
+            cache,
+            refine_executor=executor,
+        )
+        engine.build_plan(document)
+
+    refined = engine.build_plan(document)
+
+    assert refined == GridLayoutEngine().build_plan(document)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import random
+
+from adapters.layout.overlap import IntervalIndex, overlapping_pairs, stack_below
+
+
+def _random_interval(rng: random.Random) -> tuple[float, float]:
+    start = rng.uniform(-200, 2000)
+    return start, start + rng.choice([0.0, rng.uniform(1, 300), rng.uniform(300, 30000)])
+
+
+def test_interval_index_matches_linear_scan() -> None:
+    rng = random.Random(3)
+    index = IntervalIndex(bucket_size=100.0)
+    intervals = [_random_interval(rng) for _ in range(300)]
+    for idx, (start, end) in enumerate(intervals):
+        assert index.add(start, end) == idx
+
+    for _ in range(200):
+        start, end = _random_interval(rng)
+        expected = [
+            idx
+            for idx, (other_start, other_end) in enumerate(intervals)
+            if other_start <= end and other_end >= start
+        ]
+        assert index.overlapping(start, end) == expected
+
+
+def test_overlapping_pairs_matches_pairwise_scan() -> None:
+    rng = random.Random(5)
+    intervals = [_random_interval(rng) for _ in range(150)]
+
+    expected = {
+        (left, right)
+        for left in range(len(intervals))
+        for right in range(left + 1, len(intervals))
+        if intervals[left][0] <= intervals[right][1] and intervals[right][0] <= intervals[left][1]
+    }
+
+    assert set(overlapping_pairs(intervals)) == expected
+
+
+def test_stack_below_matches_iterative_push_down() -> None:
+    rng = random.Random(11)
+    for _ in range(300):
+        blockers = []
+        for _ in range(rng.randint(0, 25)):
+            top = rng.uniform(0, 3000)
+            blockers.append((top, top + rng.uniform(10, 400)))
+        y = rng.uniform(0, 3000)
+        height = rng.uniform(10, 400)
+        gap = rng.choice([0.0, 40.0, 300.0])
+
+        expected = y
+        while True:
+            conflicts = [
+                bottom
+                for top, bottom in blockers
+                if not (expected + height + gap <= top or bottom + gap <= expected)
+            ]
+            if not conflicts:
+                break
+            expected = max(bottom + gap for bottom in conflicts)
+
+        assert stack_below(y, height, gap, blockers) == expected
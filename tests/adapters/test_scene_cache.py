@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from adapters.filesystem import scene_cache as scene_cache_module
+from adapters.filesystem.compression import build_compressed_variants
+from adapters.filesystem.scene_cache import (
+    SceneCache,
+    build_scene_cache_key,
+    build_scene_file_cache_key,
+)
+from domain.models import MarkupDocument
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+
+def _payload(size: int) -> dict[str, object]:
+    return {"type": "excalidraw", "elements": [{"id": "x" * size}]}
+
+
+def test_scene_cache_key_depends_on_content_format_and_generator() -> None:
+    document = load_markup_fixture("basic.json")
+    key = build_scene_cache_key("gen", "excalidraw", document)
+
+    assert build_scene_cache_key("gen", "excalidraw", document.model_copy(deep=True)) == key
+    assert build_scene_cache_key("gen", "unidraw", document) != key
+    assert build_scene_cache_key("other", "excalidraw", document) != key
+    changed = document.model_copy(update={"service_name": "Other service"})
+    assert build_scene_cache_key("gen", "excalidraw", changed) != key
+
+
+def test_scene_cache_key_ignores_set_iteration_order() -> None:
+    first = MarkupDocument(markup_type="service", block_graph_initials={"a", "b", "c"})
+    second = MarkupDocument(markup_type="service", block_graph_initials={"c", "b", "a"})
+
+    assert build_scene_cache_key("gen", "excalidraw", first) == build_scene_cache_key(
+        "gen", "excalidraw", second
+    )
+
+
+def test_scene_cache_survives_new_instance(tmp_path: Path) -> None:
+    SceneCache(tmp_path, max_bytes=1_000_000).put("abcdef", _payload(10))
+
+    assert SceneCache(tmp_path, max_bytes=1_000_000).get("abcdef") == _payload(10)
+    assert SceneCache(tmp_path, max_bytes=1_000_000).get("missing") is None
+
+
+def test_scene_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = SceneCache(tmp_path, max_bytes=250)
+    cache.put("aa1", _payload(80))
+    cache.put("bb2", _payload(80))
+    for offset, key in enumerate(("aa1", "bb2")):
+        path = tmp_path / key[:2] / f"{key}.json"
+        os.utime(path, (1_000 + offset, 1_000 + offset))
+    assert cache.get("aa1") is not None
+
+    cache.put("cc3", _payload(80))
+
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None
+    assert cache.get("cc3") is not None
+    assert cache.total_bytes() <= 250
+
+
+def test_scene_cache_ignores_corrupt_entries(tmp_path: Path) -> None:
+    entry = tmp_path / "ab" / "abcdef.json"
+    entry.parent.mkdir()
+    entry.write_bytes(b"not json")
+
+    assert SceneCache(tmp_path, max_bytes=1_000).get("abcdef") is None
+
+
+def test_scene_cache_serves_stored_bytes(tmp_path: Path) -> None:
+    cache = SceneCache(tmp_path / "cache", max_bytes=1_000)
+    cache.put_bytes("abcdef", b'{"elements":[]}')
+
+    assert cache.get_bytes("abcdef") == b'{"elements":[]}'
+    assert cache.get("abcdef") == {"elements": []}
+    assert cache.total_bytes() == len(b'{"elements":[]}')
+
+
+def test_scene_file_cache_key_tracks_file_changes(tmp_path: Path) -> None:
+    scene_path = tmp_path / "scene.excalidraw"
+    scene_path.write_text("{}", encoding="utf-8")
+    os.utime(scene_path, ns=(1_000, 1_000))
+    key = build_scene_file_cache_key("gen", "excalidraw", scene_path, scene_path.stat())
+
+    assert build_scene_file_cache_key("gen", "unidraw", scene_path, scene_path.stat()) != key
+    assert build_scene_file_cache_key("links", "excalidraw", scene_path, scene_path.stat()) != key
+    os.utime(scene_path, ns=(2_000, 2_000))
+    assert build_scene_file_cache_key("gen", "excalidraw", scene_path, scene_path.stat()) != key
+
+
+def test_scene_cache_stores_and_evicts_compressed_variants_together(tmp_path: Path) -> None:
+    content = b'{"elements":[' + b",".join(b'{"id":"x"}' for _ in range(200)) + b"]}"
+    variants = build_compressed_variants(content, ["gzip"])
+    cache = SceneCache(tmp_path, max_bytes=len(content) + len(variants["gzip"]) + 10)
+
+    cache.put_bytes("aa1", content, variants)
+
+    assert cache.get_bytes("aa1", "gzip") == variants["gzip"]
+    assert gzip.decompress(variants["gzip"]) == content
+    assert cache.get_bytes("aa1", "br") is None
+    os.utime(tmp_path / "aa" / "aa1.json", (1_000, 1_000))
+    os.utime(tmp_path / "aa" / "aa1.json.gz", (1_000, 1_000))
+
+    cache.put_bytes("bb2", content, variants)
+
+    assert cache.get_bytes("aa1") is None
+    assert not (tmp_path / "aa" / "aa1.json.gz").exists()
+    assert cache.get_bytes("bb2", "gzip") == variants["gzip"]
+
+
+def test_scene_cache_refreshes_recency_of_served_variant(tmp_path: Path) -> None:
+    content = b'{"elements":[' + b",".join(b'{"id":"x"}' for _ in range(200)) + b"]}"
+    variants = build_compressed_variants(content, ["gzip"])
+    cache = SceneCache(tmp_path, max_bytes=len(content) + len(variants["gzip"]) + 3)
+    cache.put_bytes("aa1", content, variants)
+    cache.put_bytes("bb2", b"{}")
+    for path in tmp_path.glob("aa/*.json*"):
+        os.utime(path, (1_000, 1_000))
+    os.utime(tmp_path / "bb" / "bb2.json", (2_000, 2_000))
+
+    assert cache.get_bytes("aa1", "gzip") == variants["gzip"]
+    assert (tmp_path / "aa" / "aa1.json").stat().st_mtime == 1_000
+    cache.put_bytes("cc3", b"{}")
+
+    assert cache.get_bytes("aa1", "gzip") == variants["gzip"]
+    assert cache.get_bytes("bb2") is None
+
+
+def test_scene_cache_remembers_source_keys_up_to_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(scene_cache_module, "SOURCE_KEY_MAX_ENTRIES", 2)
+    cache = SceneCache(tmp_path, max_bytes=1024)
+
+    cache.remember_source_key(("a.json", "t1"), "key-a")
+    cache.remember_source_key(("b.json", "t1"), "key-b")
+    assert cache.source_key(("a.json", "t1")) == "key-a"
+    cache.remember_source_key(("c.json", "t1"), "key-c")
+
+    assert cache.source_key(("a.json", "t1")) == "key-a"
+    assert cache.source_key(("b.json", "t1")) is None
+    assert cache.source_key(("a.json", "t2")) is None
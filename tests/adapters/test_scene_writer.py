@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import orjson
+
+from adapters.excalidraw.repository import FileSystemExcalidrawRepository
+from adapters.filesystem.json_utils import write_json_stream
+from adapters.filesystem.scene_repository import FileSystemSceneRepository
+from adapters.layout.grid import GridLayoutEngine
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+
+def test_write_json_stream_matches_compact_orjson() -> None:
+    document = load_markup_fixture("complex_graph.json")
+    payload = MarkupToExcalidrawConverter(GridLayoutEngine()).convert(document).to_dict()
+    sink = io.BytesIO()
+
+    write_json_stream(sink, payload)
+
+    assert sink.getvalue() == orjson.dumps(payload)
+
+
+def test_write_json_stream_handles_empty_and_non_serializable_keys() -> None:
+    sink = io.BytesIO()
+
+    write_json_stream(sink, {"elements": [], "appState": {1: "one"}, "name": "Сцена"})
+
+    assert orjson.loads(sink.getvalue()) == {
+        "elements": [],
+        "appState": {"1": "one"},
+        "name": "Сцена",
+    }
+
+
+def test_scene_repositories_write_compact_scenes(tmp_path: Path) -> None:
+    document = load_markup_fixture("basic.json")
+    excalidraw = MarkupToExcalidrawConverter(GridLayoutEngine()).convert(document)
+    scene_path = tmp_path / "basic.excalidraw"
+    cache_path = tmp_path / "cache" / "basic.excalidraw"
+
+    FileSystemExcalidrawRepository().save(excalidraw, scene_path)
+    FileSystemSceneRepository().save(excalidraw.to_dict(), cache_path)
+
+    assert scene_path.read_bytes() == orjson.dumps(excalidraw.to_dict())
+    assert cache_path.read_bytes() == scene_path.read_bytes()
+    [(_, loaded)] = FileSystemExcalidrawRepository().load_all_with_paths(tmp_path)
+    assert loaded == excalidraw
+    assert not list(tmp_path.rglob("*.tmp"))
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import gzip
 import json
 import os
 import re
 from collections.abc import Callable
+from dataclasses import replace
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, cast
 
 import pytest
+from fastapi.testclient import TestClient
 
 from app.config import AppSettings
-from domain.models import MarkupDocument
+from app import web_main
+from app.web_main import create_app
+from domain.models import LayoutRefinement, MarkupDocument
 from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph
-from domain.services.extract_block_graph_view import extract_block_graph_view
+from domain.services.extract_block_graph_view import build_block_graph_view
 from domain.services.extract_procedure_graph_view import extract_procedure_graph_view
 from tests.app.catalog_test_setup import build_catalog_test_context
 
@@ -35,6 +40,10 @@ def test_catalog_api_smoke(
         items = index_response.json()["items"]
         assert len(items) == 1
         assert items[0]["updated_at"]
+        assert "merge_summary" not in items[0]
+        index_path = tmp_path / "catalog" / "index.json"
+        stored_items = json.loads(index_path.read_text(encoding="utf-8"))["items"]
+        assert stored_items[0]["merge_summary"]["procedure_ids"]
         scene_id = items[0]["scene_id"]
 
         scene_response = context.client.get(f"/api/scenes/{scene_id}")
@@ -175,6 +184,199 @@ def test_catalog_api_regenerates_stale_cached_scene_from_latest_markup(
         assert any("Billing v2" in text for text in cached_texts)
 
 
+def test_catalog_api_stamps_unidraw_elements_with_item_updated_at(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={"generate_excalidraw_on_demand": True},
+    ) as context:
+        index_path = tmp_path / "catalog" / "index.json"
+        index_payload = json.loads(index_path.read_text(encoding="utf-8"))
+        index_payload["items"][0]["updated_at"] = "2030-01-01T00:00:00+00:00"
+        index_path.write_text(json.dumps(index_payload), encoding="utf-8")
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+
+        response = context.client.get(f"/api/scenes/{context.scene_id}?format=unidraw")
+        assert response.status_code == 200
+        expected = int(datetime(2030, 1, 1, tzinfo=UTC).timestamp() * 1000)
+        elements = response.json()["elements"]
+        assert elements
+        assert {element["createdAt"] for element in elements} == {expected}
+        assert {element["updatedAt"] for element in elements} == {expected}
+
+
+def test_catalog_api_reuses_persistent_scene_cache_across_restarts(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    scene_cache_dir = tmp_path / "scene_cache"
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "generate_excalidraw_on_demand": True,
+            "cache_excalidraw_on_demand": True,
+            "scene_cache_dir": scene_cache_dir,
+        },
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        conversions = 0
+        original_prepare = app_context.to_excalidraw.prepare
+
+        def counting_prepare(markup: MarkupDocument) -> Any:
+            nonlocal conversions
+            conversions += 1
+            return original_prepare(markup)
+
+        monkeypatch.setattr(app_context.to_excalidraw, "prepare", counting_prepare)
+
+        first = context.client.get(f"/api/scenes/{context.scene_id}")
+        second = context.client.get(f"/api/scenes/{context.scene_id}")
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert conversions == 1
+        assert len(list(scene_cache_dir.glob("*/*.json"))) == 1
+
+        restarted = TestClient(create_app(app_context.settings))
+        try:
+            restarted_context = cast(Any, restarted.app).state.context
+            monkeypatch.setattr(restarted_context.markup_reader, "load_by_path", lambda _: document)
+            monkeypatch.setattr(restarted_context.to_excalidraw, "prepare", counting_prepare)
+            response = restarted.get(f"/api/scenes/{context.scene_id}")
+        finally:
+            restarted.close()
+        assert response.status_code == 200
+        assert response.json() == first.json()
+        assert conversions == 1
+
+
+def _exhaust_layout_budget(monkeypatch: pytest.MonkeyPatch, converter: Any) -> None:
+    original_prepare = converter.prepare
+
+    def prepare_with_exhausted_budget(markup: MarkupDocument) -> Any:
+        prepared = original_prepare(markup)
+        refinement = LayoutRefinement(quality="fast", budget_exhausted=True)
+        return replace(prepared, plan=replace(prepared.plan, refinement=refinement))
+
+    monkeypatch.setattr(converter, "prepare", prepare_with_exhausted_budget)
+
+
+def test_catalog_api_does_not_persist_scene_with_exhausted_layout_budget(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    scene_cache_dir = tmp_path / "scene_cache"
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "generate_excalidraw_on_demand": True,
+            "cache_excalidraw_on_demand": True,
+            "scene_cache_dir": scene_cache_dir,
+        },
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        path = f"/api/scenes/{context.scene_id}"
+        with monkeypatch.context() as patch:
+            _exhaust_layout_budget(patch, app_context.to_excalidraw)
+            provisional = context.client.get(path)
+        assert provisional.status_code == 200
+        assert list(scene_cache_dir.glob("*/*.json*")) == []
+
+        refined = context.client.get(path, headers={"If-None-Match": provisional.headers["etag"]})
+        assert refined.status_code == 200
+        assert refined.headers["etag"] != provisional.headers["etag"]
+        assert len(list(scene_cache_dir.glob("*/*.json"))) == 1
+
+
+def test_catalog_api_does_not_save_scene_file_with_exhausted_layout_budget(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "generate_excalidraw_on_demand": True,
+            "cache_excalidraw_on_demand": True,
+        },
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        context.scene_path.unlink()
+        with monkeypatch.context() as patch:
+            _exhaust_layout_budget(patch, app_context.to_excalidraw)
+            response = context.client.get(f"/api/scenes/{context.scene_id}")
+        assert response.status_code == 200
+        assert not context.scene_path.exists()
+
+        response = context.client.get(f"/api/scenes/{context.scene_id}")
+        assert response.status_code == 200
+        assert context.scene_path.exists()
+
+
+def test_catalog_api_serves_enhanced_scene_bytes_from_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    scene_cache_dir = tmp_path / "scene_cache"
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "generate_excalidraw_on_demand": False,
+            "scene_cache_dir": scene_cache_dir,
+            "procedure_link_path": "https://example.com/procedures/{procedure_id}",
+        },
+    ) as context:
+        enhancements = 0
+        original_enhance = web_main.enhance_scene_payload
+
+        def counting_enhance(*args: Any) -> None:
+            nonlocal enhancements
+            enhancements += 1
+            original_enhance(*args)
+
+        monkeypatch.setattr(web_main, "enhance_scene_payload", counting_enhance)
+
+        first = context.client.get(f"/api/scenes/{context.scene_id}")
+        second = context.client.get(f"/api/scenes/{context.scene_id}")
+        assert first.status_code == 200
+        assert second.content == first.content
+        assert enhancements == 1
+        [cache_entry] = scene_cache_dir.glob("*/*.json")
+        assert cache_entry.read_bytes() == first.content
+        assert any(
+            str(element.get("link", "")).startswith("https://example.com/procedures/")
+            for element in first.json()["elements"]
+        )
+
+        os.utime(context.scene_path, ns=(0, 0))
+        third = context.client.get(f"/api/scenes/{context.scene_id}")
+        assert third.content == first.content
+        assert enhancements == 2
+
+
 def test_catalog_scene_links_applied(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
@@ -210,7 +412,7 @@ def test_catalog_scene_links_applied(
         assert block.get("link") == "https://example.com/procedures/p1/blocks/a"
 
 
-def test_catalog_scene_block_graph_api_reuses_scene_payload_graph_extraction(
+def test_catalog_scene_block_graph_api_builds_view_from_markup_without_scene(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
     app_settings_factory: Callable[..., AppSettings],
@@ -220,13 +422,27 @@ def test_catalog_scene_block_graph_api_reuses_scene_payload_graph_extraction(
         monkeypatch=monkeypatch,
         app_settings_factory=app_settings_factory,
     ) as context:
-        scene_response = context.client.get(f"/api/scenes/{context.scene_id}")
-        assert scene_response.status_code == 200
-        expected = extract_block_graph_view(scene_response.json())
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        loads = 0
 
-        graph_response = context.client.get(f"/api/scenes/{context.scene_id}/block-graph")
-        assert graph_response.status_code == 200
-        assert graph_response.json() == expected
+        def counting_load(_: Path) -> MarkupDocument:
+            nonlocal loads
+            loads += 1
+            return document
+
+        def fail_scene_load(*_args: Any, **_kwargs: Any) -> Any:
+            raise AssertionError("block graph must not load the scene")
+
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", counting_load)
+        monkeypatch.setattr(web_main, "load_scene_bytes", fail_scene_load)
+        expected = build_block_graph_view(document)
+
+        for _ in range(2):
+            graph_response = context.client.get(f"/api/scenes/{context.scene_id}/block-graph")
+            assert graph_response.status_code == 200
+            assert graph_response.json() == expected
+        assert loads == 1
 
 
 def test_catalog_scene_procedure_graph_api_reuses_team_builder_defaults(
@@ -255,6 +471,110 @@ def test_catalog_scene_procedure_graph_api_reuses_team_builder_defaults(
         assert graph_response.json() == expected_graph
 
 
+def test_catalog_detail_defers_procedure_share_link_to_async_endpoint(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "excalidraw_base_url": "https://draw.example/",
+            "excalidraw_max_url_length": 1_000_000,
+        },
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        builds = 0
+        original_build = web_main.build_scene_procedure_diagram_payload
+
+        def counting_build(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            nonlocal builds
+            builds += 1
+            return original_build(*args, **kwargs)
+
+        monkeypatch.setattr(web_main, "build_scene_procedure_diagram_payload", counting_build)
+
+        detail_response = context.client.get(f"/catalog/{context.scene_id}")
+        assert detail_response.status_code == 200
+        link_api_url = f"/api/scenes/{context.scene_id}/procedure-graph-link"
+        assert link_api_url in detail_response.text
+        assert 'id="procedure-link-status"' in detail_response.text
+        assert builds == 0
+
+        link_response = context.client.get(link_api_url)
+        assert link_response.status_code == 200
+        link = link_response.json()
+        assert link["available"] is True
+        assert link["open_mode"] == "direct"
+        assert link["open_url"].startswith("https://draw.example/#json=")
+        assert link_response.headers["etag"]
+
+        graph_response = context.client.get(f"/api/scenes/{context.scene_id}/procedure-graph")
+        assert graph_response.status_code == 200
+        assert context.client.get(link_api_url).json() == link
+        assert builds == 1
+
+        missing_response = context.client.get("/api/scenes/missing/procedure-graph-link")
+        assert missing_response.status_code == 404
+
+
+def test_catalog_scene_procedure_graph_link_is_manual_when_queue_is_full(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "excalidraw_base_url": "https://draw.example/",
+            "excalidraw_max_url_length": 1_000_000,
+            "team_graph_max_active_jobs": 1,
+        },
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        now = datetime.now(tz=UTC)
+        app_context.team_graph_jobs.jobs["busy"] = web_main.TeamGraphJob(
+            job_id="busy",
+            request=web_main.build_team_graph_request(
+                team_ids=["team-billing"],
+                excluded_team_ids=[],
+                merge_nodes_all_markups=False,
+                merge_selected_markups=False,
+                merge_node_min_chain_size=1,
+            ),
+            index_signature="index",
+            status="running",
+            created_at=now,
+            updated_at=now,
+        )
+        link_api_url = f"/api/scenes/{context.scene_id}/procedure-graph-link"
+
+        full_response = context.client.get(link_api_url)
+        assert full_response.status_code == 503
+        assert full_response.headers["retry-after"] == "2"
+        assert full_response.headers["cache-control"] == "no-store"
+        assert "etag" not in full_response.headers
+        assert full_response.json() == {
+            "available": False,
+            "open_url": "https://draw.example/",
+            "open_mode": "manual",
+        }
+        assert not app_context.team_graph_jobs.procedure_link_futures
+
+        app_context.team_graph_jobs.jobs.pop("busy")
+        link = context.client.get(link_api_url).json()
+        assert link["available"] is True
+        assert link["open_mode"] == "direct"
+
+
 def test_catalog_scene_procedure_graph_download_unidraw(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
@@ -321,3 +641,226 @@ def test_catalog_homepage_limits_card_grid_to_three_columns(
     assert "grid-template-columns: repeat(3, minmax(0, 1fr));" in styles
     assert "grid-template-columns: repeat(2, minmax(0, 1fr));" in styles
     assert "grid-template-columns: minmax(0, 1fr);" in styles
+
+
+def test_catalog_api_endpoints_send_etags_and_honor_if_none_match(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        raw_markup = json.dumps(context.payload).encode("utf-8")
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        monkeypatch.setattr(app_context.markup_reader, "load_raw", lambda _: raw_markup)
+        builds = 0
+        original_build = web_main.build_scene_procedure_diagram_payload
+
+        def counting_build(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            nonlocal builds
+            builds += 1
+            return original_build(*args, **kwargs)
+
+        monkeypatch.setattr(web_main, "build_scene_procedure_diagram_payload", counting_build)
+
+        for path in (
+            f"/api/scenes/{context.scene_id}",
+            f"/api/scenes/{context.scene_id}/block-graph",
+            f"/api/scenes/{context.scene_id}/procedure-graph",
+            f"/api/markup/{context.scene_id}",
+        ):
+            first = context.client.get(path)
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            assert etag.startswith('"')
+            assert first.headers["cache-control"] == "no-cache"
+
+            repeated = context.client.get(path)
+            assert repeated.headers["etag"] == etag
+            assert repeated.content == first.content
+
+            not_modified = context.client.get(path, headers={"If-None-Match": etag})
+            assert not_modified.status_code == 304
+            assert not_modified.content == b""
+
+            mismatched = context.client.get(path, headers={"If-None-Match": '"other"'})
+            assert mismatched.status_code == 200
+
+        assert builds == 1
+        assert context.client.get(f"/api/markup/{context.scene_id}").content == raw_markup
+
+
+def test_catalog_api_scene_etag_is_checked_before_conversion(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    scene_cache_dir = tmp_path / "scene_cache"
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "generate_excalidraw_on_demand": True,
+            "cache_excalidraw_on_demand": True,
+            "scene_cache_dir": scene_cache_dir,
+        },
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        path = f"/api/scenes/{context.scene_id}"
+        for accept_encoding in ("identity", "gzip"):
+            first = context.client.get(path, headers={"Accept-Encoding": accept_encoding})
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            for cache_file in scene_cache_dir.glob("*/*.json*"):
+                cache_file.unlink()
+
+            def fail_convert(markup: MarkupDocument) -> Any:
+                raise AssertionError("scene must not be converted for a matching ETag")
+
+            with monkeypatch.context() as patch:
+                patch.setattr(app_context.to_excalidraw, "prepare", fail_convert)
+                not_modified = context.client.get(
+                    path,
+                    headers={"If-None-Match": etag, "Accept-Encoding": accept_encoding},
+                )
+            assert not_modified.status_code == 304
+            assert not_modified.headers["etag"] == etag
+
+            rebuilt = context.client.get(path, headers={"Accept-Encoding": accept_encoding})
+            assert rebuilt.headers["etag"] == etag
+            assert rebuilt.content == first.content
+
+
+def test_catalog_api_scene_cache_hit_does_not_load_markup(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    scene_cache_dir = tmp_path / "scene_cache"
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "generate_excalidraw_on_demand": True,
+            "cache_excalidraw_on_demand": True,
+            "scene_cache_dir": scene_cache_dir,
+        },
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        document = MarkupDocument.model_validate(context.payload)
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", lambda _: document)
+        path = f"/api/scenes/{context.scene_id}"
+        first = context.client.get(path)
+        assert first.status_code == 200
+
+        def fail_load(_: Path) -> MarkupDocument:
+            raise AssertionError("markup must not be loaded for a cached scene")
+
+        monkeypatch.setattr(app_context.markup_reader, "load_by_path", fail_load)
+        not_modified = context.client.get(path, headers={"If-None-Match": first.headers["etag"]})
+        cached = context.client.get(path)
+        detail = context.client.get(f"/catalog/{context.scene_id}")
+
+        assert not_modified.status_code == 304
+        assert cached.status_code == 200
+        assert cached.content == first.content
+        assert detail.status_code == 200
+
+
+def test_catalog_api_reuses_prebuilt_scene_file_in_memory(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={"generate_excalidraw_on_demand": False},
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        loads = 0
+        original_load = app_context.scene_repo.load
+
+        def counting_load(path: Path) -> dict[str, Any]:
+            nonlocal loads
+            loads += 1
+            return cast(dict[str, Any], original_load(path))
+
+        monkeypatch.setattr(app_context.scene_repo, "load", counting_load)
+        path = f"/api/scenes/{context.scene_id}"
+        first = context.client.get(path)
+        second = context.client.get(path)
+        assert first.status_code == 200
+        assert second.content == first.content
+        assert loads == 1
+
+        payload = json.loads(context.scene_path.read_text(encoding="utf-8"))
+        payload["elements"] = payload["elements"][:1]
+        context.scene_path.write_text(json.dumps(payload), encoding="utf-8")
+        updated_timestamp = datetime(2030, 1, 1, tzinfo=UTC).timestamp()
+        os.utime(context.scene_path, (updated_timestamp, updated_timestamp))
+
+        updated = context.client.get(path)
+        assert loads == 2
+        assert len(updated.json()["elements"]) == 1
+        assert updated.headers["etag"] != first.headers["etag"]
+
+
+def test_catalog_api_serves_precompressed_scene_variants(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    scene_cache_dir = tmp_path / "scene_cache"
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        settings_overrides={
+            "generate_excalidraw_on_demand": False,
+            "scene_cache_dir": scene_cache_dir,
+        },
+    ) as context:
+        path = f"/api/scenes/{context.scene_id}"
+        plain = context.client.get(path, headers={"Accept-Encoding": "identity"})
+        assert plain.status_code == 200
+        assert "content-encoding" not in plain.headers
+        [stored_gzip] = scene_cache_dir.glob("*/*.json.gz")
+        assert gzip.decompress(stored_gzip.read_bytes()) == plain.content
+
+        compressions = 0
+        original_compress = gzip.compress
+
+        def counting_compress(*args: Any, **kwargs: Any) -> bytes:
+            nonlocal compressions
+            compressions += 1
+            return original_compress(*args, **kwargs)
+
+        monkeypatch.setattr(gzip, "compress", counting_compress)
+        compressed = context.client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert compressed.headers["etag"] != plain.headers["etag"]
+        assert compressed.content == plain.content
+        assert compressions == 0
+
+        [stored_identity] = scene_cache_dir.glob("*/*.json")
+        stored_identity.unlink()
+        variant_only = context.client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert variant_only.headers["content-encoding"] == "gzip"
+        assert variant_only.content == plain.content
+        assert compressions == 0
+
+        index_response = context.client.get("/api/index", headers={"Accept-Encoding": "gzip"})
+        assert index_response.status_code == 200
+        assert index_response.json()["items"][0]["scene_id"] == context.scene_id
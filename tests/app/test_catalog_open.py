@@ -34,7 +34,7 @@ def test_catalog_detail_uses_open_route_same_origin(
         assert open_response.status_code == 200
         assert "version-dataState" in open_response.text
         assert "excalidraw-state" in open_response.text
-        assert 'cache: "no-store"' in open_response.text
+        assert 'cache: "no-cache"' in open_response.text
         assert "clearDiagramScopedStorage" in open_response.text
         assert "localStorage.clear()" in open_response.text
         assert "QuotaExceededError" in open_response.text
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import re
+import threading
 import time
 from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any, cast
 
@@ -15,8 +17,9 @@ from adapters.filesystem.catalog_index_repository import FileSystemCatalogIndexR
 from adapters.s3.markup_catalog_source import S3MarkupCatalogSource
 from app.config import AppSettings
 from app.web_main import create_app
-from domain.catalog import CatalogIndexConfig
+from domain.catalog import CatalogIndex, CatalogIndexConfig, CatalogItem
 from domain.services.build_catalog_index import BuildCatalogIndex
+from domain.services.cancellation import CancellationToken
 from tests.adapters.s3.s3_utils import add_get_object, stub_s3_catalog
 from tests.app.catalog_test_setup import build_catalog_test_context
 from tests.helpers.markup_fixtures import load_markup_payload, repo_root
@@ -30,6 +33,26 @@ def _repo_root() -> Path:
     return repo_root()
 
 
+def _catalog_item(scene_id: str, *, team_id: str, team_name: str) -> CatalogItem:
+    return CatalogItem(
+        scene_id=scene_id,
+        title=scene_id,
+        tags=[],
+        updated_at="2026-01-01T00:00:00+00:00",
+        markup_type="service",
+        finedog_unit_id=scene_id,
+        criticality_level="unknown",
+        team_id=team_id,
+        team_name=team_name,
+        group_values={"markup_type": "service"},
+        fields={},
+        markup_meta={},
+        markup_rel_path=f"markup/{scene_id}.json",
+        excalidraw_rel_path=f"{scene_id}.excalidraw",
+        unidraw_rel_path=f"{scene_id}.unidraw",
+    )
+
+
 def _start_team_graph_merge(
     client: TestClient,
     *,
@@ -59,13 +82,13 @@ def _wait_for_team_graph_page(
     for _ in range(attempts):
         response = client.get(url)
         assert response.status_code == 200
-        html = response.text
+        html = str(response.text)
         status_match = re.search(r'data-merge-job-status="([^"]+)"', html)
         status = status_match.group(1) if status_match is not None else ""
-        if status in {"succeeded", "failed"}:
+        if status in {"succeeded", "failed", "cancelled"}:
             return html
         time.sleep(0.02)
-    assert status in {"succeeded", "failed"}, html
+    assert status in {"succeeded", "failed", "cancelled"}, html
     return html
 
 
@@ -645,6 +668,378 @@ def test_catalog_team_graph_merge_failure_is_persisted_in_step_three(
         assert "Resolve merge issues in Step 3 to unlock analytics." in html
 
 
+def _blocking_team_graph_merge(
+    started: threading.Event,
+) -> Callable[..., object]:
+    def block_merge(*args: object, **kwargs: object) -> object:
+        cancellation = cast(CancellationToken, kwargs["cancellation"])
+        started.set()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            cancellation.raise_if_cancelled()
+            time.sleep(0.01)
+        raise HTTPException(status_code=504, detail="Merge was not cancelled")
+
+    return block_merge
+
+
+def test_catalog_team_graph_merge_supersedes_previous_job_of_same_client(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    started = threading.Event()
+    monkeypatch.setattr(
+        web_main, "compute_team_graph_build_result", _blocking_team_graph_merge(started)
+    )
+
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        include_upload_stub=True,
+    ) as context:
+        first_url, first_job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        assert context.client.cookies.get(web_main.TEAM_GRAPH_CLIENT_COOKIE_NAME)
+        assert started.wait(5)
+        _, second_job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing", "merge_selected_markups": "1"},
+        )
+        assert second_job_id != first_job_id
+
+        html = _wait_for_team_graph_page(context.client, url=first_url)
+        assert 'data-merge-job-status="cancelled"' in html
+        assert "Merge cancelled" in html
+
+        app_context = cast(Any, context.client.app).state.context
+        web_main.cancel_team_graph_job(app_context, second_job_id)
+
+
+def test_catalog_team_graph_merge_reports_full_queue(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    started = threading.Event()
+    monkeypatch.setattr(
+        web_main, "compute_team_graph_build_result", _blocking_team_graph_merge(started)
+    )
+
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        include_upload_stub=True,
+        settings_overrides={"team_graph_max_active_jobs": 1},
+    ) as context:
+        _, first_job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        assert started.wait(5)
+        context.client.cookies.clear()
+        _, second_job_id, html = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing", "merge_selected_markups": "1"},
+        )
+        assert 'data-merge-job-status="queue_full"' in html
+        assert "Merge queue is full" in html
+
+        app_context = cast(Any, context.client.app).state.context
+        first_job = web_main.get_team_graph_job(app_context, first_job_id)
+        assert first_job is not None
+        assert first_job.status in {"pending", "running"}
+        web_main.cancel_team_graph_job(app_context, first_job_id)
+        second_job = web_main.get_team_graph_job(app_context, second_job_id)
+        assert second_job is not None
+        assert second_job.status == "queue_full"
+
+
+def test_catalog_team_graph_merge_resubmits_cancelled_job_when_client_switches_back(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    block_merge = _blocking_team_graph_merge(threading.Event())
+    calls = 0
+
+    def slow_first_merge(*args: object, **kwargs: object) -> object:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            release.wait(5)
+            cast(CancellationToken, kwargs["cancellation"]).raise_if_cancelled()
+        return block_merge(*args, **kwargs)
+
+    monkeypatch.setattr(web_main, "compute_team_graph_build_result", slow_first_merge)
+
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        include_upload_stub=True,
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        first_url, first_job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        assert started.wait(5)
+        _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing", "merge_selected_markups": "1"},
+        )
+        first_job = web_main.get_team_graph_job(app_context, first_job_id)
+        assert first_job is not None
+        assert first_job.status == "running"
+        assert first_job.cancellation.is_cancelled
+        stale_future = first_job.future
+
+        _, repeated_job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        assert repeated_job_id == first_job_id
+        release.set()
+        assert stale_future is not None
+        stale_future.result(timeout=5)
+
+        job = web_main.get_team_graph_job(app_context, first_job_id)
+        assert job is not None
+        assert job.status in {"pending", "running"}
+        assert not job.cancellation.is_cancelled
+        html = context.client.get(first_url).text
+        assert 'data-merge-job-status="cancelled"' not in html
+        web_main.cancel_team_graph_job(app_context, first_job_id)
+
+
+def test_catalog_team_graph_merge_replaces_own_job_when_queue_is_full(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    started = threading.Event()
+    monkeypatch.setattr(
+        web_main, "compute_team_graph_build_result", _blocking_team_graph_merge(started)
+    )
+
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        include_upload_stub=True,
+        settings_overrides={"team_graph_max_active_jobs": 1},
+    ) as context:
+        _, first_job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        assert started.wait(5)
+        _, second_job_id, html = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing", "merge_selected_markups": "1"},
+        )
+        assert 'data-merge-job-status="queue_full"' not in html
+
+        app_context = cast(Any, context.client.app).state.context
+        first_job = web_main.get_team_graph_job(app_context, first_job_id)
+        assert first_job is not None
+        assert first_job.cancellation.is_cancelled
+        second_job = web_main.get_team_graph_job(app_context, second_job_id)
+        assert second_job is not None
+        assert second_job.status in {"pending", "running"}
+        client_id = context.client.cookies.get(web_main.TEAM_GRAPH_CLIENT_COOKIE_NAME)
+        assert app_context.team_graph_jobs.client_jobs[client_id] == second_job_id
+        web_main.cancel_team_graph_job(app_context, second_job_id)
+
+
+def test_catalog_team_graph_merge_retry_keeps_other_waiting_clients(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    def fail_merge(*args: object, **kwargs: object) -> object:
+        raise HTTPException(status_code=504, detail="Merge timed out in upstream S3")
+
+    monkeypatch.setattr(web_main, "compute_team_graph_build_result", fail_merge)
+
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        include_upload_stub=True,
+    ) as context:
+        merge_url, job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        html = _wait_for_team_graph_page(context.client, url=merge_url)
+        assert 'data-merge-job-status="failed"' in html
+        first_client_id = context.client.cookies.get(web_main.TEAM_GRAPH_CLIENT_COOKIE_NAME)
+        assert first_client_id
+
+        context.client.cookies.clear()
+        _, retried_job_id, _ = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        second_client_id = context.client.cookies.get(web_main.TEAM_GRAPH_CLIENT_COOKIE_NAME)
+
+        assert retried_job_id == job_id
+        app_context = cast(Any, context.client.app).state.context
+        job = web_main.get_team_graph_job(app_context, job_id)
+        assert job is not None
+        assert job.client_ids == {first_client_id, second_client_id}
+
+
+def test_team_graph_prewarm_requests_put_popular_selections_before_single_teams(
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    settings = app_settings_factory(
+        team_graph_prewarm_selections=[["team-2", "team-1"], ["team-1"]],
+        builder_excluded_team_ids=["team-3"],
+    )
+    context = cast(Any, create_app(settings)).state.context
+    index_data = CatalogIndex(
+        generated_at="2026-01-01T00:00:00Z",
+        group_by=["markup_type"],
+        title_field="service_name",
+        tag_fields=[],
+        sort_by="title",
+        sort_order="asc",
+        unknown_value="unknown",
+        items=[
+            _catalog_item("a", team_id="team-1", team_name="Alpha"),
+            _catalog_item("b", team_id="team-2", team_name="Beta"),
+            _catalog_item("c", team_id="team-2", team_name="Beta"),
+            _catalog_item("d", team_id="team-3", team_name="Gamma"),
+        ],
+    )
+
+    build_requests = web_main.build_team_graph_prewarm_requests(context, index_data)
+
+    assert [request.team_ids for request in build_requests] == [
+        ("team-2", "team-1"),
+        ("team-1",),
+        ("team-2",),
+    ]
+    assert all(request.excluded_team_ids == ("team-3",) for request in build_requests)
+    assert not any(request.merge_selected_markups for request in build_requests)
+
+
+def test_team_graph_prewarm_requests_are_capped_by_settings(
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    settings = app_settings_factory(
+        team_graph_prewarm_selections=[["team-2", "team-1"]],
+        team_graph_prewarm_max_jobs=2,
+    )
+    context = cast(Any, create_app(settings)).state.context
+    index_data = CatalogIndex(
+        generated_at="2026-01-01T00:00:00Z",
+        group_by=["markup_type"],
+        title_field="service_name",
+        tag_fields=[],
+        sort_by="title",
+        sort_order="asc",
+        unknown_value="unknown",
+        items=[
+            _catalog_item("a", team_id="team-1", team_name="Alpha"),
+            _catalog_item("b", team_id="team-2", team_name="Beta"),
+            _catalog_item("c", team_id="team-2", team_name="Beta"),
+        ],
+    )
+
+    build_requests = web_main.build_team_graph_prewarm_requests(context, index_data)
+
+    assert [request.team_ids for request in build_requests] == [("team-2", "team-1"), ("team-2",)]
+
+
+def test_prune_team_graph_jobs_drops_prewarm_results_before_user_jobs(
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    state = cast(Any, create_app(app_settings_factory())).state.context.team_graph_jobs
+    now = datetime.now(tz=UTC)
+
+    def add_finished_job(job_id: str, *, prewarm: bool, age_minutes: int) -> None:
+        finished_at = now - timedelta(minutes=age_minutes)
+        state.jobs[job_id] = web_main.TeamGraphJob(
+            job_id=job_id,
+            request=web_main.build_team_graph_request(
+                team_ids=[job_id],
+                excluded_team_ids=[],
+                merge_nodes_all_markups=False,
+                merge_selected_markups=False,
+                merge_node_min_chain_size=1,
+            ),
+            index_signature="index",
+            status="succeeded",
+            created_at=finished_at,
+            updated_at=finished_at,
+            finished_at=finished_at,
+            prewarm=prewarm,
+        )
+        if prewarm:
+            state.prewarm.job_ids.add(job_id)
+
+    for idx in range(8):
+        add_finished_job(f"prewarm-{idx}", prewarm=True, age_minutes=1)
+    for idx in range(20):
+        add_finished_job(f"user-{idx}", prewarm=False, age_minutes=30 + idx)
+
+    web_main.prune_team_graph_jobs(state)
+
+    assert len(state.jobs) == 24
+    assert all(f"user-{idx}" in state.jobs for idx in range(20))
+    assert len(state.prewarm.job_ids) == 4
+    assert state.prewarm.job_ids <= set(state.jobs)
+
+
+def test_catalog_team_graph_merge_reuses_prewarmed_job(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    app_settings_factory: Callable[..., AppSettings],
+) -> None:
+    with build_catalog_test_context(
+        tmp_path=tmp_path,
+        monkeypatch=monkeypatch,
+        app_settings_factory=app_settings_factory,
+        include_upload_stub=True,
+        settings_overrides={"team_graph_prewarm_enabled": True},
+    ) as context:
+        app_context = cast(Any, context.client.app).state.context
+        index_data = web_main.load_index(app_context)
+        assert index_data is not None
+
+        web_main.schedule_team_graph_prewarm(app_context, index_data)
+        prewarm_thread = app_context.team_graph_jobs.prewarm.thread
+        assert prewarm_thread is not None
+        prewarm_thread.join(timeout=10)
+        assert not prewarm_thread.is_alive()
+
+        prewarmed_job_ids = app_context.team_graph_jobs.prewarm.job_ids
+        assert len(prewarmed_job_ids) == 1
+        prewarmed_job_id = next(iter(prewarmed_job_ids))
+        prewarmed_job = web_main.get_team_graph_job(app_context, prewarmed_job_id)
+        assert prewarmed_job is not None
+        assert prewarmed_job.prewarm
+        assert prewarmed_job.status == "succeeded"
+
+        _, job_id, html = _start_team_graph_merge(
+            context.client,
+            data={"team_ids": "team-billing"},
+        )
+        assert job_id == prewarmed_job_id
+        assert 'data-merge-job-status="succeeded"' in html
+
+
 def test_api_team_graph_uses_cached_merge_job_result_when_job_id_is_provided(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
@@ -709,6 +1104,18 @@ def test_api_team_graph_job_status_returns_terminal_job_state(
         assert payload["job_id"] == job_id
         assert payload["status"] == "succeeded"
         assert payload["updated_at"]
+        assert payload["started_at"]
+        assert payload["current_phase"] is None
+        phase_names = {phase["name"] for phase in payload["phases"]}
+        assert {
+            "load_markups",
+            "dashboard",
+            "dashboard.graph_view.procedure_graph.merge_nodes",
+            "procedure_graph",
+            "procedure_graph.collect_documents",
+            "service_graph",
+        } <= phase_names
+        assert all(phase["duration_ms"] >= 0 for phase in payload["phases"])
 
 
 def test_api_team_graph_job_status_creates_local_job_on_fresh_app_instance(
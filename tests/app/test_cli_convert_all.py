@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from app.cli import app
+from tests.helpers.markup_fixtures import load_markup_payload
+
+
+def test_convert_all_writes_excalidraw_and_unidraw_scenes(tmp_path: Path) -> None:
+    markup_dir = tmp_path / "markup"
+    markup_dir.mkdir()
+    (markup_dir / "basic.json").write_text(
+        json.dumps(load_markup_payload("basic.json")), encoding="utf-8"
+    )
+    excalidraw_dir = tmp_path / "excalidraw"
+    unidraw_dir = tmp_path / "unidraw"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "convert",
+            "all",
+            "--input-dir",
+            str(markup_dir),
+            "--excalidraw-dir",
+            str(excalidraw_dir),
+            "--unidraw-dir",
+            str(unidraw_dir),
+        ],
+    )
+
+    assert result.exit_code == 0, result.stdout
+    assert (excalidraw_dir / "basic.excalidraw").exists()
+    assert (unidraw_dir / "basic.unidraw").exists()
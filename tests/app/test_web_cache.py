@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import gzip
+
+from app.web_cache import (
+    JsonResponseCache,
+    build_etag,
+    etag_matches,
+    json_bytes_response,
+    negotiate_encoding,
+)
+
+
+def test_etag_matches_handles_lists_weak_and_wildcard_validators() -> None:
+    etag = build_etag("generation", b"{}")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_build_etag_tracks_generation_and_content() -> None:
+    etag = build_etag("generation", b"{}")
+
+    assert build_etag("generation", b"{}") == etag
+    assert build_etag("next", b"{}") != etag
+    assert build_etag("generation", b"[]") != etag
+
+
+def test_json_response_cache_builds_once_and_evicts_oldest() -> None:
+    cache = JsonResponseCache(max_entries=2)
+    builds: list[str] = []
+
+    def build(name: str) -> bytes:
+        builds.append(name)
+        return name.encode("utf-8")
+
+    first = cache.get_or_build(("a",), "gen", lambda: build("a"))
+    assert cache.get_or_build(("a",), "gen", lambda: build("a")) is first
+    cache.get_or_build(("b",), "gen", lambda: build("b"))
+    cache.get_or_build(("c",), "gen", lambda: build("c"))
+    cache.get_or_build(("a",), "gen", lambda: build("a"))
+
+    assert builds == ["a", "b", "c", "a"]
+    assert len(cache) == 2
+    assert first.etag == build_etag("gen", b"a")
+
+
+def test_negotiate_encoding_respects_quality_and_server_preference() -> None:
+    available = ("br", "gzip")
+
+    assert negotiate_encoding("gzip, deflate, br", available) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", available) == "gzip"
+    assert negotiate_encoding("gzip;q=0, *;q=0.1", available) == "br"
+    assert negotiate_encoding("identity", available) is None
+    assert negotiate_encoding(None, available) is None
+
+
+def test_json_bytes_response_serves_precompressed_variant() -> None:
+    content = b'{"elements":[' + b",".join(b'{"id":"x"}' for _ in range(200)) + b"]}"
+    cached = JsonResponseCache().get_or_build(("scene",), "gen", lambda: content)
+
+    compressed = json_bytes_response(cached, None, "gzip")
+    plain = json_bytes_response(cached, None, None)
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(compressed.body) == content
+    assert compressed.headers["etag"] != plain.headers["etag"]
+    assert "content-encoding" not in plain.headers
+    assert plain.body == content
+    revalidated = json_bytes_response(cached, compressed.headers["etag"], "gzip")
+    assert revalidated.status_code == 304
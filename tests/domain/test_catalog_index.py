@@ -7,7 +7,7 @@ import pytest
 
 from adapters.filesystem.catalog_index_repository import FileSystemCatalogIndexRepository
 from adapters.s3.markup_catalog_source import S3MarkupCatalogSource
-from domain.catalog import CatalogIndexConfig
+from domain.catalog import CatalogIndexConfig, CatalogItem, MarkupMergeSummary
 from domain.services.build_catalog_index import BuildCatalogIndex
 from tests.adapters.s3.s3_utils import stub_s3_catalog
 
@@ -98,6 +98,17 @@ def test_build_catalog_index_extracts_fields(
         assert item.has_start_end_overlap is False
         expected_timestamp = datetime(2024, 1, 1, tzinfo=UTC).isoformat()
         assert item.updated_at == expected_timestamp
+        assert item.merge_summary == MarkupMergeSummary(
+            markup_type="service",
+            service_name="Billing",
+            team_id=42,
+            team_name="Core Payments",
+            finedog_unit_id="fd-01",
+            procedure_ids=["p1"],
+            procedure_graph={},
+        )
+        assert CatalogItem.from_dict(item.to_dict()).merge_summary == item.merge_summary
+        assert "merge_summary" not in item.to_dict(include_merge_summary=False)
 
         index_again = builder.build(config)
         assert index_again.items[0].scene_id == item.scene_id
@@ -3,9 +3,15 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
 from domain.models import MarkupDocument, Procedure
-from domain.services.build_cross_team_graph_dashboard import BuildCrossTeamGraphDashboard
+from domain.services.build_cross_team_graph_dashboard import (
+    BuildCrossTeamGraphDashboard,
+    ServiceGraphAggregateCache,
+)
 from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph
+from domain.services.cancellation import CancellationToken, OperationCancelledError
 
 
 def _doc(
@@ -194,6 +200,109 @@ def test_build_cross_team_graph_dashboard() -> None:
     ]
 
 
+def test_dashboard_with_aggregate_cache_matches_uncached_build() -> None:
+    selected_documents = [
+        _doc(
+            markup_type="service",
+            team_id="team-alpha",
+            team_name="Alpha",
+            service_name="Payments",
+            unit_id="svc-pay",
+            procedures=[
+                Procedure(procedure_id="bot_auth", branches={"a": ["b"]}),
+                Procedure(procedure_id="shared_core", branches={"c": ["d"]}),
+            ],
+            procedure_graph={"bot_auth": ["shared_core"], "shared_core": []},
+        ),
+        _doc(
+            markup_type="service",
+            team_id="team-alpha",
+            team_name="Alpha",
+            service_name="Payments",
+            unit_id="svc-pay",
+            procedures=[Procedure(procedure_id="bot_helper", branches={"k": ["m"]})],
+            procedure_graph={"bot_helper": ["bot_auth"]},
+        ),
+        _doc(
+            markup_type="service",
+            team_id="team-beta",
+            team_name="Beta",
+            service_name="Cards",
+            unit_id="svc-cards",
+            procedures=[
+                Procedure(procedure_id="shared_core", branches={"x": ["y"]}),
+                Procedure(procedure_id="loop_proc", branches={"z": ["z2"]}),
+            ],
+            procedure_graph={"shared_core": ["loop_proc"], "loop_proc": ["shared_core"]},
+        ),
+    ]
+    all_documents = [
+        *selected_documents,
+        _doc(
+            markup_type="service",
+            team_id="team-gamma",
+            team_name="Gamma",
+            service_name="Wallet",
+            unit_id="svc-wallet",
+            procedures=[Procedure(procedure_id="shared_core", branches={"w1": ["w2"]})],
+            procedure_graph={"shared_core": []},
+        ),
+    ]
+    selected_versions = ["pay-1", "pay-2", "cards-1"]
+    all_versions = [*selected_versions, "wallet-1"]
+    selected_team_ids = ["team-alpha", "team-beta"]
+
+    expected = BuildCrossTeamGraphDashboard().build(
+        selected_documents=selected_documents,
+        all_documents=all_documents,
+        selected_team_ids=selected_team_ids,
+    )
+    cache = ServiceGraphAggregateCache()
+    builder = BuildCrossTeamGraphDashboard(aggregate_cache=cache)
+    first = builder.build(
+        selected_documents=selected_documents,
+        all_documents=all_documents,
+        selected_team_ids=selected_team_ids,
+        selected_document_versions=selected_versions,
+        all_document_versions=all_versions,
+    )
+    cached_entries = len(cache)
+    second = builder.build(
+        selected_documents=selected_documents,
+        all_documents=all_documents,
+        selected_team_ids=selected_team_ids,
+        selected_document_versions=selected_versions,
+        all_document_versions=all_versions,
+    )
+
+    assert first == expected
+    assert second == expected
+    assert cached_entries == 4
+    assert len(cache) == cached_entries
+
+
+def test_service_graph_aggregate_cache_evicts_least_recently_used() -> None:
+    cache = ServiceGraphAggregateCache(max_entries=2)
+    document = _doc(
+        markup_type="service",
+        team_id="team-alpha",
+        team_name="Alpha",
+        service_name="Payments",
+        unit_id="svc-pay",
+        procedures=[Procedure(procedure_id="p1", branches={"a": ["b"]})],
+        procedure_graph={"p1": []},
+    )
+
+    first = cache.get_or_build("v1", document)
+    cache.get_or_build("v2", document)
+    assert cache.get_or_build("v1", document) is first
+    cache.get_or_build("v3", document)
+
+    assert len(cache) == 2
+    assert cache.get_or_build("v1", document) is first
+    assert cache.get_or_build("v2", document) is not first
+
+
 def test_unique_graph_count_reuses_team_graph_builder_logic() -> None:
     selected_documents = [
         _doc(
@@ -703,6 +812,21 @@ def test_graph_counts_use_procedure_graph_components_for_single_markup() -> None
     assert sum(item.graph_count for item in dashboard.graph_groups) == dashboard.unique_graph_count
 
 
+def test_dashboard_build_stops_when_cancelled() -> None:
+    fixture_path = Path("examples/markup/graphs_set.json")
+    document = MarkupDocument.model_validate(json.loads(fixture_path.read_text(encoding="utf-8")))
+    cancellation = CancellationToken()
+    cancellation.cancel()
+
+    with pytest.raises(OperationCancelledError):
+        BuildCrossTeamGraphDashboard().build(
+            selected_documents=[document],
+            all_documents=[document],
+            selected_team_ids=[str(document.team_id)],
+            cancellation=cancellation,
+        )
+
+
 def test_graph_groups_include_component_merge_node_breakdown() -> None:
     selected_documents = [
         _doc(
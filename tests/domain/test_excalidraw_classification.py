@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from adapters.layout.grid import GridLayoutEngine
+from domain.models import ExcalidrawDocument
+from domain.services.convert_excalidraw_to_markup import ExcalidrawToMarkupConverter
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+
+def _scene(name: str) -> dict[str, Any]:
+    document = load_markup_fixture(name)
+    scene: ExcalidrawDocument = MarkupToExcalidrawConverter(GridLayoutEngine()).convert(document)
+    return scene.to_dict()
+
+
+def test_classify_buckets_elements_by_role() -> None:
+    scene = _scene("basic.json")
+    elements = scene["elements"]
+
+    buckets = ExcalidrawToMarkupConverter()._classify(elements)
+
+    assert len(buckets.frames) == sum(1 for element in elements if element["type"] == "frame")
+    assert len(buckets.arrows) == sum(1 for element in elements if element["type"] == "arrow")
+    assert {meta["role"] for _, meta in buckets.markers} == {"start_marker", "end_marker"}
+    assert {meta["role"] for _, meta in buckets.labels} == {"block_label"}
+    assert all(element["type"] in {"rectangle", "text"} for element, _ in buckets.blocks)
+    assert buckets.globals_meta is not None
+    assert buckets.globals_meta["markup_type"] == "system_default"
+
+
+def test_convert_reads_element_metadata_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    scene = _scene("complex_graph.json")
+    converter = ExcalidrawToMarkupConverter()
+    expected = converter.convert(scene)
+    calls = 0
+    original = ExcalidrawToMarkupConverter._metadata
+
+    def counting(self: ExcalidrawToMarkupConverter, element: Any) -> dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        return original(self, element)
+
+    monkeypatch.setattr(ExcalidrawToMarkupConverter, "_metadata", counting)
+
+    assert converter.convert(scene) == expected
+    assert calls == len(scene["elements"])
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
 from adapters.layout.grid import GridLayoutEngine
 from domain.models import MarkupDocument
 from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
-from domain.services.extract_block_graph_view import extract_block_graph_view
+from domain.services.extract_block_graph_view import (
+    build_block_graph_view,
+    extract_block_graph_view,
+)
 
 
 def test_extract_block_graph_view_uses_block_graph_edges_only() -> None:
@@ -159,3 +168,75 @@ def test_extract_block_graph_view_marks_return_to_parent_blocks_separately() ->
     assert nodes["p1::b"]["returns_to_parent"] is True
     assert nodes["p1::b"]["end_block_type"] == ""
     assert graph_payload["meta"]["edge_count"] == 1
+
+
+def _without_edge_ids(graph_payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "nodes": graph_payload["nodes"],
+        "edges": sorted(
+            (
+                {key: value for key, value in edge.items() if key != "id"}
+                for edge in graph_payload["edges"]
+            ),
+            key=lambda edge: (edge["source"], edge["target"], edge["edge_type"]),
+        ),
+        "meta": graph_payload["meta"],
+    }
+
+
+@pytest.mark.parametrize(
+    "fixture_name",
+    ["basic", "complex_graph", "corner_cases", "forest", "graphs_set"],
+)
+def test_build_block_graph_view_matches_scene_extraction(fixture_name: str) -> None:
+    path = Path("examples/markup") / f"{fixture_name}.json"
+    markup = MarkupDocument.model_validate(json.loads(path.read_text(encoding="utf-8")))
+    scene_payload = MarkupToExcalidrawConverter(GridLayoutEngine()).convert(markup).to_dict()
+
+    expected = extract_block_graph_view(scene_payload)
+    graph_payload = build_block_graph_view(markup)
+
+    assert _without_edge_ids(graph_payload) == _without_edge_ids(expected)
+
+
+def test_build_block_graph_view_marks_one_reverse_edge_per_cycle() -> None:
+    payload = {
+        "markup_type": "service",
+        "procedures": [
+            {
+                "proc_id": "p1",
+                "start_block_ids": ["a"],
+                "end_block_ids": ["c::exit"],
+                "branches": {"a": ["b"], "b": ["c"], "c": ["a"]},
+            }
+        ],
+        "block_graph": {"a": ["b"], "b": ["c"], "c": ["a"]},
+        "block_graph_initials": ["a"],
+    }
+    markup = MarkupDocument.model_validate(payload)
+
+    graph_payload = build_block_graph_view(markup)
+
+    edges = {(edge["source"], edge["target"]): edge for edge in graph_payload["edges"]}
+    assert all(edge["is_cycle"] for edge in edges.values())
+    assert edges[("p1::c", "p1::a")]["edge_type"] == "block_graph_cycle"
+    assert edges[("p1::a", "p1::b")]["edge_type"] == "block_graph"
+    assert edges[("p1::b", "p1::c")]["edge_type"] == "block_graph"
+    nodes = {node["id"]: node for node in graph_payload["nodes"]}
+    assert nodes["p1::a"]["is_initial"] is True
+    assert nodes["p1::c"]["end_block_type"] == "exit"
+
+
+def test_build_block_graph_view_returns_empty_payload_without_edges() -> None:
+    markup = MarkupDocument.model_validate(
+        {
+            "markup_type": "service",
+            "procedures": [{"proc_id": "p1", "start_block_ids": ["a"], "end_block_ids": ["a"]}],
+        }
+    )
+
+    assert build_block_graph_view(markup) == {
+        "nodes": [],
+        "edges": [],
+        "meta": {"node_count": 0, "edge_count": 0},
+    }
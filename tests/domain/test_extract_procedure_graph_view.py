@@ -111,6 +111,37 @@ def test_extract_procedure_graph_view_adds_nodes_from_adjacency() -> None:
     assert edges[0]["edge_type"] == "procedure_graph"
 
 
+def test_extract_procedure_graph_view_marks_only_strongly_connected_edges_as_cycles() -> None:
+    payload = {
+        "markup_type": "procedure_graph",
+        "procedures": [],
+        "procedure_graph": {
+            "a": ["b", "a"],
+            "b": ["c", "d"],
+            "c": ["a"],
+            "d": ["e"],
+            "e": ["f"],
+            "f": ["d", "g"],
+        },
+    }
+    document = MarkupDocument.model_validate(payload)
+
+    graph_payload = extract_procedure_graph_view(document)
+
+    cycles = {edge["id"]: edge["is_cycle"] for edge in graph_payload["edges"]}
+    assert cycles == {
+        "a->b": True,
+        "a->a": True,
+        "b->c": True,
+        "b->d": False,
+        "c->a": True,
+        "d->e": True,
+        "e->f": True,
+        "f->d": True,
+        "f->g": False,
+    }
+
+
 def test_extract_procedure_graph_view_uses_service_graph_stats_from_meta() -> None:
     payload = {
         "markup_type": "service_graph",
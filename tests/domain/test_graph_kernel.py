@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import random
+from itertools import pairwise
+
+from domain.services.graph_kernel import IndexedGraph
+from domain.services.graph_metrics import compute_graph_metrics
+
+
+def _random_adjacency(rng: random.Random, size: int) -> dict[str, list[str]]:
+    nodes = [f"n{idx}" for idx in range(size)]
+    return {
+        node: [rng.choice(nodes) for _ in range(rng.randint(0, 3))]
+        for node in nodes
+        if rng.random() < 0.8
+    }
+
+
+def _reachable_sets(graph: IndexedGraph) -> list[set[int]]:
+    return [
+        {target for target, seen in enumerate(graph.reachable([node])) if seen}
+        for node in range(len(graph))
+    ]
+
+
+def test_from_adjacency_interns_nodes_in_first_seen_order() -> None:
+    graph = IndexedGraph.from_adjacency({"b": ["c", "c", "a"], "a": ["b"]}, nodes=["z"])
+
+    assert graph.node_ids == ["z", "b", "c", "a"]
+    assert graph.index == {"z": 0, "b": 1, "c": 2, "a": 3}
+    assert list(graph.offsets) == [0, 0, 2, 2, 3]
+    assert graph.ids(graph.successors(1)) == ["c", "a"]
+    assert graph.out_degrees() == [0, 2, 0, 1]
+    assert graph.in_degrees() == [0, 1, 1, 1]
+
+
+def test_from_adjacency_can_restrict_and_sort_targets() -> None:
+    graph = IndexedGraph.from_adjacency(
+        {"a": ["c", "x", "b", "b"], "x": ["a"]},
+        nodes=["a", "b", "c"],
+        restrict_to_nodes=True,
+        unique_targets=False,
+        sort_key=str,
+    )
+
+    assert graph.node_ids == ["a", "b", "c"]
+    assert graph.ids(graph.successors(0)) == ["b", "b", "c"]
+
+
+def test_strongly_connected_components_match_mutual_reachability() -> None:
+    rng = random.Random(7)
+    for _ in range(200):
+        graph = IndexedGraph.from_adjacency(_random_adjacency(rng, rng.randint(1, 30)))
+        reachable = _reachable_sets(graph)
+        expected = {
+            frozenset(other for other in reachable[node] if node in reachable[other]) | {node}
+            for node in range(len(graph))
+        }
+
+        components = graph.strongly_connected_components()
+
+        assert {frozenset(component) for component in components} == expected
+        assert sum(len(component) for component in components) == len(graph)
+
+
+def test_find_cycle_and_back_edges_agree_with_cycle_detection() -> None:
+    rng = random.Random(13)
+    for _ in range(200):
+        graph = IndexedGraph.from_adjacency(_random_adjacency(rng, rng.randint(1, 30)))
+        cycle = graph.find_cycle()
+        back_edges = set(graph.back_edges())
+
+        assert (cycle is None) == (not graph.cyclic_components())
+        assert (cycle is None) == (not back_edges)
+        if cycle is not None:
+            assert cycle[0] == cycle[-1]
+            for source, target in pairwise(cycle):
+                assert graph.has_edge(source, target)
+
+        acyclic = IndexedGraph.from_adjacency(
+            {
+                graph.node_ids[node]: [
+                    graph.node_ids[target]
+                    for target in graph.successors(node)
+                    if (node, target) not in back_edges
+                ]
+                for node in range(len(graph))
+            }
+        )
+        assert acyclic.find_cycle() is None
+
+
+def test_topological_levels_and_path_counts_on_dag() -> None:
+    graph = IndexedGraph.from_adjacency({"a": ["b", "c"], "b": ["d"], "c": ["d", "e"], "d": ["e"]})
+
+    assert graph.topological_levels(graph.node_ids) == [0, 1, 1, 2, 3]
+    assert graph.count_paths([graph.index["a"]]) == 3
+    assert graph.count_paths([graph.index["c"], graph.index["d"]]) == 3
+
+
+def test_weak_components_follow_root_order() -> None:
+    graph = IndexedGraph.from_adjacency({"a": ["b"], "c": ["b"], "d": []}, nodes=["d"])
+
+    components = graph.weak_components()
+
+    assert [graph.ids(component)[0] for component in components] == ["d", "a"]
+    assert [set(graph.ids(component)) for component in components] == [{"d"}, {"a", "b", "c"}]
+
+
+def test_algorithms_handle_deep_chains_without_recursion() -> None:
+    size = 20_000
+    chain = {f"n{idx}": [f"n{idx + 1}"] for idx in range(size)}
+    chain[f"n{size}"] = ["n0"]
+
+    metrics = compute_graph_metrics(chain)
+
+    assert metrics.cycle_count == 1
+    assert metrics.cycle_path is not None
+    assert len(metrics.cycle_path) == size + 2
+    assert metrics.weakly_connected is True
+    graph = IndexedGraph.from_adjacency(chain)
+    assert len(graph.strongly_connected_components()) == 1
+    assert graph.back_edges() == [(size, 0)]
+
+
+def test_analyze_matches_separate_passes() -> None:
+    rng = random.Random(17)
+    for _ in range(200):
+        graph = IndexedGraph.from_adjacency(_random_adjacency(rng, rng.randint(1, 30)))
+
+        analysis = graph.analyze()
+
+        assert analysis.cycle == graph.find_cycle()
+        assert analysis.cyclic_component_count == len(graph.cyclic_components())
+        assert analysis.weak_component_count == len(graph.weak_components())
+        assert {frozenset(component) for component in analysis.strong_components} == {
+            frozenset(component) for component in graph.strongly_connected_components()
+        }
+
+
+def test_graph_metrics_report_weak_component_count() -> None:
+    metrics = compute_graph_metrics({"a": ["b"], "c": ["d"], "e": []})
+
+    assert metrics.weak_component_count == 3
+    assert metrics.weakly_connected is False
+    assert compute_graph_metrics({}).weak_component_count == 0
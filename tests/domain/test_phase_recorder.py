@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from domain.models import MarkupDocument
+from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph
+from domain.services.phase_recorder import PhaseRecorder
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_phase_recorder_nests_steps_and_accumulates_durations() -> None:
+    clock = _FakeClock()
+    recorder = PhaseRecorder(clock=clock)
+
+    with recorder.phase("dashboard"):
+        recorder.step("collect_graphs")
+        clock.now += 0.5
+        recorder.step("graph_view")
+        for _ in range(2):
+            with recorder.phase("procedure_graph"):
+                recorder.step("merge_nodes")
+                clock.now += 1.0
+                assert recorder.snapshot().current_phase == (
+                    "dashboard.graph_view.procedure_graph.merge_nodes"
+                )
+
+    snapshot = recorder.snapshot()
+    assert snapshot.current_phase is None
+    timings = {phase.name: (phase.duration_ms, phase.calls) for phase in snapshot.phases}
+    assert timings == {
+        "dashboard": (2500.0, 1),
+        "dashboard.collect_graphs": (500.0, 1),
+        "dashboard.graph_view": (2000.0, 1),
+        "dashboard.graph_view.procedure_graph": (2000.0, 2),
+        "dashboard.graph_view.procedure_graph.merge_nodes": (2000.0, 2),
+    }
+    assert snapshot.phases[0].name == "dashboard"
+
+
+def test_phase_recorder_reports_current_phase_elapsed_time() -> None:
+    clock = _FakeClock()
+    recorder = PhaseRecorder(clock=clock)
+
+    with recorder.phase("load_markups"):
+        clock.now += 0.25
+        payload = recorder.snapshot().to_dict()
+
+    assert payload["current_phase"] == "load_markups"
+    assert payload["current_phase_elapsed_ms"] == 250.0
+    assert payload["phases"] == []
+
+
+def test_team_procedure_graph_build_records_merge_phases() -> None:
+    document = MarkupDocument.model_validate(
+        {
+            "markup_type": "service",
+            "service_name": "Payments",
+            "team_id": "team-alpha",
+            "team_name": "Alpha",
+            "procedures": [
+                {
+                    "proc_id": "p1",
+                    "proc_name": "Authorize",
+                    "start_block_ids": ["a"],
+                    "end_block_ids": ["b::exit"],
+                    "branches": {"a": ["b"]},
+                }
+            ],
+            "procedure_graph": {"p1": []},
+        }
+    )
+    recorder = PhaseRecorder()
+
+    with recorder.phase("procedure_graph"):
+        BuildTeamProcedureGraph().build([document], progress=recorder)
+
+    names = [phase.name for phase in recorder.snapshot().phases]
+    assert names == [
+        "procedure_graph",
+        "procedure_graph.merge_services",
+        "procedure_graph.merge_nodes",
+        "procedure_graph.chain_groups",
+        "procedure_graph.collect_documents",
+        "procedure_graph.drop_intermediates",
+        "procedure_graph.assemble",
+    ]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from adapters.layout.grid import GridLayoutEngine
+from adapters.layout.procedure_graph import ProcedureGraphLayoutEngine
+from domain.models import ExcalidrawDocument, UnidrawDocument, scene_content_hash
+from domain.services.convert_markup_base import MarkupToDiagramConverter
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from domain.services.convert_markup_to_unidraw import MarkupToUnidrawConverter
+from domain.services.convert_procedure_graph_to_excalidraw import (
+    ProcedureGraphToExcalidrawConverter,
+)
+from domain.services.convert_procedure_graph_to_unidraw import ProcedureGraphToUnidrawConverter
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+
+@pytest.mark.parametrize(
+    "build_converter",
+    [
+        lambda: MarkupToExcalidrawConverter(GridLayoutEngine()),
+        lambda: MarkupToUnidrawConverter(GridLayoutEngine()),
+        lambda: ProcedureGraphToExcalidrawConverter(ProcedureGraphLayoutEngine()),
+        lambda: ProcedureGraphToUnidrawConverter(ProcedureGraphLayoutEngine()),
+    ],
+)
+def test_conversion_is_byte_identical_across_converters(
+    build_converter: Callable[[], MarkupToDiagramConverter],
+) -> None:
+    document = load_markup_fixture("complex_graph.json")
+    first_converter = build_converter()
+    second_converter = build_converter()
+
+    first = first_converter.convert(document)
+    second = second_converter.convert(document)
+    again = first_converter.convert(document)
+
+    assert isinstance(first, ExcalidrawDocument | UnidrawDocument)
+    dumped = json.dumps(first.to_dict())
+    assert json.dumps(second.to_dict()) == dumped
+    assert json.dumps(again.to_dict()) == dumped
+    assert first.content_hash() == second.content_hash()
+
+
+_CONVERT_SCRIPT = """
+from adapters.layout.grid import GridLayoutEngine
+from adapters.layout.procedure_graph import ProcedureGraphLayoutEngine
+from domain.services.build_team_procedure_graph import BuildTeamProcedureGraph
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from domain.services.convert_markup_to_unidraw import MarkupToUnidrawConverter
+from domain.services.convert_procedure_graph_to_excalidraw import (
+    ProcedureGraphToExcalidrawConverter,
+)
+from domain.services.convert_procedure_graph_to_unidraw import ProcedureGraphToUnidrawConverter
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+documents = [
+    load_markup_fixture(name).model_copy(
+        update={
+            "service_name": f"Service {index}",
+            "team_name": f"Team {index % 2}",
+            "markup_type": ("service", "system")[index % 2],
+        }
+    )
+    for index, name in enumerate(
+        ["basic.json", "complex_graph.json", "corner_cases.json", "forest.json", "graphs_set.json"]
+        * 2
+    )
+]
+merged = BuildTeamProcedureGraph().build(documents)
+document = load_markup_fixture("complex_graph.json")
+for converter in (
+    MarkupToExcalidrawConverter(GridLayoutEngine()),
+    MarkupToUnidrawConverter(GridLayoutEngine()),
+):
+    print(converter.convert(document).content_hash())
+for converter in (
+    ProcedureGraphToExcalidrawConverter(ProcedureGraphLayoutEngine()),
+    ProcedureGraphToUnidrawConverter(ProcedureGraphLayoutEngine()),
+):
+    print(converter.convert(document).content_hash())
+    print(converter.convert(merged).content_hash())
+"""
+
+
+def _convert_with_hash_seed(seed: str) -> list[str]:
+    repo_root = Path(__file__).resolve().parents[2]
+    result = subprocess.run(
+        [sys.executable, "-c", _CONVERT_SCRIPT],
+        cwd=repo_root,
+        env={**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": str(repo_root)},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.split()
+
+
+def test_conversion_does_not_depend_on_hash_seed() -> None:
+    hashes = [_convert_with_hash_seed(seed) for seed in ("1", "2", "3")]
+
+    assert len(hashes[0]) == 6
+    assert hashes[1] == hashes[0]
+    assert hashes[2] == hashes[0]
+
+
+def test_element_seeds_are_derived_from_element_ids() -> None:
+    document = load_markup_fixture("basic.json")
+    elements = MarkupToExcalidrawConverter(GridLayoutEngine()).convert(document).elements
+
+    seeds = {element["id"]: (element["seed"], element["versionNonce"]) for element in elements}
+
+    assert len({seed for seed, _ in seeds.values()}) == len(seeds)
+    assert all(seed != nonce for seed, nonce in seeds.values())
+
+
+def test_scene_content_hash_ignores_key_order_and_tracks_content() -> None:
+    document = load_markup_fixture("basic.json")
+    scene = MarkupToExcalidrawConverter(GridLayoutEngine()).convert(document)
+    payload = scene.to_dict()
+    reordered = dict(reversed(list(payload.items())))
+    changed = ExcalidrawDocument(
+        elements=[{**scene.elements[0], "x": scene.elements[0]["x"] + 1}, *scene.elements[1:]],
+        app_state=scene.app_state,
+        files=scene.files,
+    )
+
+    assert scene_content_hash(reordered) == scene.content_hash()
+    assert changed.content_hash() != scene.content_hash()
+
+
+def test_unidraw_timestamp_can_be_set_per_conversion() -> None:
+    document = load_markup_fixture("basic.json")
+    converter = MarkupToUnidrawConverter(GridLayoutEngine())
+
+    stamped = converter.convert(document, timestamp_ms=1_700_000_000_000)
+    default = converter.convert(document)
+
+    assert {element["createdAt"] for element in stamped.elements} == {1_700_000_000_000}
+    assert {element["updatedAt"] for element in stamped.elements} == {1_700_000_000_000}
+    assert {element["createdAt"] for element in default.elements} == {0}
+
+
+def test_procedure_graph_unidraw_timestamp_can_be_set_per_conversion() -> None:
+    document = load_markup_fixture("complex_graph.json")
+    converter = ProcedureGraphToUnidrawConverter(ProcedureGraphLayoutEngine())
+
+    stamped = converter.convert(document, timestamp_ms=1_700_000_000_000)
+
+    assert {element["updatedAt"] for element in stamped.elements} == {1_700_000_000_000}
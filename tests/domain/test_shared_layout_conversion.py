@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+
+from adapters.layout.grid import GridLayoutEngine
+from domain.models import LayoutPlan, MarkupDocument
+from domain.services.convert_markup_base import convert_with_shared_layout
+from domain.services.convert_markup_to_excalidraw import MarkupToExcalidrawConverter
+from domain.services.convert_markup_to_unidraw import MarkupToUnidrawConverter
+from tests.helpers.markup_fixtures import load_markup_fixture
+
+
+class _CountingEngine(GridLayoutEngine):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def build_plan(self, document: MarkupDocument) -> LayoutPlan:
+        self.calls += 1
+        return super().build_plan(document)
+
+
+@pytest.mark.parametrize("fixture_name", ["basic.json", "complex_graph.json"])
+def test_shared_layout_matches_separate_conversions(fixture_name: str) -> None:
+    document = load_markup_fixture(fixture_name)
+    engine = _CountingEngine()
+    excalidraw = MarkupToExcalidrawConverter(engine)
+    unidraw = MarkupToUnidrawConverter(engine)
+
+    expected_excalidraw = excalidraw.convert(document).to_dict()
+    expected_unidraw = unidraw.convert(document).to_dict()
+    engine.calls = 0
+
+    excalidraw_doc, unidraw_doc = convert_with_shared_layout(document, [excalidraw, unidraw])
+
+    assert engine.calls == 1
+    assert excalidraw_doc.to_dict() == expected_excalidraw
+    assert unidraw_doc.to_dict() == expected_unidraw
+
+
+def test_prepared_markup_can_be_converted_repeatedly() -> None:
+    document = load_markup_fixture("basic.json")
+    converter = MarkupToExcalidrawConverter(GridLayoutEngine())
+    prepared = converter.prepare(document)
+    base_metadata = dict(prepared.base_metadata)
+
+    first = converter.convert_prepared(prepared).to_dict()
+    second = converter.convert_prepared(prepared).to_dict()
+
+    assert prepared.base_metadata == base_metadata
+    assert first == second
@@ -4,11 +4,13 @@ import pytest
 
 from adapters.layout.grid import LayoutConfig
 from adapters.layout.procedure_graph import ProcedureGraphLayoutEngine
+from domain.catalog import MarkupMergeSummary
 from domain.models import MarkupDocument, Size
 from domain.services.build_team_procedure_graph import (
     _SERVICE_COLORS,
     BuildTeamProcedureGraph,
 )
+from domain.services.cancellation import CancellationToken, OperationCancelledError
 from domain.services.convert_markup_to_excalidraw import (
     SERVICE_ZONE_LABEL_FONT_FAMILY as EXCALIDRAW_SERVICE_ZONE_LABEL_FONT_FAMILY,
 )
@@ -123,6 +125,32 @@ def test_build_team_procedure_graph_sets_team_id_for_single_team() -> None:
     assert merged.team_name == "Alpha"
 
 
+def test_build_team_procedure_graph_stops_when_cancelled() -> None:
+    document = MarkupDocument.model_validate(
+        {
+            "markup_type": "service",
+            "service_name": "Payments",
+            "team_id": "team-alpha",
+            "team_name": "Alpha",
+            "procedures": [
+                {
+                    "proc_id": "p1",
+                    "proc_name": "Authorize",
+                    "start_block_ids": ["a"],
+                    "end_block_ids": ["b::exit"],
+                    "branches": {"a": ["b"]},
+                }
+            ],
+            "procedure_graph": {"p1": []},
+        }
+    )
+    cancellation = CancellationToken()
+    cancellation.cancel()
+
+    with pytest.raises(OperationCancelledError):
+        BuildTeamProcedureGraph().build([document], cancellation=cancellation)
+
+
 def test_build_team_service_graph_aggregates_by_service() -> None:
     doc_alpha = MarkupDocument.model_validate(
         {
@@ -870,6 +898,22 @@ def test_build_team_procedure_graph_scoped_chain_groups_do_not_cross_documents()
     assert "proc_shared_handoff::doc2" in group_id_doc2
 
 
+def test_build_team_procedure_graph_merge_scope_from_summaries_matches_full_documents() -> None:
+    basic = load_markup_fixture("basic.json")
+    graphs_set = load_markup_fixture("graphs_set.json")
+    summary_document = MarkupMergeSummary.from_document(graphs_set).to_document()
+
+    builder = BuildTeamProcedureGraph()
+    from_documents = builder.build(
+        [basic], merge_documents=[basic, graphs_set], merge_node_min_chain_size=2
+    )
+    from_summaries = builder.build(
+        [basic], merge_documents=[basic, summary_document], merge_node_min_chain_size=2
+    )
+
+    assert from_summaries.model_dump() == from_documents.model_dump()
+
+
 def test_build_team_procedure_graph_scoped_merge_layout_keeps_separators_between_components() -> (
     None
 ):
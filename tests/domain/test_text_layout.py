@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from domain.services.text_layout import fit_text, line_metrics, text_width, wrap_words
+
+
+def test_wrap_words_splits_long_words_into_chunks() -> None:
+    assert wrap_words(["alpha", "beta", "gamma"], 10) == ["alpha beta", "gamma"]
+    assert wrap_words(["abcdefghij"], 4) == ["abcd", "efgh", "ij"]
+
+
+def test_fit_text_shrinks_font_until_text_fits() -> None:
+    text = "Проверить статус платежа и отправить уведомление клиенту"
+
+    content, size, height = fit_text(text, 200.0, 60.0, 10.0, 20.0)
+
+    assert size < 20.0
+    assert height <= 60.0
+    assert content.replace("\n", " ") == text
+    assert fit_text(text, 200.0, 60.0, 10.0, 20.0) is fit_text(text, 200.0, 60.0, 10.0, 20.0)
+
+
+def test_fit_text_cache_keeps_int_and_float_sizes_apart() -> None:
+    assert fit_text(" ", 100.0, 100.0, 10.0, 20) == (" ", 20, 27.0)
+    assert isinstance(fit_text(" ", 100.0, 100.0, 10.0, 20.0)[1], float)
+
+
+def test_fit_text_cache_keys_on_font_metrics() -> None:
+    narrow = fit_text("one two three four", 120.0, 200.0, 10.0, 20.0, 0.5, 1.35)
+    wide = fit_text("one two three four", 120.0, 200.0, 10.0, 20.0, 0.8, 1.35)
+
+    assert narrow != wide
+
+
+def test_text_width_uses_longest_line() -> None:
+    assert line_metrics("ab\nabcd") == (2, 4)
+    assert text_width("ab\nabcd", 10.0, None, 0.5) == 20.0
+    assert text_width("ab\nabcd", 10.0, 15.0, 0.5) == 15.0
+    assert text_width("", 10.0, 40.0, 0.5) == 40.0
+    assert text_width("\n", 10.0, 40.0, 0.5) == 1.0